@@ -2,11 +2,14 @@ import streamlit as st
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-import io
-import re
-import itertools
 from datetime import datetime
 import uuid
+from result_browser import render_result_browser
+import jobs
+import perf
+import pipeline
+import rekap_io
+import unggahan
 
 # Page config
 st.set_page_config(
@@ -15,6 +18,39 @@ st.set_page_config(
     layout="wide"
 )
 
+# Instrumentasi per stage (ditampilkan di panel Performa di akhir halaman)
+profiler = perf.activate(perf.Profiler("1minggu"))
+
+# Format semua tombol unduh; Parquet/CSV gzip jauh lebih cepat dari Excel dan
+# file "hasil rekap ... .parquet" bisa langsung dibaca dashboard
+format_unduhan = st.sidebar.radio(
+    "💾 Format Unduhan",
+    list(rekap_io.FORMAT_EKSPOR),
+    key="format_unduhan",
+    help="Unduhan berisi beberapa sheet menjadi ZIP (satu file per sheet) untuk format selain Excel",
+)
+
+
+def proses_mingguan(files):
+    """Fungsi untuk job latar belakang: parse 7 file mingguan lalu hitung proporsinya"""
+    jobs.rencana(len(files) + 1)
+    df_mingguan_list, sheet_warnings, errors = [], [], []
+    for f in files:
+        with jobs.tahap(f"membaca {f.nama}"):
+            try:
+                df_mingguan_list.append(unggahan.parse_mingguan(f, sheet_warnings))
+            except ValueError as e:
+                errors.append(str(e))
+                sheet_warnings.append(str(e))
+
+    hasil = {"sheet_warnings": sheet_warnings, "errors": errors, "df_mingguan": None, "df_proporsi": None}
+    if df_mingguan_list:
+        with jobs.tahap("menghitung proporsi"):
+            hasil["df_mingguan"] = pd.concat(df_mingguan_list, ignore_index=True)
+            hasil["df_proporsi"] = pipeline.hitung_proporsi_mingguan(hasil["df_mingguan"])
+    return hasil
+
+
 # Main header
 st.title("🚦 Analisis Volume Lalu Lintas")
 st.subheader("Estimasi & Analisis Distribusi Kendaraan Bulanan")
@@ -23,7 +59,7 @@ st.subheader("Estimasi & Analisis Distribusi Kendaraan Bulanan")
 with st.expander("ℹ️ Cara Penggunaan Aplikasi", expanded=False):
     st.markdown("""
     **Langkah Penggunaan:**
-    1. **Upload Data Mingguan**: Unggah 7 file Excel (Senin-Minggu) untuk menghitung proporsi kendaraan di 10 titik.
+    1. **Upload Data Mingguan**: Unggah 7 file Excel (Senin-Minggu) untuk menghitung proporsi kendaraan di setiap titik checkpoint.
     2. **Upload Data Bulanan**: Unggah 1 file Excel berisi volume kendaraan harian (1-31 Juli).
     3. **Hasil Estimasi**: Dapatkan distribusi volume kendaraan per titik berdasarkan proporsi mingguan.
     4. **Analisis**: Lihat dashboard rekap harian dan bulanan untuk analisis lebih lanjut.
@@ -34,33 +70,6 @@ with st.expander("ℹ️ Cara Penggunaan Aplikasi", expanded=False):
     - Hasil: Diponegoro = 60 mobil, Imam Bonjol = 80 mobil, dst.
     """)
 
-# Fungsi untuk cleaning sheet
-def clean_sheet_advanced(df):
-    """Fungsi untuk cleaning sheet dengan aturan:
-    1. Hapus 3 baris pertama
-    2. Baris pertama setelah hapus 3 baris = header kosong, isi dengan 'No' dan 'Jenis Kendaraan'
-    3. Hapus dari baris 'Vehicle Type' sampai bawah
-    """
-    df_cleaned = df.iloc[3:].copy().reset_index(drop=True)
-    
-    vehicle_type_row = None
-    for idx, row in df_cleaned.iterrows():
-        for col in df_cleaned.columns:
-            if 'vehicle type' in str(row[col]).strip().lower():
-                vehicle_type_row = idx
-                break
-        if vehicle_type_row is not None:
-            break
-    
-    if vehicle_type_row is not None:
-        df_cleaned = df_cleaned.iloc[:vehicle_type_row].reset_index(drop=True)
-    
-    if len(df_cleaned) > 0 and len(df_cleaned.columns) >= 2:
-        df_cleaned.iloc[0, 0] = 'No'
-        df_cleaned.iloc[0, 1] = 'Jenis Kendaraan'
-    
-    return df_cleaned
-
 # STEP 1: UPLOAD DATA MINGGUAN
 st.header("📁 Langkah 1: Unggah Data Mingguan")
 st.markdown("Unggah **7 file Excel** untuk data mingguan (Senin-Minggu). Pastikan nama file seperti `tanggal 1 juli.xlsx` hingga `tanggal 7 juli.xlsx`.")
@@ -70,14 +79,18 @@ with col1:
     st.markdown("""
     **Ketentuan File:**
     - 7 file Excel, masing-masing untuk 1 hari (Senin-Minggu).
-    - Setiap file berisi **10 sheet** untuk 10 titik checkpoint.
+    - Setiap file berisi **satu sheet per titik checkpoint** (nama sheet diawali nomor titik, mis. `1. 1 Juli`).
     - Data akan dibersihkan otomatis (header dan footer dihapus).
     """)
 with col2:
-    st.info("**10 Titik Checkpoint:**\n1. Diponegoro\n2. Imam Bonjol\n3. A Yani\n4. Gajah Mada\n5. Sudirman\n6. Brantas\n7. Patimura\n8. Trunojoyo\n9. Arumdalu\n10. Mojorejo")
+    st.info(f"**{len(pipeline.REGISTRI.titik)} Titik Checkpoint:**\n" + "\n".join(
+        f"{t.nomor}. {t.nama.title()}" for t in pipeline.REGISTRI.titik
+    ))
 
-uploaded_files = st.file_uploader(
+# File unggahan disimpan di disk (unggahan.py) dan dibaca job dari sana
+uploaded_files = unggahan.unggah(
     "📂 Unggah 7 File Excel (Data Mingguan)",
+    key="mingguan_uploader",
     type=["xlsx"],
     accept_multiple_files=True,
     help="Unggah 7 file Excel untuk Senin-Minggu"
@@ -96,165 +109,44 @@ if uploaded_files:
             st.error(f"❌ {file_count}/7 file. Hanya 7 file yang diperbolehkan!")
     with col2:
         if file_count > 0:
-            st.info(f"📋 File: {', '.join([f.name for f in uploaded_files[:3]])}" + 
+            st.info(f"📋 File: {', '.join([f.nama for f in uploaded_files[:3]])}" + 
                     (f" +{file_count-3} lainnya" if file_count > 3 else ""))
 
-# Process weekly data
+# File berisi sama (mis. satu hari terunggah dua kali) membuat proporsi berat sebelah
+for pesan in unggahan.duplikat(("Data Mingguan", uploaded_files)):
+    st.warning(f"⚠️ File ganda: {pesan}")
+
+# Process weekly data (di worker latar belakang, progres dipoll sampai selesai)
 if uploaded_files and len(uploaded_files) == 7:
-    with st.spinner("🔄 Memproses data mingguan..."):
-        nama_checkpoint = [
-            "diponegoro", "imam bonjol", "a yani", "gajah mada", "sudirman",
-            "brantas", "patimura", "trunojoyo", "arumdalu", "mojorejo"
-        ]
-        df_mingguan_list = []
-        sheet_warnings = []
-
-        for uploaded_file in uploaded_files:
-            nama_file = uploaded_file.name.lower()
-            match = re.search(r"(\d{1,2})[\s\-_]*(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)", nama_file, re.IGNORECASE)
-            if not match:
-                st.error(f"❌ Nama file tidak sesuai: {nama_file}. Gunakan format seperti 'tanggal 1 juli.xlsx'.")
-                sheet_warnings.append(f"Nama file tidak sesuai: {nama_file}")
-                continue
-
-            tanggal = int(match.group(1))
-            bulan_str = match.group(2).lower()
-            bulan_map = {
-                "januari": 1, "februari": 2, "maret": 3, "april": 4,
-                "mei": 5, "juni": 6, "juli": 7, "agustus": 8,
-                "september": 9, "oktober": 10, "november": 11, "desember": 12
-            }
-            if bulan_str not in bulan_map:
-                st.error(f"❌ Bulan tidak dikenali: {bulan_str} di {nama_file}")
-                sheet_warnings.append(f"Bulan tidak dikenali: {bulan_str} di {nama_file}")
-                continue
-            bulan = bulan_map[bulan_str]
-            tanggal_str = f"{tanggal:02d}-{bulan:02d}-2025"
-
-            xls = pd.read_excel(uploaded_file, sheet_name=None, header=None)
-            df_list = []
-            for idx, (sheet_name, df) in enumerate(xls.items()):
-                sheet_name_lower = sheet_name.lower()
-                expected_sheet = f"{idx+1}. {tanggal} {bulan_str}"
-                
-                if sheet_name_lower == expected_sheet.lower():
-                    df_cleaned = clean_sheet_advanced(df)
-                    if len(df_cleaned) <= 1:
-                        sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} kosong setelah pembersihan")
-                        continue
-                    
-                    header_row = df_cleaned.iloc[0].tolist()
-                    df_proper = pd.DataFrame(df_cleaned.iloc[1:].values, columns=header_row)
-                    
-                    if 'Jenis Kendaraan' not in df_proper.columns:
-                        sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} tidak memiliki kolom 'Jenis Kendaraan'")
-                        continue
-                    
-                    jam_cols = [col for col in df_proper.columns if ":" in str(col)]
-                    if not jam_cols:
-                        sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} tidak memiliki kolom jam")
-                        continue
-                    
-                    for col in jam_cols:
-                        df_proper[col] = pd.to_numeric(df_proper[col], errors='coerce').fillna(0)
-                    
-                    df_proper = df_proper[df_proper['Jenis Kendaraan'].notna()]
-                    df_proper = df_proper[~df_proper['Jenis Kendaraan'].str.lower().str.contains('total|sum', na=False)]
-                    
-                    df_proper["Source"] = nama_checkpoint[idx]
-                    df_proper["Tanggal"] = tanggal_str
-                    df_list.append(df_proper)
-                else:
-                    sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} diabaikan (diharapkan {expected_sheet})")
-                    if idx < len(nama_checkpoint):
-                        df_cleaned = clean_sheet_advanced(df)
-                        if len(df_cleaned) <= 1:
-                            sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} kosong setelah pembersihan")
-                            continue
-                        
-                        header_row = df_cleaned.iloc[0].tolist()
-                        df_proper = pd.DataFrame(df_cleaned.iloc[1:].values, columns=header_row)
-                        
-                        if 'Jenis Kendaraan' not in df_proper.columns:
-                            sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} tidak memiliki kolom 'Jenis Kendaraan'")
-                            continue
-                        
-                        jam_cols = [col for col in df_proper.columns if ":" in str(col)]
-                        if not jam_cols:
-                            sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} tidak memiliki kolom jam")
-                            continue
-                        
-                        for col in jam_cols:
-                            df_proper[col] = pd.to_numeric(df_proper[col], errors='coerce').fillna(0)
-                        
-                        df_proper = df_proper[df_proper['Jenis Kendaraan'].notna()]
-                        df_proper = df_proper[~df_proper['Jenis Kendaraan'].str.lower().str.contains('total|sum', na=False)]
-                        
-                        df_proper["Source"] = nama_checkpoint[idx]
-                        df_proper["Tanggal"] = tanggal_str
-                        df_list.append(df_proper)
-
-            if df_list:
-                df_final = pd.concat(df_list, ignore_index=True)
-                jam_cols = [col for col in df_final.columns if ":" in str(col)]
-                if not jam_cols:
-                    st.error(f"❌ Tidak ditemukan kolom jam di {nama_file}!")
-                    sheet_warnings.append(f"Tidak ditemukan kolom jam di {nama_file}")
-                    continue
-                df_final = df_final.loc[~(df_final[jam_cols] == 0).all(axis=1)].copy()
-                df_mingguan_list.append(df_final)
-            else:
-                st.error(f"❌ Tidak ada data valid di {nama_file}")
-                sheet_warnings.append(f"Tidak ada data valid di {nama_file}")
+    files_mingguan = uploaded_files
+    sidik_mingguan = jobs.sidik_file(files_mingguan)
+    hasil_mingguan = jobs.hasil_sesi(
+        "job_mingguan", sidik_mingguan, "Memproses data mingguan",
+        proses_mingguan, files_mingguan, app="1minggu",
+        memori_mb=jobs.estimasi_memori_mb(files_mingguan, jobs.FAKTOR_MINGGUAN),
+    )
 
+    if hasil_mingguan is not None:
+        for error in hasil_mingguan["errors"]:
+            st.error(f"❌ {error}")
+
+        sheet_warnings = hasil_mingguan["sheet_warnings"]
         if sheet_warnings:
             with st.expander("⚠️ Peringatan Pemrosesan Data Mingguan", expanded=False):
                 st.write("**Peringatan:**")
                 for warning in sheet_warnings:
                     st.write(f"- {warning}")
 
-        if df_mingguan_list:
-            df_mingguan = pd.concat(df_mingguan_list, ignore_index=True)
+        if hasil_mingguan["df_proporsi"] is not None:
+            # Hasil sudah tersimpan di sesi, salinan unggahan di memori tidak dibutuhkan lagi
+            unggahan.lepas("mingguan_uploader")
+            df_mingguan = hasil_mingguan["df_mingguan"]
             
             with st.expander("👁️ Lihat Data Mingguan (20 Baris Pertama)", expanded=False):
                 st.write("Data setelah pembersihan:")
                 st.dataframe(df_mingguan.head(20), use_container_width=True)
             
-            jenis_map = {
-                "Large-Sized Coach": "Bus", "Light Truck": "Truck", "Minivan": "Roda 4",
-                "Pedestrian": "Pejalan kaki", "Pick-up Truck": "Pick-up", "SUV/MPV": "Roda 4",
-                "Sedan": "Roda 4", "Tricycle": "Tossa", "Truck": "Truck", "Two Wheeler": "Sepeda motor"
-            }
-            df_mingguan["Jenis Kendaraan"] = df_mingguan["Jenis Kendaraan"].replace(jenis_map)
-
-            keterangan_map = {
-                "diponegoro": "Keluar Batu", "imam bonjol": "Batu", "a yani": "Batu", "gajah mada": "Batu",
-                "sudirman": "Keluar Batu", "brantas": "Masuk Batu", "patimura": "Masuk Batu",
-                "trunojoyo": "Masuk Batu", "arumdalu": "Masuk Batu", "mojorejo": "Masuk Batu"
-            }
-            df_mingguan["Keterangan"] = df_mingguan["Source"].map(keterangan_map)
-
-            jam_cols = [col for col in df_mingguan.columns if ":" in str(col)]
-            kolom_awal = ["Source", "Jenis Kendaraan", "Tanggal", "Keterangan"]
-            for col in jam_cols:
-                df_mingguan[col] = pd.to_numeric(df_mingguan[col], errors='coerce').fillna(0)
-            
-            df_grouped = df_mingguan.groupby(kolom_awal, as_index=False)[jam_cols].sum()
-            
-            df_grouped["Tanggal"] = pd.to_datetime(df_grouped["Tanggal"], format='mixed', dayfirst=True)
-            df_grouped["Hari"] = df_grouped["Tanggal"].dt.day_name()
-            df_grouped["Total"] = df_grouped[jam_cols].sum(axis=1)
-
-            grouped_proporsi = df_grouped.groupby(["Hari", "Source", "Jenis Kendaraan"])["Total"].sum().reset_index()
-            total_per_jenis_per_hari = (
-                grouped_proporsi.groupby(["Hari", "Jenis Kendaraan"])["Total"]
-                .sum().reset_index().rename(columns={"Total": "TotalJenis"})
-            )
-            
-            df_proporsi = grouped_proporsi.merge(total_per_jenis_per_hari, on=["Hari", "Jenis Kendaraan"])
-            df_proporsi["Proporsi"] = df_proporsi["Total"] / df_proporsi["TotalJenis"]
-            df_proporsi["Proporsi"] = pd.to_numeric(df_proporsi["Proporsi"], errors='coerce').fillna(0)
-            df_proporsi["Proporsi (%)"] = (df_proporsi["Proporsi"] * 100).round(2)
+            df_proporsi = hasil_mingguan["df_proporsi"]
 
             st.success("✅ Data mingguan berhasil diproses!")
             col1, col2, col3, col4 = st.columns(4)
@@ -269,18 +161,20 @@ if uploaded_files and len(uploaded_files) == 7:
 
             with st.expander("📊 Lihat Proporsi Mingguan", expanded=False):
                 st.dataframe(df_proporsi, use_container_width=True)
-                output_proporsi = io.BytesIO()
-                with pd.ExcelWriter(output_proporsi, engine='openpyxl') as writer:
-                    df_proporsi.to_excel(writer, index=False, sheet_name="proporsi_mingguan")
+                output_proporsi, ext, mime = rekap_io.ekspor(
+                    {"proporsi_mingguan": df_proporsi},
+                    format_unduhan, stage="ekspor: proporsi_mingguan",
+                )
                 st.download_button(
                     "📥 Unduh Proporsi Mingguan", 
-                    data=output_proporsi.getvalue(), 
-                    file_name="proporsi_mingguan.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    data=output_proporsi, 
+                    file_name=f"proporsi_mingguan{ext}",
+                    mime=mime,
                     type="primary"
                 )
         else:
             st.error("❌ Tidak ada data valid. Periksa format file mingguan.")
+            perf.render_panel(profiler)
             st.stop()
 
 # STEP 2: UPLOAD DATA BULANAN
@@ -297,169 +191,51 @@ with col1:
 with col2:
     st.info("**Format Sheet:**\n- Nama: 1, 2, ..., 31\n- Kolom: Jenis Kendaraan, 00:00 - 23:00\n- Data: Jumlah kendaraan")
 
-uploaded_bulanan = st.file_uploader(
+uploaded_bulanan = unggahan.unggah(
     "📈 Unggah File Data Bulanan (.xlsx)", 
+    key="bulanan_uploader",
     type=["xlsx"],
     help="File Excel berisi volume kendaraan bulan ..."
 )
+per_jam = st.toggle(
+    "⏱️ Proporsi per jam",
+    key="proporsi_per_jam",
+    help="Bagi volume tiap jam dengan proporsi titik pada jam yang sama di data mingguan, "
+         "bukan satu proporsi harian untuk ke-24 jam",
+)
 
-# Process estimation
+# Process estimation (job latar belakang; dikirim ulang hanya jika file bulanan atau proporsi berubah)
+hasil_estimasi = None
 if uploaded_bulanan and 'df_proporsi' in locals():
-    with st.spinner("🔄 Memproses data bulanan..."):
-        nama_file_bulanan = uploaded_bulanan.name.lower()
-        
-        # Extract month from filename
-        match = re.search(r"(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)", nama_file_bulanan, re.IGNORECASE)
-        bulan_map = {
-            "januari": 1, "februari": 2, "maret": 3, "april": 4,
-            "mei": 5, "juni": 6, "juli": 7, "agustus": 8,
-            "september": 9, "oktober": 10, "november": 11, "desember": 12
-        }
-        
-        # Store month name for filename
-        bulan_nama = "juli"  # default
-        bulan = 7  # default
-        
-        if match and match.group(1).lower() in bulan_map:
-            bulan_nama = match.group(1).lower()
-            bulan = bulan_map[bulan_nama]
-        
-        xls = pd.read_excel(uploaded_bulanan, sheet_name=None, header=None)
-        list_df = []
-        sheet_warnings = []
-
-        def dedup_columns(cols):
-            counts = {}
-            new_cols = []
-            for col in cols:
-                if col not in counts:
-                    counts[col] = 1
-                    new_cols.append(col)
-                else:
-                    counts[col] += 1
-                    new_cols.append(f"{col}.{counts[col]}")
-            return new_cols
-
-        processed_sheets = 0
-        for sheet_name, df_raw in xls.items():
-            try:
-                sheet_num = int(sheet_name)
-                if sheet_num < 1 or sheet_num > 31:
-                    sheet_warnings.append(f"Sheet '{sheet_name}' diabaikan karena bukan tanggal valid")
-                    continue
-                
-                tanggal_str = f"{sheet_num:02d}-{bulan:02d}-2025"
-                try:
-                    pd.to_datetime(tanggal_str, format='%d-%m-%Y')
-                except ValueError:
-                    sheet_warnings.append(f"Sheet '{sheet_name}' menghasilkan tanggal tidak valid: {tanggal_str}")
-                    continue
-
-            except ValueError:
-                sheet_warnings.append(f"Sheet '{sheet_name}' diabaikan karena bukan angka")
-                continue
-
-            jenis_rows = df_raw[df_raw[0].astype(str).str.contains("Jenis Kendaraan", case=False, na=False)]
-            if jenis_rows.empty:
-                sheet_warnings.append(f"Sheet '{sheet_name}' tidak memiliki kolom 'Jenis Kendaraan'")
-                continue
-                
-            start_idx = jenis_rows.index[0] + 1
-            header_row = df_raw.iloc[start_idx - 1].fillna("NA").astype(str)
-            if header_row.duplicated().any():
-                header_row = dedup_columns(header_row)
-
-            df_jenis = df_raw.iloc[start_idx:].copy()
-            df_jenis.columns = header_row
-
-            mask_arah = df_jenis.apply(
-                lambda row: row.astype(str).str.contains(r"Arah|Keterangan|:", case=False, na=False).any(),
-                axis=1
-            )
-            df_jenis = df_jenis[~mask_arah]
-            df_jenis = df_jenis[df_jenis["Jenis Kendaraan"].notna()]
-            df_jenis = df_jenis[~df_jenis["Jenis Kendaraan"].astype(str).str.lower().str.contains("total|sum")]
-
-            df_jenis["Tanggal"] = tanggal_str
-            list_df.append(df_jenis)
-            processed_sheets += 1
-
-        if sheet_warnings:
-            with st.expander("⚠️ Peringatan Pemrosesan Data Bulanan", expanded=False):
-                st.write("**Peringatan:**")
-                for warning in sheet_warnings:
-                    st.write(f"- {warning}")
-
-        if not list_df:
-            st.error("❌ Tidak ada data valid di file bulanan. Periksa format file.")
-            st.stop()
-
-        df_bulanan = pd.concat(list_df, ignore_index=True)
-        jam_list = [f"{str(i).zfill(2)}:00:00" for i in range(24)]
-        columns = list(df_bulanan.columns)
-        
-        if len(columns) >= 25:
-            columns[1:25] = jam_list
-            df_bulanan.columns = columns
-            groupby_cols = jam_list.copy()
-            if 'Total' in df_bulanan.columns:
-                groupby_cols.append('Total')
-        else:
-            st.error(f"❌ File bulanan memiliki {len(columns)} kolom, minimal 25 kolom diperlukan.")
-            st.stop()
-
-        jenis_map = {
-            "Truk": "Truck", "Light Truck": "Truck", "Bus": "Bus", "Pick up Truck": "Pick-up",
-            "Sedan": "Roda 4", "Minivan": "Roda 4", "SUV/MPV": "Roda 4",
-            "Roda 3": "Tossa", "Roda 2": "Sepeda motor", "Pedestrian": "Pejalan kaki", "Unknown": "Unknown"
-        }
-        df_bulanan['Jenis Kendaraan'] = df_bulanan['Jenis Kendaraan'].map(jenis_map)
-
-        for col in jam_list:
-            if col in df_bulanan.columns:
-                df_bulanan[col] = pd.to_numeric(df_bulanan[col], errors='coerce').fillna(0)
-        
-        if 'Total' in df_bulanan.columns:
-            df_bulanan['Total'] = pd.to_numeric(df_bulanan['Total'], errors='coerce').fillna(0)
-        
-        df_bulanan = df_bulanan.groupby(['Tanggal', 'Jenis Kendaraan'], as_index=False)[groupby_cols].sum()
-        df_bulanan = df_bulanan.sort_values(by=['Tanggal', 'Jenis Kendaraan']).reset_index(drop=True)
-
-        try:
-            df_bulanan["Tanggal"] = pd.to_datetime(df_bulanan["Tanggal"], format='mixed', dayfirst=True)
-        except ValueError as e:
-            st.error(f"❌ Gagal mengonversi tanggal: {str(e)}")
-            st.stop()
-
-        df_bulanan["Hari"] = df_bulanan["Tanggal"].dt.day_name()
-
-        df_jenis_long = df_bulanan.melt(
-            id_vars=["Tanggal", "Jenis Kendaraan", "Hari"],
-            value_vars=jam_list,
-            var_name="Jam",
-            value_name="Jumlah"
-        )
-        
-        df_jenis_long["Jumlah"] = pd.to_numeric(df_jenis_long["Jumlah"], errors='coerce').fillna(0)
-
-        df_join = df_jenis_long.merge(df_proporsi[["Hari", "Source", "Jenis Kendaraan", "Proporsi"]], 
-                                      on=["Hari", "Jenis Kendaraan"], how="left")
-
-        df_join["Jumlah_Estimasi"] = df_join["Jumlah"] * df_join["Proporsi"]
+    # Extract month from filename (default juli)
+    bulan, bulan_nama = pipeline.bulan_dari_nama_file(uploaded_bulanan.nama.lower())
+
+    files_bulanan = [uploaded_bulanan]
+    hasil_estimasi = jobs.hasil_sesi(
+        "job_estimasi", jobs.sidik_file(files_bulanan, sidik_mingguan, per_jam),
+        "Memproses data bulanan", pipeline.jalankan_estimasi,
+        uploaded_bulanan, uploaded_bulanan.nama, df_proporsi, parse=unggahan.parse_bulanan, app="1minggu",
+        sampel=df_mingguan, per_jam=per_jam, agregasi_sampel="sum",
+        memori_mb=jobs.estimasi_memori_mb(files_bulanan, jobs.FAKTOR_BULANAN),
+    )
+elif uploaded_bulanan and 'df_proporsi' not in locals():
+    st.warning("⚠️ Unggah data mingguan terlebih dahulu untuk menghitung proporsi!")
 
-        df_pivot = df_join.pivot_table(
-            index=["Tanggal", "Jenis Kendaraan", "Source"],
-            columns="Jam",
-            values="Jumlah_Estimasi",
-            aggfunc="sum"
-        ).reset_index()
+if hasil_estimasi is not None:
+    sheet_warnings = hasil_estimasi["sheet_warnings"]
+    if sheet_warnings:
+        with st.expander("⚠️ Peringatan Pemrosesan Data Bulanan", expanded=False):
+            st.write("**Peringatan:**")
+            for warning in sheet_warnings:
+                st.write(f"- {warning}")
 
-        df_pivot.iloc[:, 3:] = df_pivot.iloc[:, 3:].fillna(0).astype(int)
+    if hasil_estimasi["gagal"]:
+        st.error(f"❌ {hasil_estimasi['gagal']}")
+        perf.render_panel(profiler)
+        st.stop()
 
-        df_pivot["Tanggal"] = pd.to_datetime(df_pivot["Tanggal"], errors="coerce")
-        df_sorted = df_pivot.sort_values(by=["Tanggal", "Source"])
-        df_sorted["Tanggal"] = df_sorted["Tanggal"].dt.strftime("%d-%m-%Y")
-        df_final = df_sorted[df_sorted["Jenis Kendaraan"].str.lower() != "unknown"]
+    unggahan.lepas("bulanan_uploader")
+    df_final = hasil_estimasi["df_final"]
 
     st.success("🎉 Estimasi volume kendaraan berhasil dihitung!")
     
@@ -475,24 +251,8 @@ if uploaded_bulanan and 'df_proporsi' in locals():
 
     st.header("🔍 Kualitas Data")
     
-    all_tanggal = df_final["Tanggal"].unique()
-    all_source = df_final["Source"].unique()
-    all_jenis = df_final["Jenis Kendaraan"].unique()
-    
-    full_combinations = pd.DataFrame(
-        list(itertools.product(all_tanggal, all_source, all_jenis)),
-        columns=["Tanggal", "Source", "Jenis Kendaraan"]
-    )
-    
-    merged_check = full_combinations.merge(
-        df_final[["Tanggal", "Source", "Jenis Kendaraan"]],
-        on=["Tanggal", "Source", "Jenis Kendaraan"],
-        how="left",
-        indicator=True
-    )
-    
-    missing_data = merged_check[merged_check["_merge"] == "left_only"].drop(columns=["_merge"])
-    
+    full_combinations, missing_data = hasil_estimasi["full_combinations"], hasil_estimasi["missing_data"]
+
     col1, col2, col3 = st.columns(3)
     completeness = ((len(full_combinations) - len(missing_data)) / len(full_combinations) * 100) if len(full_combinations) > 0 else 100
     
@@ -577,71 +337,94 @@ if uploaded_bulanan and 'df_proporsi' in locals():
                     use_container_width=True
                 )
                 
-                output_missing = io.BytesIO()
-                with pd.ExcelWriter(output_missing, engine='openpyxl') as writer:
-                    missing_data.to_excel(writer, index=False, sheet_name="data_hilang_detail")
-                    df_missing_summary.to_excel(writer, index=False, sheet_name="ringkasan_per_titik")
+                output_missing, ext, mime = rekap_io.ekspor(
+                    {"data_hilang_detail": missing_data, "ringkasan_per_titik": df_missing_summary},
+                    format_unduhan, stage="ekspor: analisis_data_hilang",
+                )
                 
                 st.download_button(
                     "📥 Unduh Analisis Data Hilang", 
-                    data=output_missing.getvalue(), 
-                    file_name="analisis_data_hilang.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    data=output_missing, 
+                    file_name=f"analisis_data_hilang{ext}",
+                    mime=mime
                 )
 
     st.header("📋 Hasil Estimasi Volume Kendaraan")
     
-    with st.expander("👁️ Lihat Hasil Estimasi (20 Baris Pertama)", expanded=True):
-        st.dataframe(df_final.head(20), use_container_width=True)
+    with st.expander("👁️ Jelajahi Hasil Estimasi", expanded=True):
+        render_result_browser(df_final, key="hasil_1minggu")
     
     col1, col2, col3 = st.columns(3)
     
     # Button 1: Hasil Estimasi Saja (tanpa sheet tambahan)
     with col1:
-        output_estimasi_only = io.BytesIO()
-        with pd.ExcelWriter(output_estimasi_only, engine="openpyxl") as writer:
-            df_final.to_excel(writer, index=False, sheet_name="estimasi_volume")
+        output_estimasi_only, ext, mime = rekap_io.ekspor(
+            {"estimasi_volume": df_final},
+            format_unduhan, stage="ekspor: hasil rekap",
+        )
         
         # Capitalize first letter of month name for filename
         bulan_nama_formatted = bulan_nama.capitalize()
         
         st.download_button(
             "🎯 Unduh Hasil Estimasi Saja", 
-            data=output_estimasi_only.getvalue(), 
-            file_name=f" hasil rekap {bulan_nama_formatted} dari 1 minggu.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            data=output_estimasi_only, 
+            file_name=f" hasil rekap {bulan_nama_formatted} dari 1 minggu{ext}",
+            mime=mime,
             type="primary",
             help=f"Download hasil estimasi volume kendaraan bulan {bulan_nama_formatted} tanpa sheet tambahan"
         )
     
     # Button 2: Hasil Lengkap dengan sheet tambahan
     with col2:
-        output_final = io.BytesIO()
-        with pd.ExcelWriter(output_final, engine="openpyxl") as writer:
-            df_final.to_excel(writer, index=False, sheet_name="estimasi_final")
-            df_proporsi.to_excel(writer, index=False, sheet_name="proporsi_mingguan")
-            if len(missing_data) > 0:
-                missing_data.to_excel(writer, index=False, sheet_name="data_hilang")
+        sheets_final = {"estimasi_final": df_final, "proporsi_mingguan": df_proporsi}
+        if len(missing_data) > 0:
+            sheets_final["data_hilang"] = missing_data
+        output_final, ext, mime = rekap_io.ekspor(
+            sheets_final,
+            format_unduhan, stage="ekspor: estimasi_volume_lalu_lintas",
+        )
         
         st.download_button(
             "📊 Unduh Hasil Lengkap", 
-            data=output_final.getvalue(), 
-            file_name="estimasi_volume_lalu_lintas.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            data=output_final, 
+            file_name=f"estimasi_volume_lalu_lintas{ext}",
+            mime=mime,
             help="Download hasil estimasi dengan proporsi mingguan dan analisis data hilang"
         )
     
     # Button 3: Proporsi Mingguan saja
     with col3:
-        output_proporsi = io.BytesIO()
-        with pd.ExcelWriter(output_proporsi, engine='openpyxl') as writer:
-            df_proporsi.to_excel(writer, index=False, sheet_name="proporsi_mingguan")
+        output_proporsi, ext, mime = rekap_io.ekspor(
+            {"proporsi_mingguan": df_proporsi},
+            format_unduhan, stage="ekspor: proporsi_mingguan",
+        )
         
         st.download_button(
             "📈 Unduh Proporsi Mingguan", 
-            data=output_proporsi.getvalue(), 
-            file_name="proporsi_mingguan.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            data=output_proporsi, 
+            file_name=f"proporsi_mingguan{ext}",
+            mime=mime
+        )
+
+    # Unduhan per checkpoint: satu file per Source (atau per Keterangan) dalam satu ZIP,
+    # ditulis paralel di proses worker
+    col_pisah, col_unduh_grup = st.columns([1, 2])
+    with col_pisah:
+        pisah_per = st.radio("🗂️ Pisah file per", ["Source", "Keterangan"], horizontal=True, key="pisah_per")
+    with col_unduh_grup:
+        df_grup = df_final
+        if pisah_per == "Keterangan":
+            df_grup = df_final.assign(Keterangan=pipeline.REGISTRI.keterangan.petakan(df_final["Source"]))
+        output_per_grup, ext, mime = rekap_io.ekspor_per_grup(
+            df_grup, format_unduhan, kolom=pisah_per, stage=f"ekspor: per {pisah_per}",
+        )
+        st.download_button(
+            "🗂️ Unduh per Checkpoint (ZIP)",
+            data=output_per_grup,
+            file_name=f"hasil rekap {bulan_nama_formatted} dari 1 minggu per {pisah_per.lower()}{ext}",
+            mime=mime,
+            help="Satu file hasil estimasi untuk setiap checkpoint / kelompok Keterangan",
         )
 
     # DASHBOARD ANALISIS
@@ -652,12 +435,7 @@ if uploaded_bulanan and 'df_proporsi' in locals():
         df = df.copy()
         df["Tanggal"] = pd.to_datetime(df["Tanggal"], format='mixed', dayfirst=True, errors='coerce')
         df["Hari"] = df["Tanggal"].dt.day_name()
-        keterangan_map = {
-            "diponegoro": "Keluar Batu", "imam bonjol": "Batu", "a yani": "Batu", "gajah mada": "Batu",
-            "sudirman": "Keluar Batu", "brantas": "Masuk Batu", "patimura": "Masuk Batu",
-            "trunojoyo": "Masuk Batu", "arumdalu": "Masuk Batu", "mojorejo": "Masuk Batu"
-        }
-        df["Keterangan"] = df["Source"].map(keterangan_map)
+        df["Keterangan"] = pipeline.REGISTRI.keterangan.petakan(df["Source"])
         return df
 
     df_dashboard = prepare_dashboard_data(df_final)
@@ -710,30 +488,31 @@ if uploaded_bulanan and 'df_proporsi' in locals():
                     total_per_kendaraan["Jumlah"] / total_per_kendaraan["Jumlah"].sum() * 100
                 ).round(1)
 
-                fig1, ax1 = plt.subplots()
-                wedges, texts = ax1.pie(
-                    total_per_kendaraan["Jumlah"],
-                    labels=None,  # tidak pakai label di pie
-                    startangle=90,
-                    counterclock=False,
-                    colors=sns.color_palette("pastel")[0:len(total_per_kendaraan)],
-                )
-                ax1.axis('equal')
-
-                # Legend dengan persentase di dalam teks
-                legend_labels = [
-                    f"{jenis} ({persen}%)" 
-                    for jenis, persen in zip(total_per_kendaraan["Jenis Kendaraan"], total_per_kendaraan["Persen"])
-                ]
-                ax1.legend(
-                    wedges,
-                    legend_labels,
-                    title="Jenis Kendaraan",
-                    loc="center left",
-                    bbox_to_anchor=(1, 0, 0.5, 1),
-                    frameon=False
-                )
-                st.pyplot(fig1)
+                with perf.stage("chart: pie harian"):
+                    fig1, ax1 = plt.subplots()
+                    wedges, texts = ax1.pie(
+                        total_per_kendaraan["Jumlah"],
+                        labels=None,  # tidak pakai label di pie
+                        startangle=90,
+                        counterclock=False,
+                        colors=sns.color_palette("pastel")[0:len(total_per_kendaraan)],
+                    )
+                    ax1.axis('equal')
+
+                    # Legend dengan persentase di dalam teks
+                    legend_labels = [
+                        f"{jenis} ({persen}%)" 
+                        for jenis, persen in zip(total_per_kendaraan["Jenis Kendaraan"], total_per_kendaraan["Persen"])
+                    ]
+                    ax1.legend(
+                        wedges,
+                        legend_labels,
+                        title="Jenis Kendaraan",
+                        loc="center left",
+                        bbox_to_anchor=(1, 0, 0.5, 1),
+                        frameon=False
+                    )
+                    st.pyplot(fig1)
 
 
             st.markdown("---")
@@ -741,13 +520,14 @@ if uploaded_bulanan and 'df_proporsi' in locals():
             kendaraan_pilih = st.selectbox("Pilih Jenis Kendaraan", total_per_kendaraan["Jenis Kendaraan"], key="daily_vehicle_select")
             df_jam = df_melted[df_melted["Jenis Kendaraan"] == kendaraan_pilih]
 
-            fig2, ax2 = plt.subplots(figsize=(12, 4))
-            sns.barplot(data=df_jam, x="Jam", y="Jumlah", ax=ax2, palette="Set2")
-            ax2.set_title(f"Distribusi Waktu - {kendaraan_pilih}")
-            ax2.set_ylabel("Jumlah Kendaraan")
-            ax2.set_xlabel("Jam")
-            plt.xticks(rotation=45)
-            st.pyplot(fig2)
+            with perf.stage("chart: pola waktu harian"):
+                fig2, ax2 = plt.subplots(figsize=(12, 4))
+                sns.barplot(data=df_jam, x="Jam", y="Jumlah", ax=ax2, palette="Set2")
+                ax2.set_title(f"Distribusi Waktu - {kendaraan_pilih}")
+                ax2.set_ylabel("Jumlah Kendaraan")
+                ax2.set_xlabel("Jam")
+                plt.xticks(rotation=45)
+                st.pyplot(fig2)
 
             st.markdown("---")
             st.subheader("📦 Total Kendaraan Masuk/Keluar Batu")
@@ -806,31 +586,31 @@ if uploaded_bulanan and 'df_proporsi' in locals():
                     df_source["Jumlah"] / df_source["Jumlah"].sum() * 100
                 ).round(1)
 
-                fig1, ax1 = plt.subplots()
-                wedges, texts = ax1.pie(
-                    df_source["Jumlah"],
-                    labels=None,  # tidak pakai label di pie
-                    startangle=90,
-                    counterclock=False,
-                    colors=sns.color_palette("pastel")[0:len(df_source)],
-                )
-                ax1.axis('equal')
-
-                # Legend dengan persentase di dalam teks
-                legend_labels = [
-                    f"{jenis} ({persen}%)" 
-                    for jenis, persen in zip(df_source["Jenis Kendaraan"], df_source["Persen"])
-                ]
-                ax1.legend(
-                    wedges,
-                    legend_labels,
-                    title="Jenis Kendaraan",
-                    loc="center left",
-                    bbox_to_anchor=(1, 0, 0.5, 1),
-                    frameon=False
-                )
-                st.pyplot(fig1)
-
-
-elif uploaded_bulanan and 'df_proporsi' not in locals():
-    st.warning("⚠️ Unggah data mingguan terlebih dahulu untuk menghitung proporsi!")
\ No newline at end of file
+                with perf.stage("chart: pie bulanan"):
+                    fig1, ax1 = plt.subplots()
+                    wedges, texts = ax1.pie(
+                        df_source["Jumlah"],
+                        labels=None,  # tidak pakai label di pie
+                        startangle=90,
+                        counterclock=False,
+                        colors=sns.color_palette("pastel")[0:len(df_source)],
+                    )
+                    ax1.axis('equal')
+
+                    # Legend dengan persentase di dalam teks
+                    legend_labels = [
+                        f"{jenis} ({persen}%)" 
+                        for jenis, persen in zip(df_source["Jenis Kendaraan"], df_source["Persen"])
+                    ]
+                    ax1.legend(
+                        wedges,
+                        legend_labels,
+                        title="Jenis Kendaraan",
+                        loc="center left",
+                        bbox_to_anchor=(1, 0, 0.5, 1),
+                        frameon=False
+                    )
+                    st.pyplot(fig1)
+
+
+perf.render_panel(profiler)
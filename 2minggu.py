@@ -2,11 +2,14 @@ import streamlit as st
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-import io
-import re
-import itertools
 from datetime import datetime
 import uuid
+from result_browser import render_result_browser
+import jobs
+import perf
+import pipeline
+import rekap_io
+import unggahan
 
 # Page config
 st.set_page_config(
@@ -15,6 +18,18 @@ st.set_page_config(
     layout="wide"
 )
 
+# Instrumentasi per stage (ditampilkan di panel Performa di akhir halaman)
+profiler = perf.activate(perf.Profiler("2minggu"))
+
+# Format semua tombol unduh; Parquet/CSV gzip jauh lebih cepat dari Excel dan
+# file "hasil rekap ... .parquet" bisa langsung dibaca dashboard
+format_unduhan = st.sidebar.radio(
+    "💾 Format Unduhan",
+    list(rekap_io.FORMAT_EKSPOR),
+    key="format_unduhan",
+    help="Unduhan berisi beberapa sheet menjadi ZIP (satu file per sheet) untuk format selain Excel",
+)
+
 # Main header
 st.title("🚦 Analisis Volume Lalu Lintas - 2 Minggu")
 st.subheader("Estimasi & Analisis Distribusi Kendaraan Bulanan Berdasarkan 2 Minggu Sample")
@@ -23,7 +38,7 @@ st.subheader("Estimasi & Analisis Distribusi Kendaraan Bulanan Berdasarkan 2 Min
 with st.expander("ℹ️ Cara Penggunaan Aplikasi", expanded=False):
     st.markdown("""
     **Langkah Penggunaan:**
-    1. **Upload Data Minggu 1**: Unggah 7 file Excel (Minggu pertama) untuk menghitung proporsi kendaraan di 10 titik.
+    1. **Upload Data Minggu 1**: Unggah 7 file Excel (Minggu pertama) untuk menghitung proporsi kendaraan di setiap titik checkpoint.
     2. **Upload Data Minggu 3**: Unggah 7 file Excel (Minggu ketiga) untuk melengkapi data proporsi.
     3. **Upload Data Bulanan**: Unggah 1 file Excel berisi volume kendaraan harian untuk keseluruhan bulan.
     4. **Hasil Estimasi**: Dapatkan distribusi volume kendaraan per titik berdasarkan rata-rata proporsi 2 minggu.
@@ -35,177 +50,61 @@ with st.expander("ℹ️ Cara Penggunaan Aplikasi", expanded=False):
     - Pola lalu lintas lebih stabil dan dapat diandalkan
     """)
 
-# Konfigurasi global
-NAMA_CHECKPOINT = [
-    "diponegoro", "imam bonjol", "a yani", "gajah mada", "sudirman",
-    "brantas", "patimura", "trunojoyo", "arumdalu", "mojorejo"
-]
-
-JENIS_MAP = {
-    "Large-Sized Coach": "Bus",
-    "Light Truck": "Truck", 
-    "Minivan": "Roda 4",
-    "Pedestrian": "Pejalan kaki",
-    "Pick-up Truck": "Pick-up",
-    "SUV/MPV": "Roda 4",
-    "Sedan": "Roda 4",
-    "Tricycle": "Tossa",
-    "Truck": "Truck",
-    "Two Wheeler": "Sepeda motor"
-}
-
-KETERANGAN_MAP = {
-    "diponegoro": "Keluar Batu", "imam bonjol": "Batu", "a yani": "Batu", 
-    "gajah mada": "Batu", "sudirman": "Keluar Batu", "brantas": "Masuk Batu",
-    "patimura": "Masuk Batu", "trunojoyo": "Masuk Batu", 
-    "arumdalu": "Masuk Batu", "mojorejo": "Masuk Batu"
-}
-
-JENIS_MAP_BULANAN = {
-    "Truk": "Truck", "Light Truck": "Truck", "Bus": "Bus", "Pick up Truck": "Pick-up",
-    "Sedan": "Roda 4", "Minivan": "Roda 4", "SUV/MPV": "Roda 4",
-    "Roda 3": "Tossa", "Roda 2": "Sepeda motor", "Pedestrian": "Pejalan kaki", 
-    "Unknown": "Unknown"
-}
-
 # Fungsi helper
-def clean_sheet_advanced(df):
-    """Fungsi untuk cleaning sheet dengan aturan:
-    1. Hapus 3 baris pertama
-    2. Baris pertama setelah hapus 3 baris = header kosong, isi dengan 'No' dan 'Jenis Kendaraan'
-    3. Hapus dari baris 'Vehicle Type' sampai bawah
-    """
-    df_cleaned = df.iloc[3:].copy().reset_index(drop=True)
-    
-    vehicle_type_row = None
-    for idx, row in df_cleaned.iterrows():
-        for col in df_cleaned.columns:
-            if 'vehicle type' in str(row[col]).strip().lower():
-                vehicle_type_row = idx
-                break
-        if vehicle_type_row is not None:
-            break
-    
-    if vehicle_type_row is not None:
-        df_cleaned = df_cleaned.iloc[:vehicle_type_row].reset_index(drop=True)
-    
-    if len(df_cleaned) > 0 and len(df_cleaned.columns) >= 2:
-        df_cleaned.iloc[0, 0] = 'No'
-        df_cleaned.iloc[0, 1] = 'Jenis Kendaraan'
-    
-    return df_cleaned
-
-def dedup_columns(cols):
-    """Fungsi untuk rename header duplikat"""
-    counts = {}
-    new_cols = []
-    for col in cols:
-        if col not in counts:
-            counts[col] = 1
-            new_cols.append(col)
-        else:
-            counts[col] += 1
-            new_cols.append(f"{col}.{counts[col]}")
-    return new_cols
+def proses_minggu(files, minggu_label):
+    """Fungsi untuk job latar belakang: parse 7 file satu minggu lalu gabungkan"""
+    jobs.rencana(len(files) + 1)
+    df_mingguan_list, sheet_warnings, errors = [], [], []
+    for f in files:
+        nama_file = f.nama
+        with jobs.tahap(f"membaca {nama_file}"):
+            try:
+                df_mingguan_list.append(unggahan.parse_mingguan(
+                    f, sheet_warnings,
+                    cek_nama_sheet=False, minggu_label=minggu_label,
+                ))
+            except Exception as e:
+                errors.append(f"Error memproses {nama_file.lower()}: {str(e)}")
+                sheet_warnings.append(f"Error di {nama_file.lower()}: {str(e)}")
+
+    df_final = None
+    if df_mingguan_list:
+        with jobs.tahap(f"menggabungkan {minggu_label}"):
+            df_final = pipeline.gabung_mingguan(df_mingguan_list, minggu_label)
+    return {"sheet_warnings": sheet_warnings, "errors": errors, "df_final": df_final}
+
 
 def process_weekly_data(uploaded_files, minggu_label):
-    """Fungsi untuk memproses data mingguan"""
+    """Fungsi untuk memproses data mingguan di worker latar belakang.
+
+    Mengembalikan None selama job masih berjalan (progress bar ditampilkan).
+    """
     
     if not uploaded_files or len(uploaded_files) != 7:
         st.error(f"❌ {minggu_label}: Harus mengunggah tepat 7 file!")
         return None
     
-    df_mingguan_list = []
-    sheet_warnings = []
-    
-    with st.spinner(f"🔄 Memproses data {minggu_label}..."):
-        for uploaded_file in uploaded_files:
-            nama_file = uploaded_file.name.lower()
-            
-            # Extract tanggal dari nama file
-            match = re.search(r"(\d{1,2})[\s\-_]*(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)", nama_file, re.IGNORECASE)
-            if not match:
-                st.error(f"❌ Nama file tidak sesuai: {nama_file}. Gunakan format seperti 'tanggal 1 juli.xlsx'.")
-                continue
-
-            tanggal = int(match.group(1))
-            bulan_str = match.group(2).lower()
-            bulan_map = {
-                "januari": 1, "februari": 2, "maret": 3, "april": 4,
-                "mei": 5, "juni": 6, "juli": 7, "agustus": 8,
-                "september": 9, "oktober": 10, "november": 11, "desember": 12
-            }
-            bulan = bulan_map.get(bulan_str, 7)
-            tanggal_str = f"{tanggal:02d}-{bulan:02d}-2025"
+    files = uploaded_files
+    hasil = jobs.hasil_sesi(
+        f"job_{minggu_label}", jobs.sidik_file(files, minggu_label),
+        f"Memproses data {minggu_label}", proses_minggu, files, minggu_label, app="2minggu",
+        memori_mb=jobs.estimasi_memori_mb(files, jobs.FAKTOR_MINGGUAN),
+    )
+    if hasil is None:
+        return None
 
-            try:
-                xls = pd.read_excel(uploaded_file, sheet_name=None, header=None)
-                df_list = []
-                
-                for idx, (sheet_name, df) in enumerate(xls.items()):
-                    if idx >= 10:  # Hanya proses 10 sheet pertama
-                        break
-                        
-                    df_cleaned = clean_sheet_advanced(df)
-                    if len(df_cleaned) <= 1:
-                        sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} kosong")
-                        continue
-                    
-                    # Buat header yang proper
-                    header_row = df_cleaned.iloc[0].tolist()
-                    df_proper = pd.DataFrame(df_cleaned.iloc[1:].values, columns=header_row)
-                    
-                    if 'Jenis Kendaraan' not in df_proper.columns:
-                        sheet_warnings.append(f"Sheet {sheet_name} tidak memiliki kolom 'Jenis Kendaraan'")
-                        continue
-                    
-                    # Identifikasi kolom jam
-                    jam_cols = [col for col in df_proper.columns if ":" in str(col)]
-                    if not jam_cols:
-                        sheet_warnings.append(f"Sheet {sheet_name} tidak memiliki kolom jam")
-                        continue
-                    
-                    # Konversi kolom jam ke numerik
-                    for col in jam_cols:
-                        df_proper[col] = pd.to_numeric(df_proper[col], errors='coerce').fillna(0)
-                    
-                    # Bersihkan data
-                    df_proper = df_proper[df_proper['Jenis Kendaraan'].notna()]
-                    df_proper = df_proper[~df_proper['Jenis Kendaraan'].str.lower().str.contains('total|sum', na=False)]
-                    
-                    # Tambahkan metadata
-                    df_proper["Source"] = NAMA_CHECKPOINT[idx] if idx < len(NAMA_CHECKPOINT) else f"checkpoint_{idx+1}"
-                    df_proper["Tanggal"] = tanggal_str
-                    df_proper["Minggu"] = minggu_label
-                    
-                    df_list.append(df_proper)
-                
-                if df_list:
-                    df_combined = pd.concat(df_list, ignore_index=True)
-                    # Hapus baris dengan semua jam = 0
-                    jam_cols = [col for col in df_combined.columns if ":" in str(col)]
-                    df_combined = df_combined.loc[~(df_combined[jam_cols] == 0).all(axis=1)].copy()
-                    df_mingguan_list.append(df_combined)
-                
-            except Exception as e:
-                st.error(f"❌ Error memproses {nama_file}: {str(e)}")
-                sheet_warnings.append(f"Error di {nama_file}: {str(e)}")
+    for error in hasil["errors"]:
+        st.error(f"❌ {error}")
     
-    if sheet_warnings:
+    if hasil["sheet_warnings"]:
         with st.expander(f"⚠️ Peringatan {minggu_label}", expanded=False):
-            for warning in sheet_warnings:
+            for warning in hasil["sheet_warnings"]:
                 st.write(f"- {warning}")
     
-    if df_mingguan_list:
-        df_final = pd.concat(df_mingguan_list, ignore_index=True)
-        
-        # Mapping jenis kendaraan
-        df_final["Jenis Kendaraan"] = df_final["Jenis Kendaraan"].replace(JENIS_MAP)
-        df_final["Keterangan"] = df_final["Source"].map(KETERANGAN_MAP)
-        
-        # Konversi tanggal
-        df_final["Tanggal"] = pd.to_datetime(df_final["Tanggal"], format='mixed', dayfirst=True)
-        df_final["Hari"] = df_final["Tanggal"].dt.day_name()
+    if hasil["df_final"] is not None:
+        # Hasil sudah tersimpan di sesi, salinan unggahan di memori tidak dibutuhkan lagi
+        unggahan.lepas(f"{minggu_label.lower()}_uploader")
+        df_final = hasil["df_final"]
         
         st.success(f"✅ {minggu_label} berhasil diproses: {len(df_final)} baris data")
         return df_final
@@ -222,13 +121,15 @@ with col1:
     st.markdown("""
     **Ketentuan File Minggu 1:**
     - 7 file Excel, masing-masing untuk 1 hari dalam minggu pertama
-    - Setiap file berisi **10 sheet** untuk 10 titik checkpoint  
+    - Setiap file berisi **satu sheet per titik checkpoint** (nama sheet diawali nomor titik, mis. `1. 1 Juli`)  
     - Nama file: `tanggal X bulan.xlsx` (contoh: `tanggal 1 juli.xlsx`)
     """)
 with col2:
-    st.info("**10 Titik Checkpoint:**\n1. Diponegoro\n2. Imam Bonjol\n3. A Yani\n4. Gajah Mada\n5. Sudirman\n6. Brantas\n7. Patimura\n8. Trunojoyo\n9. Arumdalu\n10. Mojorejo")
+    st.info(f"**{len(pipeline.REGISTRI.titik)} Titik Checkpoint:**\n" + "\n".join(
+        f"{t.nomor}. {t.nama.title()}" for t in pipeline.REGISTRI.titik
+    ))
 
-uploaded_minggu1 = st.file_uploader(
+uploaded_minggu1 = unggahan.unggah(
     "📂 Unggah 7 File Excel (Minggu 1)",
     type=["xlsx"],
     accept_multiple_files=True,
@@ -249,7 +150,7 @@ if uploaded_minggu1:
             st.error(f"❌ Minggu 1: {file_count}/7 file (maksimal 7)")
     with col2:
         if file_count > 0:
-            st.info(f"📋 File: {', '.join([f.name for f in uploaded_minggu1[:3]])}" + 
+            st.info(f"📋 File: {', '.join([f.nama for f in uploaded_minggu1[:3]])}" + 
                     (f" +{file_count-3} lainnya" if file_count > 3 else ""))
 
 # Process minggu 1
@@ -261,7 +162,7 @@ if uploaded_minggu1 and len(uploaded_minggu1) == 7:
 st.header("📁 Langkah 2: Unggah Data Minggu 3")  
 st.markdown("Unggah **7 file Excel** untuk minggu ketiga (contoh: tanggal 15-21 Juli)")
 
-uploaded_minggu3 = st.file_uploader(
+uploaded_minggu3 = unggahan.unggah(
     "📂 Unggah 7 File Excel (Minggu 3)",
     type=["xlsx"],
     accept_multiple_files=True,
@@ -282,9 +183,13 @@ if uploaded_minggu3:
             st.error(f"❌ Minggu 3: {file_count}/7 file (maksimal 7)")
     with col2:
         if file_count > 0:
-            st.info(f"📋 File: {', '.join([f.name for f in uploaded_minggu3[:3]])}" + 
+            st.info(f"📋 File: {', '.join([f.nama for f in uploaded_minggu3[:3]])}" + 
                     (f" +{file_count-3} lainnya" if file_count > 3 else ""))
 
+# File yang sama di Minggu 1 dan Minggu 3 akan dirata-rata dengan dirinya sendiri
+for pesan in unggahan.duplikat(("Minggu 1", uploaded_minggu1), ("Minggu 3", uploaded_minggu3)):
+    st.warning(f"⚠️ File ganda: {pesan}")
+
 # Process minggu 3
 df_minggu3 = None
 if uploaded_minggu3 and len(uploaded_minggu3) == 7:
@@ -295,31 +200,8 @@ if df_minggu1 is not None and df_minggu3 is not None:
     st.header("🔗 Langkah 3: Penggabungan Data 2 Minggu")
     
     with st.spinner("🔄 Menggabungkan data 2 minggu dan menghitung proporsi..."):
-        # Gabungkan 2 minggu
-        df_2minggu = pd.concat([df_minggu1, df_minggu3], ignore_index=True)
-        
-        # Identifikasi kolom jam
-        jam_cols = [col for col in df_2minggu.columns if ":" in str(col)]
-        
-        # Hitung rata-rata per Hari + Jenis Kendaraan + Source
-        df_avg_hari = (
-            df_2minggu.groupby(["Hari", "Source", "Jenis Kendaraan", "Keterangan"], as_index=False)
-            [jam_cols].mean()
-        )
-        
-        # Tambahkan kolom Total per baris
-        df_avg_hari["Total"] = df_avg_hari[jam_cols].sum(axis=1)
-        
-        # Hitung total per jenis kendaraan per hari
-        total_per_jenis_per_hari = (
-            df_avg_hari.groupby(["Hari", "Jenis Kendaraan"])["Total"]
-            .sum().reset_index().rename(columns={"Total": "TotalJenis"})
-        )
-        
-        # Gabungkan dan hitung proporsi
-        df_proporsi = df_avg_hari.merge(total_per_jenis_per_hari, on=["Hari", "Jenis Kendaraan"])
-        df_proporsi["Proporsi"] = df_proporsi["Total"] / df_proporsi["TotalJenis"]
-        df_proporsi["Proporsi (%)"] = (df_proporsi["Proporsi"] * 100).round(2)
+        # Gabungkan 2 minggu dan hitung proporsi dari rata-ratanya
+        df_2minggu, df_proporsi = pipeline.hitung_proporsi_rata_rata([df_minggu1, df_minggu3])
     
     st.success("🎉 Data 2 minggu berhasil digabungkan!")
     
@@ -337,16 +219,16 @@ if df_minggu1 is not None and df_minggu3 is not None:
         st.dataframe(df_proporsi, use_container_width=True)
         
         # Download proporsi
-        output_proporsi = io.BytesIO()
-        with pd.ExcelWriter(output_proporsi, engine='openpyxl') as writer:
-            df_proporsi.to_excel(writer, index=False, sheet_name="proporsi_2minggu")
-            df_2minggu.to_excel(writer, index=False, sheet_name="data_2minggu_gabungan")
+        output_proporsi, ext, mime = rekap_io.ekspor(
+            {"proporsi_2minggu": df_proporsi, "data_2minggu_gabungan": df_2minggu},
+            format_unduhan, stage="ekspor: proporsi_2minggu",
+        )
         
         st.download_button(
             "📥 Unduh Data Proporsi 2 Minggu", 
-            data=output_proporsi.getvalue(), 
-            file_name="proporsi_2minggu.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            data=output_proporsi, 
+            file_name=f"proporsi_2minggu{ext}",
+            mime=mime,
             type="primary"
         )
 
@@ -366,163 +248,66 @@ if 'df_proporsi' in locals():
     with col2:
         st.info("**Format Sheet:**\n- Nama: 1, 2, ..., 31\n- Kolom: Jenis Kendaraan, 00:00 - 23:00\n- Data: Jumlah kendaraan")
 
-    uploaded_bulanan = st.file_uploader(
+    uploaded_bulanan = unggahan.unggah(
         "📈 Unggah File Data Volume Bulanan (.xlsx)", 
+        key="bulanan_uploader",
         type=["xlsx"],
         help="File Excel berisi volume kendaraan bulanan"
     )
+    per_jam = st.toggle(
+        "⏱️ Proporsi per jam",
+        key="proporsi_per_jam",
+        help="Bagi volume tiap jam dengan proporsi titik pada jam yang sama di data 2 minggu, "
+             "bukan satu proporsi harian untuk ke-24 jam",
+    )
+    selang = st.toggle(
+        "📏 Selang kepercayaan (bootstrap)",
+        key="selang_bootstrap",
+        help=f"Tarik ulang hari sampel per hari dalam minggu ({pipeline.BOOTSTRAP_REPLIKASI:,} replikasi) "
+             "untuk batas bawah/atas total harian tiap titik di grafik Total Harian",
+    )
 
-    # STEP 5: PROSES ESTIMASI
+    # STEP 5: PROSES ESTIMASI (job latar belakang; dikirim ulang hanya jika input berubah)
+    hasil_estimasi = None
     if uploaded_bulanan:
-        with st.spinner("🔄 Memproses estimasi volume bulanan berdasarkan proporsi 2 minggu..."):
-            
-            # Deteksi bulan dari nama file
-            nama_file_bulanan = uploaded_bulanan.name.lower()
-            match = re.search(r"(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)", nama_file_bulanan, re.IGNORECASE)
-            bulan_map = {
-                "januari": 1, "februari": 2, "maret": 3, "april": 4,
-                "mei": 5, "juni": 6, "juli": 7, "agustus": 8,
-                "september": 9, "oktober": 10, "november": 11, "desember": 12
-            }
-            bulan = 7
-            if match and match.group(1).lower() in bulan_map:
-                bulan = bulan_map[match.group(1).lower()]
-                bulan_nama = match.group(1).title()
-            else:
-                bulan_nama = "Juli"
-            
-            # Baca semua sheet
-            xls = pd.read_excel(uploaded_bulanan, sheet_name=None, header=None)
-            list_df = []
-            sheet_warnings = []
-            
-            processed_sheets = 0
-            for sheet_name, df_raw in xls.items():
-                try:
-                    sheet_num = int(sheet_name)
-                    if sheet_num < 1 or sheet_num > 31:
-                        continue
-                    
-                    tanggal_str = f"{sheet_num:02d}-{bulan:02d}-2025"
-                    
-                    # Cari header "Jenis Kendaraan"
-                    jenis_rows = df_raw[df_raw[0].astype(str).str.contains("Jenis Kendaraan", case=False, na=False)]
-                    if jenis_rows.empty:
-                        sheet_warnings.append(f"Sheet '{sheet_name}' tidak memiliki kolom 'Jenis Kendaraan'")
-                        continue
-                        
-                    start_idx = jenis_rows.index[0] + 1
-                    header_row = df_raw.iloc[start_idx - 1].fillna("NA").astype(str)
-                    
-                    # Handle duplikat header
-                    if header_row.duplicated().any():
-                        header_row = dedup_columns(header_row)
-
-                    df_jenis = df_raw.iloc[start_idx:].copy()
-                    df_jenis.columns = header_row
-
-                    # Bersihkan data
-                    mask_arah = df_jenis.apply(
-                        lambda row: row.astype(str).str.contains(r"Arah|Keterangan|:", case=False, na=False).any(),
-                        axis=1
-                    )
-                    df_jenis = df_jenis[~mask_arah]
-                    df_jenis = df_jenis[df_jenis["Jenis Kendaraan"].notna()]
-                    df_jenis = df_jenis[~df_jenis["Jenis Kendaraan"].astype(str).str.lower().str.contains("total|sum")]
-
-                    df_jenis["Tanggal"] = tanggal_str
-                    list_df.append(df_jenis)
-                    processed_sheets += 1
-                    
-                except ValueError:
-                    sheet_warnings.append(f"Sheet '{sheet_name}' diabaikan karena bukan angka")
-                    continue
-                except Exception as e:
-                    sheet_warnings.append(f"Error di sheet '{sheet_name}': {str(e)}")
-                    continue
-
-            if sheet_warnings:
-                with st.expander("⚠️ Peringatan Pemrosesan Data Bulanan", expanded=False):
-                    for warning in sheet_warnings:
-                        st.write(f"- {warning}")
-
-            if not list_df:
-                st.error("❌ Tidak ada data valid di file bulanan. Periksa format file.")
-                st.stop()
-
-            # Gabungkan semua sheet
-            df_bulanan = pd.concat(list_df, ignore_index=True)
-            
-            # Set nama kolom jam
-            jam_list = [f"{str(i).zfill(2)}:00:00" for i in range(24)]
-            columns = list(df_bulanan.columns)
-            
-            if len(columns) >= 25:
-                columns[1:25] = jam_list
-                df_bulanan.columns = columns
-                groupby_cols = jam_list.copy()
-                if 'Total' in df_bulanan.columns:
-                    groupby_cols.append('Total')
-            else:
-                st.error(f"❌ File bulanan memiliki {len(columns)} kolom, minimal 25 kolom diperlukan.")
-                st.stop()
+        # Deteksi bulan dari nama file
+        bulan, bulan_nama = pipeline.bulan_dari_nama_file(uploaded_bulanan.nama.lower())
+        bulan_nama = bulan_nama.title()
+
+        files_bulanan = [uploaded_bulanan]
+        hasil_estimasi = jobs.hasil_sesi(
+            "job_estimasi",
+            jobs.sidik_file(
+                files_bulanan, st.session_state["job_Minggu1"]["sidik"], st.session_state["job_Minggu3"]["sidik"],
+                per_jam, selang,
+            ),
+            "Memproses estimasi volume bulanan berdasarkan proporsi 2 minggu", pipeline.jalankan_estimasi,
+            uploaded_bulanan, uploaded_bulanan.nama, df_proporsi, bulatkan=True,
+            sampel=df_2minggu, per_jam=per_jam, bootstrap=selang,
+            parse=unggahan.parse_bulanan, app="2minggu",
+            memori_mb=jobs.estimasi_memori_mb(files_bulanan, jobs.FAKTOR_BULANAN),
+        )
 
-            # Mapping jenis kendaraan
-            df_bulanan['Jenis Kendaraan'] = df_bulanan['Jenis Kendaraan'].map(JENIS_MAP_BULANAN)
+    if hasil_estimasi is not None:
+        sheet_warnings = hasil_estimasi["sheet_warnings"]
+        processed_sheets = hasil_estimasi["jumlah_sheet"]
 
-            # Konversi ke numerik
-            for col in jam_list:
-                if col in df_bulanan.columns:
-                    df_bulanan[col] = pd.to_numeric(df_bulanan[col], errors='coerce').fillna(0)
-            
-            if 'Total' in df_bulanan.columns:
-                df_bulanan['Total'] = pd.to_numeric(df_bulanan['Total'], errors='coerce').fillna(0)
-            
-            # Groupby dan sum
-            df_bulanan = df_bulanan.groupby(['Tanggal', 'Jenis Kendaraan'], as_index=False)[groupby_cols].sum()
-            df_bulanan = df_bulanan.sort_values(by=['Tanggal', 'Jenis Kendaraan']).reset_index(drop=True)
-
-            # Konversi tanggal dan tambah kolom Hari
-            df_bulanan["Tanggal"] = pd.to_datetime(df_bulanan["Tanggal"], format='mixed', dayfirst=True)
-            df_bulanan["Hari"] = df_bulanan["Tanggal"].dt.day_name()
-
-            # Melt ke long format
-            df_jenis_long = df_bulanan.melt(
-                id_vars=["Tanggal", "Jenis Kendaraan", "Hari"],
-                value_vars=jam_list,
-                var_name="Jam",
-                value_name="Jumlah"
-            )
-            
-            df_jenis_long["Jumlah"] = pd.to_numeric(df_jenis_long["Jumlah"], errors='coerce').fillna(0)
-
-            # Join dengan proporsi
-            df_join = df_jenis_long.merge(
-                df_proporsi[["Hari", "Source", "Jenis Kendaraan", "Proporsi"]], 
-                on=["Hari", "Jenis Kendaraan"], 
-                how="left"
-            )
+        if sheet_warnings:
+            with st.expander("⚠️ Peringatan Pemrosesan Data Bulanan", expanded=False):
+                for warning in sheet_warnings:
+                    st.write(f"- {warning}")
 
-            # Hitung estimasi
-            df_join["Jumlah_Estimasi"] = df_join["Jumlah"] * df_join["Proporsi"]
+        if hasil_estimasi["gagal"]:
+            st.error(f"❌ {hasil_estimasi['gagal']}")
+            perf.render_panel(profiler)
+            st.stop()
 
-            # Pivot kembali ke wide format
-            df_pivot = df_join.pivot_table(
-                index=["Tanggal", "Jenis Kendaraan", "Source"],
-                columns="Jam",
-                values="Jumlah_Estimasi",
-                aggfunc="sum"
-            ).reset_index()
+        unggahan.lepas("bulanan_uploader")
 
-            # Bulatkan dan konversi ke integer
-            jam_columns = [col for col in df_pivot.columns if col.endswith(":00:00")]
-            df_pivot[jam_columns] = df_pivot[jam_columns].fillna(0).round().astype(int)
-
-            # Format tanggal dan filter
-            df_pivot["Tanggal"] = pd.to_datetime(df_pivot["Tanggal"], errors="coerce")
-            df_final = df_pivot.sort_values(by=["Tanggal", "Source"])
-            df_final["Tanggal"] = df_final["Tanggal"].dt.strftime("%d-%m-%Y")
-            df_final = df_final[df_final["Jenis Kendaraan"].str.lower() != "unknown"]
+        # Estimasi per titik, dibulatkan ke bilangan bulat terdekat
+        df_final = hasil_estimasi["df_final"]
+        df_pita = hasil_estimasi["df_pita"]
+        jam_columns = [col for col in df_final.columns if col.endswith(":00:00")]
 
         st.success("🎉 Estimasi volume kendaraan berhasil dihitung!")
         
@@ -539,23 +324,7 @@ if 'df_proporsi' in locals():
         # Quality check
         st.header("🔍 Kualitas Data")
         
-        all_tanggal = df_final["Tanggal"].unique()
-        all_source = df_final["Source"].unique()
-        all_jenis = df_final["Jenis Kendaraan"].unique()
-        
-        full_combinations = pd.DataFrame(
-            list(itertools.product(all_tanggal, all_source, all_jenis)),
-            columns=["Tanggal", "Source", "Jenis Kendaraan"]
-        )
-        
-        merged_check = full_combinations.merge(
-            df_final[["Tanggal", "Source", "Jenis Kendaraan"]],
-            on=["Tanggal", "Source", "Jenis Kendaraan"],
-            how="left",
-            indicator=True
-        )
-        
-        missing_data = merged_check[merged_check["_merge"] == "left_only"].drop(columns=["_merge"])
+        full_combinations, missing_data = hasil_estimasi["full_combinations"], hasil_estimasi["missing_data"]
         
         col1, col2, col3 = st.columns(3)
         completeness = ((len(full_combinations) - len(missing_data)) / len(full_combinations) * 100) if len(full_combinations) > 0 else 100
@@ -610,74 +379,96 @@ if 'df_proporsi' in locals():
                         use_container_width=True
                     )
                     
-                    output_missing = io.BytesIO()
-                    with pd.ExcelWriter(output_missing, engine='openpyxl') as writer:
-                        missing_data.to_excel(writer, index=False, sheet_name="data_hilang_detail")
-                        df_missing_summary.to_excel(writer, index=False, sheet_name="ringkasan_per_titik")
+                    output_missing, ext, mime = rekap_io.ekspor(
+                        {"data_hilang_detail": missing_data, "ringkasan_per_titik": df_missing_summary},
+                        format_unduhan, stage="ekspor: analisis_data_hilang",
+                    )
                     
                     st.download_button(
                         "📥 Unduh Analisis Data Hilang", 
-                        data=output_missing.getvalue(), 
-                        file_name="analisis_data_hilang.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        data=output_missing, 
+                        file_name=f"analisis_data_hilang{ext}",
+                        mime=mime
                     )
 
         # HASIL AKHIR DAN DOWNLOAD
         st.header("📋 Hasil Estimasi Volume Kendaraan")
         
-        with st.expander("👁️ Lihat Hasil Estimasi (20 Baris Pertama)", expanded=True):
-            st.dataframe(df_final.head(20), use_container_width=True)
+        with st.expander("👁️ Jelajahi Hasil Estimasi", expanded=True):
+            render_result_browser(df_final, key="hasil_2minggu")
         
         # DOWNLOAD BUTTONS - Yang diminta: button khusus untuk hasil estimasi saja
         col1, col2, col3 = st.columns(3)
         
         # Button 1: Hasil Estimasi Saja (Yang diminta user)
         with col1:
-            output_estimasi_only = io.BytesIO()
-            with pd.ExcelWriter(output_estimasi_only, engine="openpyxl") as writer:
-                df_final.to_excel(writer, index=False, sheet_name="estimasi_volume")
+            output_estimasi_only, ext, mime = rekap_io.ekspor(
+                {"estimasi_volume": df_final},
+                format_unduhan, stage="ekspor: hasil rekap",
+            )
             
             st.download_button(
                 "📊 Unduh Hasil Estimasi", 
-                data=output_estimasi_only.getvalue(), 
-                file_name=f"hasil rekap {bulan_nama} dari 2 minggu.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                data=output_estimasi_only, 
+                file_name=f"hasil rekap {bulan_nama} dari 2 minggu{ext}",
+                mime=mime,
                 type="primary",
                 help="Download hanya hasil estimasi volume kendaraan"
             )
         
         # Button 2: Hasil Lengkap dengan semua sheet
         with col2:
-            output_final = io.BytesIO()
-            with pd.ExcelWriter(output_final, engine="openpyxl") as writer:
-                df_final.to_excel(writer, index=False, sheet_name="estimasi_final")
-                df_proporsi.to_excel(writer, index=False, sheet_name="proporsi_2minggu")
-                df_2minggu.to_excel(writer, index=False, sheet_name="data_2minggu_gabungan")
-                if len(missing_data) > 0:
-                    missing_data.to_excel(writer, index=False, sheet_name="data_hilang")
+            sheets_final = {"estimasi_final": df_final, "proporsi_2minggu": df_proporsi, "data_2minggu_gabungan": df_2minggu}
+            if len(missing_data) > 0:
+                sheets_final["data_hilang"] = missing_data
+            output_final, ext, mime = rekap_io.ekspor(
+                sheets_final,
+                format_unduhan, stage="ekspor: estimasi_volume_lalu_lintas_lengkap",
+            )
             
             st.download_button(
                 "🎉 Unduh Hasil Lengkap", 
-                data=output_final.getvalue(), 
-                file_name=f"estimasi_volume_lalu_lintas_{bulan_nama}_lengkap.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                data=output_final, 
+                file_name=f"estimasi_volume_lalu_lintas_{bulan_nama}_lengkap{ext}",
+                mime=mime,
                 help="Download lengkap dengan proporsi dan data mentah"
             )
         
         # Button 3: Proporsi 2 Minggu saja
         with col3:
-            output_proporsi = io.BytesIO()
-            with pd.ExcelWriter(output_proporsi, engine='openpyxl') as writer:
-                df_proporsi.to_excel(writer, index=False, sheet_name="proporsi_2minggu")
+            output_proporsi, ext, mime = rekap_io.ekspor(
+                {"proporsi_2minggu": df_proporsi},
+                format_unduhan, stage="ekspor: proporsi_2minggu",
+            )
             
             st.download_button(
                 "📊 Unduh Proporsi 2 Minggu", 
-                data=output_proporsi.getvalue(), 
-                file_name=f"proporsi_2minggu_{bulan_nama}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                data=output_proporsi, 
+                file_name=f"proporsi_2minggu_{bulan_nama}{ext}",
+                mime=mime,
                 help="Download data proporsi dari 2 minggu"
             )
 
+        # Unduhan per checkpoint: satu file per Source (atau per Keterangan) dalam satu ZIP,
+        # ditulis paralel di proses worker
+        col_pisah, col_unduh_grup = st.columns([1, 2])
+        with col_pisah:
+            pisah_per = st.radio("🗂️ Pisah file per", ["Source", "Keterangan"], horizontal=True, key="pisah_per")
+        with col_unduh_grup:
+            df_grup = df_final
+            if pisah_per == "Keterangan":
+                df_grup = df_final.assign(Keterangan=pipeline.REGISTRI.keterangan.petakan(df_final["Source"]))
+            output_per_grup, ext, mime = rekap_io.ekspor_per_grup(
+                df_grup, format_unduhan, kolom=pisah_per, stage=f"ekspor: per {pisah_per}",
+            )
+            st.download_button(
+                "🗂️ Unduh per Checkpoint (ZIP)",
+                data=output_per_grup,
+                file_name=f"hasil rekap {bulan_nama} dari 2 minggu per {pisah_per.lower()}{ext}",
+                mime=mime,
+                help="Satu file hasil estimasi untuk setiap checkpoint / kelompok Keterangan",
+            )
+
         # DASHBOARD ANALISIS
         st.header("📊 Dashboard Analisis Lalu Lintas")
 
@@ -686,7 +477,7 @@ if 'df_proporsi' in locals():
             df = df.copy()
             df["Tanggal"] = pd.to_datetime(df["Tanggal"], format='mixed', dayfirst=True, errors='coerce')
             df["Hari"] = df["Tanggal"].dt.day_name()
-            df["Keterangan"] = df["Source"].map(KETERANGAN_MAP)
+            df["Keterangan"] = pipeline.REGISTRI.keterangan.petakan(df["Source"])
             return df
 
         df_dashboard = prepare_dashboard_data(df_final)
@@ -755,34 +546,35 @@ if 'df_proporsi' in locals():
 
                 with col2:
                     st.subheader("📊 Diagram Jenis Kendaraan")
-                    fig1, ax1 = plt.subplots(figsize=(8, 8))
+                    with perf.stage("chart: pie harian"):
+                        fig1, ax1 = plt.subplots(figsize=(8, 8))
                     
-                    wedges, texts = ax1.pie(
-                        total_per_kendaraan["Jumlah"],
-                        labels=None,
-                        startangle=90,
-                        counterclock=False,
-                        colors=sns.color_palette("Set3", len(total_per_kendaraan))
-                    )
-                    ax1.axis('equal')
-
-                    legend_labels = [
-                        f"{jenis} ({persen}%)" 
-                        for jenis, persen in zip(
-                            total_per_kendaraan["Jenis Kendaraan"], 
-                            total_per_kendaraan["Persen"]
+                        wedges, texts = ax1.pie(
+                            total_per_kendaraan["Jumlah"],
+                            labels=None,
+                            startangle=90,
+                            counterclock=False,
+                            colors=sns.color_palette("Set3", len(total_per_kendaraan))
                         )
-                    ]
-                    ax1.legend(
-                        wedges,
-                        legend_labels,
-                        title="Jenis Kendaraan",
-                        loc="center left",
-                        bbox_to_anchor=(1, 0, 0.5, 1),
-                        frameon=False,
-                        fontsize=9
-                    )
-                    st.pyplot(fig1)
+                        ax1.axis('equal')
+
+                        legend_labels = [
+                            f"{jenis} ({persen}%)" 
+                            for jenis, persen in zip(
+                                total_per_kendaraan["Jenis Kendaraan"], 
+                                total_per_kendaraan["Persen"]
+                            )
+                        ]
+                        ax1.legend(
+                            wedges,
+                            legend_labels,
+                            title="Jenis Kendaraan",
+                            loc="center left",
+                            bbox_to_anchor=(1, 0, 0.5, 1),
+                            frameon=False,
+                            fontsize=9
+                        )
+                        st.pyplot(fig1)
 
                 st.markdown("---")
                 st.subheader("📈 Pola Waktu Kendaraan")
@@ -793,14 +585,15 @@ if 'df_proporsi' in locals():
                 )
                 df_jam = df_melted[df_melted["Jenis Kendaraan"] == kendaraan_pilih]
 
-                fig2, ax2 = plt.subplots(figsize=(15, 6))
-                sns.barplot(data=df_jam, x="Jam", y="Jumlah", ax=ax2, palette="viridis")
-                ax2.set_title(f"Distribusi Waktu - {kendaraan_pilih}", fontsize=14, fontweight='bold')
-                ax2.set_ylabel("Jumlah Kendaraan")
-                ax2.set_xlabel("Jam")
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                st.pyplot(fig2)
+                with perf.stage("chart: pola waktu harian"):
+                    fig2, ax2 = plt.subplots(figsize=(15, 6))
+                    sns.barplot(data=df_jam, x="Jam", y="Jumlah", ax=ax2, palette="viridis")
+                    ax2.set_title(f"Distribusi Waktu - {kendaraan_pilih}", fontsize=14, fontweight='bold')
+                    ax2.set_ylabel("Jumlah Kendaraan")
+                    ax2.set_xlabel("Jam")
+                    plt.xticks(rotation=45)
+                    plt.tight_layout()
+                    st.pyplot(fig2)
 
                 st.markdown("---")
                 st.subheader("📦 Total Kendaraan Masuk/Keluar Batu")
@@ -868,56 +661,88 @@ if 'df_proporsi' in locals():
 
                 with col2:
                     st.subheader(f"📊 Diagram - {lokasi_terpilih}")
-                    fig3, ax3 = plt.subplots(figsize=(8, 8))
+                    with perf.stage("chart: pie bulanan"):
+                        fig3, ax3 = plt.subplots(figsize=(8, 8))
                     
-                    wedges, texts = ax3.pie(
-                        df_source["Jumlah"],
-                        labels=None,
-                        startangle=90,
-                        counterclock=False,
-                        colors=sns.color_palette("Set2", len(df_source))
-                    )
-                    ax3.axis('equal')
-
-                    legend_labels = [
-                        f"{jenis} ({persen}%)" 
-                        for jenis, persen in zip(df_source["Jenis Kendaraan"], df_source["Persen"])
-                    ]
-                    ax3.legend(
-                        wedges,
-                        legend_labels,
-                        title="Jenis Kendaraan",
-                        loc="center left",
-                        bbox_to_anchor=(1, 0, 0.5, 1),
-                        frameon=False,
-                        fontsize=9
+                        wedges, texts = ax3.pie(
+                            df_source["Jumlah"],
+                            labels=None,
+                            startangle=90,
+                            counterclock=False,
+                            colors=sns.color_palette("Set2", len(df_source))
+                        )
+                        ax3.axis('equal')
+
+                        legend_labels = [
+                            f"{jenis} ({persen}%)" 
+                            for jenis, persen in zip(df_source["Jenis Kendaraan"], df_source["Persen"])
+                        ]
+                        ax3.legend(
+                            wedges,
+                            legend_labels,
+                            title="Jenis Kendaraan",
+                            loc="center left",
+                            bbox_to_anchor=(1, 0, 0.5, 1),
+                            frameon=False,
+                            fontsize=9
+                        )
+                        st.pyplot(fig3)
+
+                st.markdown("---")
+                st.subheader(f"📈 Total Harian - {lokasi_terpilih}")
+                df_harian_lokasi = (
+                    df_bulanan_view[df_bulanan_view["Source"] == lokasi_terpilih]
+                    .assign(Jumlah=lambda df: df[jam_cols_dashboard].sum(axis=1))
+                    .groupby("Tanggal", as_index=False)["Jumlah"].sum()
+                )
+                with perf.stage("chart: total harian"):
+                    fig_harian, ax_harian = plt.subplots(figsize=(12, 4))
+                    ax_harian.plot(df_harian_lokasi["Tanggal"], df_harian_lokasi["Jumlah"], marker="o", label="Estimasi")
+                    if df_pita is not None:
+                        pita_lokasi = df_pita[df_pita["Source"] == lokasi_terpilih].assign(
+                            Tanggal=lambda df: pd.to_datetime(df["Tanggal"], format="%d-%m-%Y")
+                        )
+                        pita_lokasi = pita_lokasi[pita_lokasi["Tanggal"].isin(df_harian_lokasi["Tanggal"])]
+                        ax_harian.fill_between(
+                            pita_lokasi["Tanggal"], pita_lokasi["Bawah"], pita_lokasi["Atas"],
+                            alpha=0.25, label="Selang kepercayaan 95% (bootstrap)",
+                        )
+                    ax_harian.set_xlabel("Tanggal")
+                    ax_harian.set_ylabel("Jumlah Kendaraan")
+                    ax_harian.legend()
+                    fig_harian.autofmt_xdate()
+                    st.pyplot(fig_harian)
+                if df_pita is not None:
+                    st.caption(
+                        "Pita = rentang 95% total harian dari replikasi yang menarik ulang hari sampel "
+                        "Minggu 1 & 3 per hari dalam minggu; makin lebar, makin tidak pasti pembagian antar titik."
                     )
-                    st.pyplot(fig3)
 
                 st.markdown("---")
                 st.subheader("📊 Perbandingan Antar Lokasi")
                 df_all_locations = grouped.groupby(["Source", "Keterangan"])["Jumlah"].sum().reset_index()
                 df_all_locations = df_all_locations.sort_values("Jumlah", ascending=True)
 
-                fig4, ax4 = plt.subplots(figsize=(12, 8))
-                bars = sns.barplot(
-                    data=df_all_locations, 
-                    y="Source", 
-                    x="Jumlah", 
-                    hue="Keterangan",
-                    ax=ax4, 
-                    palette="Set1"
-                )
-                ax4.set_title(f"Total Kendaraan per Lokasi - {selected_month}", fontsize=14, fontweight='bold')
-                ax4.set_xlabel("Jumlah Kendaraan")
-                ax4.set_ylabel("Lokasi")
+                with perf.stage("chart: perbandingan lokasi"):
+                    fig4, ax4 = plt.subplots(figsize=(12, 8))
+                    bars = sns.barplot(
+                        data=df_all_locations, 
+                        y="Source", 
+                        x="Jumlah", 
+                        hue="Keterangan",
+                        ax=ax4, 
+                        palette="Set1"
+                    )
+                    ax4.set_title(f"Total Kendaraan per Lokasi - {selected_month}", fontsize=14, fontweight='bold')
+                    ax4.set_xlabel("Jumlah Kendaraan")
+                    ax4.set_ylabel("Lokasi")
                 
-                # Add value labels on bars
-                for container in ax4.containers:
-                    ax4.bar_label(container, fmt='%,.0f', padding=3)
+                    # Add value labels on bars
+                    for container in ax4.containers:
+                        ax4.bar_label(container, fmt='%,.0f', padding=3)
                     
-                plt.tight_layout()
-                st.pyplot(fig4)
+                    plt.tight_layout()
+                    st.pyplot(fig4)
 
         with tab3:
             st.header("📈 Analisis Data 2 Minggu")
@@ -965,24 +790,25 @@ if 'df_proporsi' in locals():
                 df_hari_grouped = df_hari.groupby(["Source", "Keterangan"])["Proporsi (%)"].mean().reset_index()
                 df_hari_grouped = df_hari_grouped.sort_values("Proporsi (%)", ascending=True)
                 
-                fig5, ax5 = plt.subplots(figsize=(12, 8))
-                bars = sns.barplot(
-                    data=df_hari_grouped, 
-                    y="Source", 
-                    x="Proporsi (%)",
-                    hue="Keterangan",
-                    ax=ax5, 
-                    palette="coolwarm"
-                )
-                ax5.set_title(f"Proporsi Kendaraan per Lokasi - Hari {hari_pilihan}", fontsize=14, fontweight='bold')
-                ax5.set_xlabel("Proporsi (%)")
-                ax5.set_ylabel("Lokasi")
+                with perf.stage("chart: proporsi per hari"):
+                    fig5, ax5 = plt.subplots(figsize=(12, 8))
+                    bars = sns.barplot(
+                        data=df_hari_grouped, 
+                        y="Source", 
+                        x="Proporsi (%)",
+                        hue="Keterangan",
+                        ax=ax5, 
+                        palette="coolwarm"
+                    )
+                    ax5.set_title(f"Proporsi Kendaraan per Lokasi - Hari {hari_pilihan}", fontsize=14, fontweight='bold')
+                    ax5.set_xlabel("Proporsi (%)")
+                    ax5.set_ylabel("Lokasi")
                 
-                for container in ax5.containers:
-                    ax5.bar_label(container, fmt='%.1f%%', padding=3)
+                    for container in ax5.containers:
+                        ax5.bar_label(container, fmt='%.1f%%', padding=3)
                     
-                plt.tight_layout()
-                st.pyplot(fig5)
+                    plt.tight_layout()
+                    st.pyplot(fig5)
             else:
                 st.warning(f"⚠️ Tidak ada data untuk hari {hari_pilihan}")
 
@@ -1000,7 +826,7 @@ if 'df_proporsi' in locals():
             st.metric(
                 "📍 Titik Monitoring", 
                 df_final['Source'].nunique(),
-                delta="10 Checkpoint"
+                delta=f"{len(pipeline.REGISTRI.titik)} Checkpoint"
             )
         with col3:
             st.metric(
@@ -1026,7 +852,7 @@ if 'df_proporsi' in locals():
         Estimasi volume lalu lintas telah dihitung berdasarkan:
         - **Proporsi dari 2 minggu sample data** (Minggu 1 & Minggu 3)
         - **Data volume bulanan {bulan_nama}** ({processed_sheets} hari)
-        - **10 titik checkpoint** dengan arah masuk/keluar Batu
+        - **{len(pipeline.REGISTRI.titik)} titik checkpoint** dengan arah masuk/keluar Batu
         
         📊 Tingkat kelengkapan data: **{completeness:.1f}%**
         """)
@@ -1036,4 +862,6 @@ elif uploaded_minggu1 and uploaded_minggu3:
 elif uploaded_minggu1:
     st.warning("⚠️ Silakan unggah data Minggu 3 untuk melengkapi proporsi!")
 else:
-    st.info("📝 Silakan mulai dengan mengunggah data Minggu 1 (7 file Excel)")
\ No newline at end of file
+    st.info("📝 Silakan mulai dengan mengunggah data Minggu 1 (7 file Excel)")
+
+perf.render_panel(profiler)
@@ -0,0 +1,299 @@
+"""Penyimpanan artefak antar tahap (Parquet/Feather) beserta manifest asal-usulnya.
+
+Notebook Juni/Juli menyimpan hasil setiap tahap ke Excel lalu membacanya lagi
+di tahap berikutnya (dataset_bersih_<tgl>juni.xlsx, dataset_cleaned_<tgl>juli_
+minggu<k>.xlsx, dataset_2minggu_gabungan.xlsx, ...). Artefak menggantikan
+file-file perantara itu: DataFrame setiap tahap ditulis ke ARTEFAK_DIR sebagai
+Parquet (atau Feather), dan manifest.json mencatat untuk setiap artefak:
+
+- sumber: sha256 file mentah dan/atau sidik artefak tahap sebelumnya
+- kode: versi kode (sumber fungsi dan mapping) yang menghasilkannya
+- sidik: sha256 isi artefak itu sendiri, dipakai sebagai sumber tahap berikutnya
+
+`tahap` hanya menjalankan fungsi sebuah tahap jika sumber atau versi kodenya
+berubah; jika tidak, artefak tersimpan langsung dibaca. Menjalankan ulang tahap
+akhir tidak lagi mengulang pembersihan harian yang inputnya tidak berubah.
+
+`jalankan` menjalankan sekumpulan `Tahap` yang saling bergantung sebagai DAG
+(lihat dag_estimasi) dan melaporkan tahap mana yang dihitung ulang atau
+dilewati beserta alasannya.
+"""
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+import rekap_store
+
+ARTEFAK_DIR = os.environ.get("ARTEFAK_DIR", "artefak")
+# Format file artefak baru: "parquet" atau "feather"
+ARTEFAK_FORMAT = os.environ.get("ARTEFAK_FORMAT", "parquet")
+MANIFEST_FILE = "manifest.json"
+
+EKSTENSI = {"parquet": ".parquet", "feather": ".feather"}
+
+# Satu simpul DAG: `fungsi(*DataFrame masukan)` menghasilkan artefak `nama`.
+# `masukan` = nama tahap hulu, `file` = file mentah yang dibaca fungsi (ikut sidik
+# sumber), `kode` = versi kode (default dari sumber `fungsi`).
+Tahap = namedtuple("Tahap", ["nama", "fungsi", "masukan", "file", "kode"], defaults=((), (), None))
+
+# path -> (mtime_ns, ukuran, sha256), agar file mentah yang sama tidak di-hash ulang
+_sidik_cache = {}
+
+
+def sidik_file(path):
+    """Fungsi untuk sha256 isi file (hex), di-cache selama mtime dan ukuran file tidak berubah"""
+    st = os.stat(path)
+    tersimpan = _sidik_cache.get(path)
+    if tersimpan is not None and tersimpan[:2] == (st.st_mtime_ns, st.st_size):
+        return tersimpan[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(blok)
+    _sidik_cache[path] = (st.st_mtime_ns, st.st_size, h.hexdigest())
+    return h.hexdigest()
+
+
+def sumber_file(*paths):
+    """Fungsi untuk {nama file: sha256} dari file-file mentah, sebagai `sumber` sebuah tahap"""
+    return {os.path.basename(p): sidik_file(p) for p in paths}
+
+
+def versi_kode(*objek):
+    """Fungsi untuk versi kode sebuah tahap dari sumber fungsi dan nilai konstanta (mis. JENIS_MAP).
+
+    Mengubah isi fungsi cleaning atau mapping menghasilkan versi baru, sehingga
+    artefak lama dianggap basi.
+    """
+    h = hashlib.sha256()
+    for o in objek:
+        if callable(o):
+            try:
+                teks = inspect.getsource(o)
+            except (OSError, TypeError):
+                # Sumber tidak tersedia (mis. fungsi bawaan): pakai bytecode-nya
+                teks = getattr(getattr(o, "__code__", None), "co_code", repr(o))
+        else:
+            teks = json.dumps(o, sort_keys=True, ensure_ascii=False, default=str)
+        h.update(teks.encode() if isinstance(teks, str) else teks)
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def _folder(folder):
+    return folder or ARTEFAK_DIR
+
+
+def baca_manifest(folder=None):
+    """Fungsi untuk membaca manifest artefak ({nama: info}); kosong jika belum ada"""
+    try:
+        with open(os.path.join(_folder(folder), MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def sidik(nama, folder=None):
+    """Fungsi untuk sidik isi artefak `nama` (None jika belum ada), dipakai sebagai sumber tahap berikutnya"""
+    info = baca_manifest(folder).get(nama)
+    return info["sidik"] if info else None
+
+
+def sumber_artefak(*nama, folder=None):
+    """Fungsi untuk {"artefak:<nama>": sidik} dari artefak tahap sebelumnya, sebagai `sumber` sebuah tahap"""
+    manifest = baca_manifest(folder)
+    return {f"artefak:{n}": (manifest[n]["sidik"] if n in manifest else None) for n in nama}
+
+
+def _siap_simpan(df):
+    """Nama kolom dijadikan string dan kolom object bertipe campuran dijadikan teks.
+
+    Parquet/Feather butuh satu tipe per kolom; header jam bisa berupa
+    datetime.time dan sel mentah bisa bercampur angka dan teks (mis. "-").
+    Kolom object berisi angka saja dijadikan numerik, seperti saat dibaca
+    ulang, sehingga hasil yang baru dihitung sama dengan yang dibaca dari artefak.
+    """
+    df = df.rename(columns=str).reset_index(drop=True).infer_objects()
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def simpan(nama, df, sumber, kode, folder=None, format_artefak=None):
+    """Fungsi untuk menyimpan DataFrame sebagai artefak `nama` dan mencatatnya di manifest.
+
+    File ditulis ke file sementara lalu diganti secara atomik; manifest
+    diperbarui di bawah lock sehingga beberapa proses bisa menulis artefak
+    berbeda di folder yang sama.
+    """
+    folder = _folder(folder)
+    format_artefak = format_artefak or ARTEFAK_FORMAT
+    ext = EKSTENSI[format_artefak]
+    os.makedirs(folder, exist_ok=True)
+
+    df = _siap_simpan(df)
+    fd, sementara = tempfile.mkstemp(dir=folder, suffix=".part")
+    os.close(fd)
+    if format_artefak == "feather":
+        df.to_feather(sementara)
+    else:
+        df.to_parquet(sementara, index=False)
+    sidik_isi = sidik_file(sementara)
+    nama_file = f"{nama}{ext}"
+
+    with rekap_store._store_lock(folder):
+        os.replace(sementara, os.path.join(folder, nama_file))
+        _sidik_cache.pop(sementara, None)
+        manifest = baca_manifest(folder)
+        lama = manifest.get(nama)
+        manifest[nama] = {
+            "file": nama_file,
+            "format": format_artefak,
+            "sidik": sidik_isi,
+            "sumber": dict(sumber),
+            "kode": kode,
+            "baris": len(df),
+            "dibuat": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        manifest_tmp = os.path.join(folder, f"{MANIFEST_FILE}.tmp")
+        with open(manifest_tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(manifest_tmp, os.path.join(folder, MANIFEST_FILE))
+        if lama and lama["file"] != nama_file:
+            # Format berubah: file format lama tidak dipakai lagi
+            try:
+                os.remove(os.path.join(folder, lama["file"]))
+            except OSError:
+                pass
+    return df
+
+
+def alasan_basi(nama, sumber, kode, folder=None):
+    """Fungsi untuk alasan artefak `nama` harus dihitung ulang; None jika masih berlaku"""
+    info = baca_manifest(folder).get(nama)
+    if info is None or not os.path.exists(os.path.join(_folder(folder), info["file"])):
+        return "belum ada"
+    if info["kode"] != kode:
+        return "kode berubah"
+    sumber = dict(sumber)
+    if info["sumber"] != sumber:
+        berubah = sorted(k for k in set(info["sumber"]) | set(sumber) if info["sumber"].get(k) != sumber.get(k))
+        return "sumber berubah: " + ", ".join(berubah)
+    return None
+
+
+def masih_berlaku(nama, sumber, kode, folder=None):
+    """Fungsi untuk cek apakah artefak `nama` dibuat dari sumber dan versi kode yang sama"""
+    return alasan_basi(nama, sumber, kode, folder) is None
+
+
+def ambil(nama, folder=None):
+    """Fungsi untuk membaca artefak `nama` sebagai DataFrame"""
+    info = baca_manifest(folder).get(nama)
+    if info is None:
+        raise FileNotFoundError(f"Artefak '{nama}' belum ada di {_folder(folder)}")
+    path = os.path.join(_folder(folder), info["file"])
+    if info["format"] == "feather":
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+def tahap(nama, fungsi, sumber, kode, folder=None):
+    """Fungsi untuk menjalankan satu tahap dengan memakai ulang artefaknya jika inputnya tidak berubah.
+
+    `fungsi()` dipanggil hanya jika artefak `nama` belum ada, atau sumber/versi
+    kodenya berbeda dari yang tercatat di manifest; hasilnya disimpan sebagai
+    artefak. Mengembalikan (DataFrame, True jika dihitung ulang).
+    """
+    if masih_berlaku(nama, sumber, kode, folder):
+        return ambil(nama, folder), False
+    return simpan(nama, fungsi(), sumber, kode, folder), True
+
+
+def urutkan(daftar_tahap):
+    """Fungsi untuk mengurutkan Tahap secara topologis (hulu sebelum hilir).
+
+    ValueError jika ada masukan yang tidak didefinisikan atau DAG-nya bersiklus.
+    """
+    per_nama = {t.nama: t for t in daftar_tahap}
+    urutan, status = [], {}
+
+    def kunjungi(nama, jalur):
+        if status.get(nama) == "selesai":
+            return
+        if status.get(nama) == "dikunjungi":
+            raise ValueError(f"Siklus di DAG: {' -> '.join(jalur + [nama])}")
+        if nama not in per_nama:
+            raise ValueError(f"Tahap '{jalur[-1]}' memakai masukan '{nama}' yang tidak didefinisikan")
+        status[nama] = "dikunjungi"
+        for hulu in per_nama[nama].masukan:
+            kunjungi(hulu, jalur + [nama])
+        status[nama] = "selesai"
+        urutan.append(per_nama[nama])
+
+    for t in daftar_tahap:
+        kunjungi(t.nama, [])
+    return urutan
+
+
+def jalankan(daftar_tahap, target=None, folder=None):
+    """Fungsi untuk menjalankan DAG tahap dan hanya menghitung ulang tahap yang inputnya berubah.
+
+    Tahap diurutkan topologis; sumber setiap tahap = sidik file mentahnya dan
+    sidik artefak hulunya, sehingga perubahan satu file hanya merambat ke tahap
+    hilir yang memakainya (dan berhenti jika hasil hulunya ternyata sama).
+    Artefak tahap yang dilewati baru dibaca jika dibutuhkan tahap hilir yang
+    dihitung ulang atau sebagai target.
+
+    `target` = nama tahap yang hasilnya dikembalikan (default tahap tanpa
+    hilir); hanya tahap yang dibutuhkan target yang dijalankan. Mengembalikan
+    ({nama target: DataFrame}, laporan) dengan laporan berupa list dict
+    (tahap, status "dihitung"/"dilewati", alasan, detik).
+    """
+    urutan = urutkan(daftar_tahap)
+    if target is None:
+        dipakai = {hulu for t in urutan for hulu in t.masukan}
+        target = [t.nama for t in urutan if t.nama not in dipakai]
+    elif isinstance(target, str):
+        target = [target]
+
+    perlu = set()
+    per_nama = {t.nama: t for t in urutan}
+    tumpukan = list(target)
+    while tumpukan:
+        nama = tumpukan.pop()
+        if nama not in perlu:
+            perlu.add(nama)
+            tumpukan.extend(per_nama[nama].masukan)
+
+    memo = {}
+
+    def ambil_memo(nama):
+        if nama not in memo:
+            memo[nama] = ambil(nama, folder)
+        return memo[nama]
+
+    laporan = []
+    for t in urutan:
+        if t.nama not in perlu:
+            continue
+        mulai = time.perf_counter()
+        sumber = {**sumber_file(*t.file), **sumber_artefak(*t.masukan, folder=folder)}
+        kode = t.kode or versi_kode(t.fungsi)
+        alasan = alasan_basi(t.nama, sumber, kode, folder)
+        if alasan is not None:
+            memo[t.nama] = simpan(t.nama, t.fungsi(*[ambil_memo(h) for h in t.masukan]), sumber, kode, folder)
+        laporan.append({
+            "tahap": t.nama,
+            "status": "dilewati" if alasan is None else "dihitung",
+            "alasan": alasan or "input tidak berubah",
+            "detik": time.perf_counter() - mulai,
+        })
+    return {nama: ambil_memo(nama) for nama in target}, laporan
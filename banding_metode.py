@@ -0,0 +1,78 @@
+"""Bandingkan beberapa metode proporsi dari satu kali parse file harian dan bulanan.
+
+Metode yang dihitung sekaligus (`pipeline.estimasi_banyak_metode`, satu einsum):
+- <MingguN>: hanya satu minggu, baris dijumlahkan seperti aplikasi 1 minggu
+- rata-rata: rata-rata semua minggu seperti aplikasi 2 minggu / dag_estimasi
+- berbobot: rata-rata berbobot per minggu (--bobot, default 1, 2, ... menurut
+  urutan minggu sehingga minggu terakhir paling berat)
+
+Parse memakai tahap harian, mingguan dan bulanan dari `dag_estimasi.susun`,
+jadi artefak yang sudah ada dipakai ulang dan file yang tidak berubah tidak
+di-parse lagi. Yang dicetak adalah tabel total bulanan per titik untuk setiap
+metode, beserta selisihnya terhadap metode rata-rata.
+
+Contoh:
+    python banding_metode.py Juli
+    python banding_metode.py Juli --bobot Minggu1=1 Minggu3=3 --output "banding Juli.xlsx"
+"""
+import argparse
+import os
+
+import pandas as pd
+
+import artefak
+import dag_estimasi
+import pipeline
+import rekap_io
+
+
+def _bobot(teks):
+    """Fungsi untuk {label minggu: bobot} dari argumen "Minggu1=1 Minggu3=2" """
+    hasil = {}
+    for item in teks or []:
+        label, _, nilai = item.partition("=")
+        hasil[label] = float(nilai)
+    return hasil or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan metode proporsi per minggu, rata-rata dan berbobot")
+    parser.add_argument("folder", help="folder bulan berisi 'tanggal N bulan.xlsx' dan 'Data Volume Lalu Lintas Bulan.xlsx'")
+    parser.add_argument("--artefak", help="folder artefak (default <folder>/artefak)")
+    parser.add_argument("--bobot", nargs="*", metavar="MINGGU=BOBOT", help="bobot metode berbobot, mis. Minggu1=1 Minggu3=2")
+    parser.add_argument("--output", help="tulis hasil per metode + tabel selisih ke .xlsx, atau selisih saja ke .parquet")
+    parser.add_argument("--potong", action="store_true", help="potong desimal (default dibulatkan)")
+    parser.add_argument("--per-jam", action="store_true", help="pakai model proporsi per jam, bukan per hari")
+    args = parser.parse_args()
+
+    files_minggu, file_bulanan, bulan_nama = dag_estimasi.cari_file(args.folder)
+    if not files_minggu or file_bulanan is None:
+        parser.error(f"{args.folder} harus berisi file 'tanggal N bulan.xlsx' dan 'Data Volume Lalu Lintas Bulan.xlsx'")
+
+    sheet_warnings = []
+    daftar = [tahap for tahap in dag_estimasi.susun(files_minggu, file_bulanan, bulan_nama, sheet_warnings=sheet_warnings)
+              if not tahap.nama.startswith(("proporsi_", "estimasi_"))]
+    hasil, _ = artefak.jalankan(daftar, folder=args.artefak or os.path.join(args.folder, "artefak"))
+    df_sampel = pd.concat([hasil[f"mingguan_{label.lower()}_{bulan_nama}"] for label in files_minggu],
+                          ignore_index=True)
+
+    hasil_metode = pipeline.estimasi_banyak_metode(
+        df_sampel, hasil[f"bulanan_{bulan_nama}"], bobot=_bobot(args.bobot),
+        bulatkan=not args.potong, per_jam=args.per_jam,
+    )
+    df_selisih = pipeline.selisih_per_titik(hasil_metode)
+
+    for pesan in sheet_warnings:
+        print(f"⚠️  {pesan}")
+    print(df_selisih.to_string(index=False))
+
+    if args.output:
+        if args.output.endswith(".xlsx"):
+            rekap_io.tulis_excel({**hasil_metode, "selisih per titik": df_selisih}, args.output)
+        else:
+            df_selisih.to_parquet(args.output, index=False)
+        print(f"💾 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
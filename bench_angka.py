@@ -0,0 +1,130 @@
+"""Benchmark konversi kolom jam ke angka: loop to_numeric per kolom vs pipeline.blok_angka.
+
+Contoh:
+    python bench_angka.py                          # sheet file Juli + blok sintetis
+    python bench_angka.py --baris 20 200 2000 --teks 0.05 --ulang 20
+
+Blok yang diukur:
+- sheet harian: setiap sheet checkpoint "tanggal 1 juli.xlsx" setelah pembersihan
+  (isi object dari Excel, seperti di `_sheet_mingguan`); waktu per sheet
+- bulanan: blok 24 jam + Total gabungan semua sheet file bulanan Juli (`olah_bulanan`)
+- sintetis: N baris x 24 jam berisi int, None dan sebagian kecil teks ("-", "n/a")
+
+Hasil kedua cara dibandingkan dulu (nilai sama) agar yang diukur memang setara.
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import pipeline
+import workbook_io
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def loop_per_kolom(df, kolom):
+    """Cara lama: pd.to_numeric + fillna(0) untuk setiap kolom"""
+    df = df.copy()
+    for col in kolom:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    return df
+
+
+def sekaligus(df, kolom):
+    """Cara baru: seluruh blok dalam satu pass"""
+    df = df.copy()
+    df[kolom] = pipeline.blok_angka(df, kolom)
+    return df
+
+
+def _median_ms(fungsi, ulang):
+    fungsi()  # pemanasan
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append((time.perf_counter() - mulai) * 1000)
+    return float(np.median(waktu))
+
+
+def blok_harian(path):
+    """Fungsi untuk [(nama sheet, DataFrame mentah object)] dari satu file harian"""
+    hasil = []
+    for sheet_name, df in workbook_io.baca_semua(path).items():
+        df_cleaned = pipeline.clean_sheet_advanced(df)
+        if len(df_cleaned) <= 1:
+            continue
+        hasil.append((sheet_name, pd.DataFrame(df_cleaned.iloc[1:].values, columns=df_cleaned.iloc[0].tolist())))
+    return hasil
+
+
+def blok_bulanan(path):
+    """Fungsi untuk blok gabungan file bulanan dengan nama kolom jam, seperti di `olah_bulanan`"""
+    bulan, _ = pipeline.bulan_dari_nama_file(os.path.basename(path).lower())
+    list_df, _ = pipeline.parse_bulanan_file(path, os.path.basename(path), bulan)
+    df = pd.concat(list_df, ignore_index=True)
+    columns = list(df.columns)
+    columns[1:25] = pipeline.JAM_LIST
+    df.columns = columns
+    return df
+
+
+def blok_sintetis(baris, teks, rng):
+    """Fungsi untuk blok N baris x 24 jam berisi int, None dan teks bukan angka"""
+    nilai = rng.integers(0, 500, (baris, len(pipeline.JAM_LIST))).astype(object)
+    nilai[rng.random(nilai.shape) < 0.05] = None
+    acak = rng.random(nilai.shape)
+    nilai[acak < teks] = "-"
+    nilai[(acak >= teks) & (acak < teks * 1.5)] = "n/a"
+    return pd.DataFrame(nilai, columns=pipeline.JAM_LIST)
+
+
+def ukur(nama, df, kolom, ulang):
+    """Fungsi untuk satu baris hasil benchmark"""
+    lama, baru = loop_per_kolom(df, kolom), sekaligus(df, kolom)
+    pd.testing.assert_frame_equal(lama, baru, check_dtype=False)
+    return {"blok": nama, "baris": len(df), "kolom": len(kolom),
+            "loop_ms": _median_ms(lambda: loop_per_kolom(df, kolom), ulang),
+            "blok_ms": _median_ms(lambda: sekaligus(df, kolom), ulang)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark konversi kolom jam: loop per kolom vs satu pass")
+    parser.add_argument("--baris", nargs="*", type=int, default=[20, 200, 2000],
+                        help="jumlah baris blok sintetis")
+    parser.add_argument("--teks", type=float, default=0.02, help="proporsi sel teks bukan angka di blok sintetis")
+    parser.add_argument("--ulang", type=int, default=10)
+    args = parser.parse_args()
+
+    hasil = []
+    harian = sorted(glob.glob(os.path.join(ROOT, "Juli", "tanggal 1 *.xlsx")))
+    if harian:
+        per_sheet = [ukur(f"sheet {s}", df, [c for c in df.columns if ":" in str(c)], args.ulang)
+                     for s, df in blok_harian(harian[0])]
+        rata = pd.DataFrame(per_sheet)
+        hasil.append({"blok": f"sheet harian (rata-rata {len(rata)} sheet)", "baris": rata["baris"].mean(),
+                      "kolom": rata["kolom"].iloc[0], "loop_ms": rata["loop_ms"].mean(),
+                      "blok_ms": rata["blok_ms"].mean()})
+    bulanan = sorted(glob.glob(os.path.join(ROOT, "Juli", "Data Volume Lalu Lintas *.xlsx")))
+    if bulanan:
+        df = blok_bulanan(bulanan[0])
+        kolom = pipeline.JAM_LIST + (["Total"] if "Total" in df.columns else [])
+        hasil.append(ukur("bulanan Juli (gabungan)", df, kolom, args.ulang))
+
+    rng = np.random.default_rng(0)
+    for n in args.baris:
+        hasil.append(ukur(f"sintetis {args.teks:.0%} teks", blok_sintetis(n, args.teks, rng),
+                          pipeline.JAM_LIST, args.ulang))
+        hasil.append(ukur("sintetis tanpa teks", blok_sintetis(n, 0, rng), pipeline.JAM_LIST, args.ulang))
+
+    tabel = pd.DataFrame(hasil)
+    tabel["speedup"] = tabel["loop_ms"] / tabel["blok_ms"]
+    print(tabel.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
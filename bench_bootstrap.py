@@ -0,0 +1,80 @@
+"""Benchmark selang kepercayaan bootstrap: replikasi bertumpuk vs loop per replikasi.
+
+Contoh:
+    python bench_bootstrap.py                              # 10 checkpoint, 31 hari, 2000 replikasi
+    python bench_bootstrap.py --checkpoint 10 100 --hari 31 365 --replikasi 1000
+
+Data sampel 2 minggu dan data bulanan sintetis sama seperti bench_proporsi_jam.
+Yang dibandingkan:
+- loop: setiap replikasi = tarik ulang hari sampel, `hitung_proporsi_rata_rata`
+  lalu `estimasi_volume` (alur aplikasi sekarang), diukur pada --sampel-loop
+  replikasi lalu diekstrapolasi ke --replikasi
+- bertumpuk: `pipeline.bootstrap_estimasi` (model harian dan per jam)
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import bench_proporsi_jam
+import pipeline
+import synthetic_data
+
+
+def replikasi_loop(sampel, df_bulanan, rng):
+    """Satu replikasi cara lama: tarik ulang minggu per hari dalam minggu, lalu alur harian biasa"""
+    df = pd.concat(sampel, ignore_index=True)
+    pilihan = []
+    for hari, grup in df.groupby("Hari"):
+        minggu = grup["Minggu"].unique()
+        for i, m in enumerate(rng.choice(minggu, len(minggu))):
+            pilihan.append(grup[grup["Minggu"] == m].assign(Minggu=f"R{i}"))
+    _, df_proporsi = pipeline.hitung_proporsi_rata_rata([pd.concat(pilihan, ignore_index=True)])
+    df_final = pipeline.estimasi_volume(df_bulanan, df_proporsi, bulatkan=True)
+    return df_final.groupby(["Tanggal", "Source"])[pipeline.JAM_LIST].sum().sum(axis=1)
+
+
+def ukur(n_checkpoint, hari, replikasi, sampel_loop):
+    """Fungsi untuk baris hasil benchmark satu ukuran"""
+    rng = np.random.default_rng(0)
+    sampel = bench_proporsi_jam.data_sampel(synthetic_data.nama_checkpoint(n_checkpoint), rng)
+    df_bulanan = bench_proporsi_jam.data_bulanan(hari, rng)
+    df_gabungan = pd.concat(sampel, ignore_index=True)
+    baris = {"checkpoint": n_checkpoint, "hari": hari, "replikasi": replikasi}
+
+    mulai = time.perf_counter()
+    for _ in range(sampel_loop):
+        replikasi_loop(sampel, df_bulanan, rng)
+    loop_ms = (time.perf_counter() - mulai) * 1000 / sampel_loop * replikasi
+
+    hasil = [{**baris, "cara": f"loop (ekstrapolasi dari {sampel_loop})", "ms": loop_ms, "lebar_median": np.nan}]
+    for per_jam in (False, True):
+        mulai = time.perf_counter()
+        pita = pipeline.bootstrap_estimasi(df_gabungan, df_bulanan, per_jam=per_jam, replikasi=replikasi)
+        ms = (time.perf_counter() - mulai) * 1000
+        hasil.append({**baris, "cara": "bertumpuk per jam" if per_jam else "bertumpuk harian", "ms": ms,
+                      "lebar_median": float((pita["Atas"] - pita["Bawah"]).median())})
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bootstrap selang kepercayaan estimasi")
+    parser.add_argument("--checkpoint", nargs="*", type=int, default=[10])
+    parser.add_argument("--hari", nargs="*", type=int, default=[31], help="jumlah hari data bulanan")
+    parser.add_argument("--replikasi", type=int, default=pipeline.BOOTSTRAP_REPLIKASI)
+    parser.add_argument("--sampel-loop", type=int, default=5, help="replikasi loop yang benar-benar dijalankan")
+    args = parser.parse_args()
+
+    hasil = []
+    for n in args.checkpoint:
+        for hari in args.hari:
+            hasil.extend(ukur(n, hari, args.replikasi, args.sampel_loop))
+
+    tabel = pd.DataFrame(hasil)
+    tabel["speedup"] = tabel.groupby(["checkpoint", "hari"])["ms"].transform("first") / tabel["ms"]
+    print(tabel.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
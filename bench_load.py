@@ -0,0 +1,175 @@
+"""Load test: N sesi bersamaan terhadap server Streamlit lokal.
+
+Script menyalakan `streamlit run <app>` di port lokal, lalu membuka N koneksi
+websocket seperti browser (protokol BackMsg/ForwardMsg Streamlit). Setiap sesi
+menjalankan script sebanyak --rerun kali. Yang dilaporkan: throughput rerun
+per detik, latensi p50/p95, dan tambahan RSS server per sesi yang tetap terbuka.
+
+Contoh:
+    python bench_load.py --sesi 1 5 10 20
+    python bench_load.py --app dashboard.py --sesi 10 --env REKAP_BACKEND=memmap
+    python bench_load.py --sesi 10 --data-dir /data/rekap_setahun
+
+Butuh paket `websockets` (klien websocket) selain streamlit.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+try:
+    import websockets
+except ImportError:  # hanya dibutuhkan untuk load test ini
+    websockets = None
+
+try:
+    import psutil
+except ImportError:  # fallback ke /proc di Linux
+    psutil = None
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def rss_mb(pid):
+    """Fungsi untuk RSS proses server (MB)"""
+    if psutil is not None:
+        return psutil.Process(pid).memory_info().rss / 1024 ** 2
+    with open(f"/proc/{pid}/status") as f:
+        for baris in f:
+            if baris.startswith("VmRSS:"):
+                return int(baris.split()[1]) / 1024
+    return float("nan")
+
+
+def _port_bebas():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port, env_tambahan, data_dir=None):
+    """Fungsi untuk menyalakan server Streamlit headless dan menunggu sampai sehat"""
+    env = dict(os.environ, **env_tambahan)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, app),
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=data_dir or ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    batas = time.monotonic() + 60
+    while time.monotonic() < batas:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.3)
+    proc.kill()
+    raise RuntimeError(f"Server {app} tidak siap di port {port}")
+
+
+async def _rerun(ws):
+    """Kirim satu permintaan rerun dan tunggu sampai script selesai; kembalikan durasi (detik)"""
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = ""
+    mulai = time.perf_counter()
+    await ws.send(msg.SerializeToString())
+    while True:
+        fwd = ForwardMsg()
+        fwd.ParseFromString(await ws.recv())
+        if fwd.WhichOneof("type") == "script_finished":
+            return time.perf_counter() - mulai
+
+
+async def _sesi(port, rerun, latensi, siap, tutup):
+    async with websockets.connect(
+        f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None
+    ) as ws:
+        for _ in range(rerun):
+            latensi.append(await _rerun(ws))
+        siap.release()
+        # Sesi tetap terbuka sampai RSS diukur, seperti tab browser yang masih dibuka
+        await tutup.wait()
+
+
+async def jalankan_sesi(port, pid, n_sesi, rerun):
+    """Fungsi untuk menjalankan n sesi bersamaan; kembalikan statistik satu putaran"""
+    latensi = []
+    siap = asyncio.Semaphore(0)
+    tutup = asyncio.Event()
+    rss_awal = rss_mb(pid)
+
+    mulai = time.perf_counter()
+    tugas = [asyncio.create_task(_sesi(port, rerun, latensi, siap, tutup)) for _ in range(n_sesi)]
+    rss_puncak = rss_awal
+    selesai = 0
+    while selesai < n_sesi:
+        try:
+            await asyncio.wait_for(siap.acquire(), timeout=0.2)
+            selesai += 1
+        except asyncio.TimeoutError:
+            pass
+        rss_puncak = max(rss_puncak, rss_mb(pid))
+        gagal = [t for t in tugas if t.done() and t.exception()]
+        if gagal:
+            raise gagal[0].exception()
+    durasi = time.perf_counter() - mulai
+    rss_akhir = rss_mb(pid)
+    tutup.set()
+    await asyncio.gather(*tugas)
+
+    latensi_ms = np.asarray(latensi) * 1000
+    return {
+        "sesi": n_sesi,
+        "rerun": len(latensi),
+        "durasi_s": durasi,
+        "rerun_per_s": len(latensi) / durasi,
+        "p50_ms": np.percentile(latensi_ms, 50),
+        "p95_ms": np.percentile(latensi_ms, 95),
+        "rss_awal_mb": rss_awal,
+        "rss_puncak_mb": rss_puncak,
+        "mb_per_sesi": (rss_akhir - rss_awal) / n_sesi,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test sesi bersamaan terhadap server Streamlit lokal")
+    parser.add_argument("--app", default="dashboard.py")
+    parser.add_argument("--sesi", nargs="+", type=int, default=[1, 5, 10])
+    parser.add_argument("--rerun", type=int, default=3, help="jumlah rerun per sesi")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--data-dir", help="folder kerja server (berisi 'hasil rekap *.xlsx' / '*.parquet'), default folder repo")
+    parser.add_argument("--env", nargs="*", default=[], help="variabel lingkungan server, mis. REKAP_BACKEND=memmap")
+    args = parser.parse_args()
+
+    if websockets is None:
+        sys.exit("Paket 'websockets' dibutuhkan: pip install websockets")
+
+    env_tambahan = dict(item.split("=", 1) for item in args.env)
+    port = args.port or _port_bebas()
+    proc = start_server(args.app, port, env_tambahan, args.data_dir)
+    try:
+        # Satu sesi pemanasan agar cache (data, rollup) sudah terisi sebelum diukur
+        asyncio.run(jalankan_sesi(port, proc.pid, 1, 1))
+        hasil = [asyncio.run(jalankan_sesi(port, proc.pid, n, args.rerun)) for n in args.sesi]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    print(f"Load test {args.app} ({', '.join(args.env) or 'env default'})")
+    print(pd.DataFrame(hasil).round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
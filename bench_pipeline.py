@@ -0,0 +1,135 @@
+"""Benchmark setiap stage pipeline estimasi pada data sintetis.
+
+Contoh:
+    python bench_pipeline.py                      # skala kecil dan nyata
+    python bench_pipeline.py --skala 100x --simpan-data /tmp/bench_100x
+
+Skala "nyata" meniru satu bulan di folder Juli/ (10 checkpoint, 2 minggu
+sampel, 31 hari). Skala "100x" memakai 100 checkpoint dan 10 bulan, sehingga
+baris hasil estimasi sekitar 100 kali lipat.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import perf
+import pipeline
+import rekap_io
+import synthetic_data
+
+MINGGU_1 = tuple(range(1, 8))
+MINGGU_3 = tuple(range(15, 22))
+
+SKALA = {
+    "kecil": {"n_checkpoint": 2, "hari": MINGGU_1 + MINGGU_3, "bulan": ("juli",),
+              "jenis_mingguan": synthetic_data.JENIS_MINGGUAN[:8]},
+    "nyata": {"n_checkpoint": 10, "hari": MINGGU_1 + MINGGU_3, "bulan": ("juli",)},
+    "100x": {"n_checkpoint": 100, "hari": MINGGU_1 + MINGGU_3,
+             "bulan": ("januari", "februari", "maret", "april", "mei",
+                       "juni", "juli", "agustus", "september", "oktober")},
+}
+
+
+def run_pipeline(dataset, ekspor=True):
+    """Fungsi untuk menjalankan jalur 1 minggu dan 2 minggu pada satu dataset (stage dicatat profiler aktif)"""
+    checkpoints = dataset["checkpoints"]
+    ket_map = dataset["keterangan_map"]
+    warnings = []
+
+    per_minggu = {"Minggu1": [], "Minggu3": []}
+    for path in dataset["mingguan"]:
+        tanggal = pipeline.tanggal_dari_nama_file(os.path.basename(path))[0]
+        label = "Minggu1" if tanggal in MINGGU_1 else "Minggu3"
+        per_minggu[label].append(
+            pipeline.parse_weekly_file(path, os.path.basename(path), warnings, nama_checkpoint=checkpoints)
+        )
+
+    # Jalur 1 minggu
+    df_proporsi_1 = pipeline.hitung_proporsi_mingguan(
+        pd.concat(per_minggu["Minggu1"], ignore_index=True), keterangan_map=ket_map
+    )
+    # Jalur 2 minggu
+    df_minggu = [
+        pipeline.gabung_mingguan(df_list, label, keterangan_map=ket_map)
+        for label, df_list in per_minggu.items() if df_list
+    ]
+    _, df_proporsi_2 = pipeline.hitung_proporsi_rata_rata(df_minggu)
+
+    baris = 0
+    for path in dataset["bulanan"]:
+        bulan, _ = pipeline.bulan_dari_nama_file(os.path.basename(path).lower())
+        xls = pipeline.baca_bulanan(path, os.path.basename(path))
+        df_bulanan = pipeline.olah_bulanan(pipeline.parse_monthly(xls, bulan, warnings))
+        for df_proporsi, bulatkan in ((df_proporsi_1, False), (df_proporsi_2, True)):
+            df_final = pipeline.estimasi_volume(df_bulanan, df_proporsi, bulatkan=bulatkan)
+            pipeline.cek_kelengkapan(df_final)
+            baris += len(df_final)
+            if ekspor:
+                # Writer streaming yang sama dengan tombol unduh Excel di aplikasi
+                rekap_io.tulis_file({"estimasi_volume": df_final}, "Excel (.xlsx)", stage="ekspor: hasil rekap").close()
+    return baris
+
+
+def bench_skala(nama, out_dir, ulang=1, ekspor=True, seed=0):
+    """Fungsi untuk membuat data satu skala lalu menjalankan pipeline `ulang` kali"""
+    mulai = time.perf_counter()
+    dataset = synthetic_data.generate_dataset(out_dir, seed=seed, **SKALA[nama])
+    waktu_generate = time.perf_counter() - mulai
+    ukuran_mb = sum(os.path.getsize(p) for p in dataset["mingguan"] + dataset["bulanan"]) / 1024 ** 2
+
+    profilers = []
+    for _ in range(ulang):
+        profiler = perf.activate(perf.Profiler(f"bench:{nama}"))
+        baris = run_pipeline(dataset, ekspor=ekspor)
+        perf.activate(None)
+        profiler.write_log()
+        profilers.append(profiler)
+
+    print(f"\n=== Skala {nama}: {len(dataset['checkpoints'])} checkpoint, "
+          f"{len(dataset['mingguan'])} file mingguan, {len(dataset['bulanan'])} file bulanan "
+          f"({ukuran_mb:.1f} MB, dibuat dalam {waktu_generate:.1f} s), {baris:,} baris hasil ===")
+
+    ringkasan = pd.concat([p.summary().assign(run=i) for i, p in enumerate(profilers)])
+    # Median antar ulangan per stage, lebih stabil daripada satu run
+    tabel = ringkasan.groupby("kelompok", sort=False).agg(
+        jumlah=("jumlah", "first"), total_ms=("total_ms", "median"),
+        maks_ms=("maks_ms", "median"), peak_mb=("peak_mb", "max"), rows=("rows", "first"),
+    )
+    print(tabel.round(2).to_string())
+    total_ms = [p.to_frame().query("depth == 0")["wall_ms"].sum() for p in profilers]
+    print(f"Total: {pd.Series(total_ms).median() / 1000:.2f} s (median dari {ulang} run)")
+    return tabel.assign(skala=nama)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stage pipeline estimasi pada data sintetis")
+    parser.add_argument("--skala", nargs="+", choices=list(SKALA), default=["kecil", "nyata"])
+    parser.add_argument("--ulang", type=int, default=1, help="jumlah run per skala")
+    parser.add_argument("--tanpa-ekspor", action="store_true", help="lewati stage ekspor Excel")
+    parser.add_argument("--simpan-data", help="folder untuk menyimpan workbook sintetis (default: folder sementara)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    hasil = []
+    for nama in args.skala:
+        if args.simpan_data:
+            out_dir = os.path.join(args.simpan_data, nama)
+            hasil.append(bench_skala(nama, out_dir, args.ulang, not args.tanpa_ekspor, args.seed))
+        else:
+            with tempfile.TemporaryDirectory(prefix=f"bench_{nama}_") as out_dir:
+                hasil.append(bench_skala(nama, out_dir, args.ulang, not args.tanpa_ekspor, args.seed))
+
+    if len(hasil) > 1:
+        perbandingan = pd.concat(hasil).reset_index().pivot_table(
+            index="kelompok", columns="skala", values="total_ms", sort=False
+        )[args.skala]
+        print("\n=== Total ms per stage per skala ===")
+        print(perbandingan.round(1).to_string())
+    print(f"\nDetail per run dicatat di {perf.PERF_LOG_PATH}")
+
+
+if __name__ == "__main__":
+    main()
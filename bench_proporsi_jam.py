@@ -0,0 +1,125 @@
+"""Benchmark model proporsi harian (merge & pivot) vs model proporsi per jam (einsum).
+
+Contoh:
+    python bench_proporsi_jam.py                         # 10 checkpoint, 31 dan 365 hari bulanan
+    python bench_proporsi_jam.py --checkpoint 10 100 --hari 365 --ulang 5
+
+Data sampel 2 minggu (seperti hasil `gabung_mingguan`) dan data bulanan hasil
+`olah_bulanan` dibuat langsung sebagai DataFrame sintetis, dengan pola jam yang
+berbeda per checkpoint. Untuk setiap ukuran diukur (proporsi + estimasi):
+- harian: `hitung_proporsi_rata_rata` + `estimasi_volume` (alur sekarang)
+- tensor harian: `hitung_proporsi_jam(per_jam=False)` + `estimasi_volume_jam`;
+  hasilnya harus sama dengan alur harian (selisih maks dilaporkan)
+- tensor per jam: `hitung_proporsi_jam` + `estimasi_volume_jam`
+
+Total per (Tanggal, Jenis, jam) model per jam juga dicek sama dengan volume
+bulanan (proporsi per jam berjumlah 1 untuk setiap jam).
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import pipeline
+import synthetic_data
+
+JENIS = ["Bus", "Pejalan kaki", "Pick-up", "Roda 4", "Sepeda motor", "Tossa", "Truck"]
+
+
+def _median_ms(fungsi, ulang):
+    fungsi()  # pemanasan
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append((time.perf_counter() - mulai) * 1000)
+    return float(np.median(waktu))
+
+
+def data_sampel(checkpoints, rng, minggu=(1, 3)):
+    """Fungsi untuk [DataFrame per minggu] seperti hasil gabung_mingguan, pola jam berbeda per checkpoint"""
+    ket = synthetic_data.keterangan_map(checkpoints)
+    jam = np.arange(24)
+    hasil = []
+    for m in minggu:
+        tanggal = pd.date_range(f"{pipeline.TAHUN}-07-{(m - 1) * 7 + 1:02d}", periods=7, freq="D")
+        idx = pd.MultiIndex.from_product([tanggal, checkpoints, JENIS], names=["Tanggal", "Source", "Jenis Kendaraan"])
+        df = idx.to_frame(index=False)
+        # Puncak pagi/sore bergeser per checkpoint agar proporsi per jam memang berbeda
+        geser = df["Source"].map({c: i % 5 for i, c in enumerate(checkpoints)}).to_numpy()
+        profil = 0.15 + np.exp(-((jam[None] - 7 - geser[:, None]) ** 2) / 6)
+        nilai = rng.poisson(50 * profil * rng.uniform(0.5, 1.5, (len(df), 1)))
+        df = pd.concat([df, pd.DataFrame(nilai, columns=pipeline.JAM_LIST)], axis=1)
+        df["Jenis Kendaraan"] = df["Jenis Kendaraan"].astype(pipeline.REGISTRI.jenis_dtype)
+        df["Keterangan"] = df["Source"].map(ket)
+        df["Hari"] = df["Tanggal"].dt.day_name()
+        df["Minggu"] = f"Minggu{m}"
+        hasil.append(df)
+    return hasil
+
+
+def data_bulanan(hari, rng):
+    """Fungsi untuk DataFrame seperti hasil olah_bulanan untuk `hari` hari berturut-turut"""
+    tanggal = pd.date_range(f"{pipeline.TAHUN}-01-01", periods=hari, freq="D")
+    idx = pd.MultiIndex.from_product([tanggal, JENIS + ["Unknown"]], names=["Tanggal", "Jenis Kendaraan"])
+    df = idx.to_frame(index=False)
+    nilai = rng.poisson(300, (len(df), 24))
+    df = pd.concat([df, pd.DataFrame(nilai, columns=pipeline.JAM_LIST)], axis=1)
+    df["Total"] = nilai.sum(axis=1)
+    df["Jenis Kendaraan"] = df["Jenis Kendaraan"].astype(pipeline.REGISTRI.jenis_dtype)
+    df["Hari"] = df["Tanggal"].dt.day_name()
+    return df
+
+
+def ukur(n_checkpoint, hari, ulang):
+    """Fungsi untuk baris hasil benchmark satu ukuran"""
+    rng = np.random.default_rng(0)
+    sampel = data_sampel(synthetic_data.nama_checkpoint(n_checkpoint), rng)
+    df_bulanan = data_bulanan(hari, rng)
+    df_gabungan = pd.concat(sampel, ignore_index=True)
+
+    def harian():
+        _, df_proporsi = pipeline.hitung_proporsi_rata_rata(sampel)
+        return pipeline.estimasi_volume(df_bulanan, df_proporsi, bulatkan=True)
+
+    def tensor(per_jam):
+        model = pipeline.hitung_proporsi_jam(df_gabungan, per_jam=per_jam)
+        return pipeline.estimasi_volume_jam(df_bulanan, model, bulatkan=True)
+
+    lama, sama, baru = harian().reset_index(drop=True), tensor(False), tensor(True)
+    kunci = ["Tanggal", "Jenis Kendaraan", "Source"]
+    assert lama[kunci].equals(sama[kunci]) and lama[kunci].equals(baru[kunci])
+    selisih = np.abs(lama[pipeline.JAM_LIST].to_numpy() - sama[pipeline.JAM_LIST].to_numpy()).max()
+
+    model = pipeline.hitung_proporsi_jam(df_gabungan)
+    jumlah_jam = model.proporsi.sum(axis=1)
+    assert np.allclose(jumlah_jam[model.ada.any(axis=1)], 1)
+
+    baris = {"checkpoint": n_checkpoint, "hari": hari, "baris_hasil": len(lama)}
+    return [
+        {**baris, "model": "harian", "ms": _median_ms(harian, ulang), "selisih_maks": 0},
+        {**baris, "model": "tensor harian", "ms": _median_ms(lambda: tensor(False), ulang), "selisih_maks": selisih},
+        {**baris, "model": "tensor per jam", "ms": _median_ms(lambda: tensor(True), ulang), "selisih_maks": np.nan},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model proporsi harian vs per jam")
+    parser.add_argument("--checkpoint", nargs="*", type=int, default=[10])
+    parser.add_argument("--hari", nargs="*", type=int, default=[31, 365], help="jumlah hari data bulanan")
+    parser.add_argument("--ulang", type=int, default=5)
+    args = parser.parse_args()
+
+    hasil = []
+    for n in args.checkpoint:
+        for hari in args.hari:
+            hasil.extend(ukur(n, hari, args.ulang))
+
+    tabel = pd.DataFrame(hasil)
+    tabel["vs_harian"] = tabel["ms"] / tabel.groupby(["checkpoint", "hari"])["ms"].transform("first")
+    print(tabel.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark registri titik: peta dict string vs array kode registri.
+
+Contoh:
+    python bench_registri.py                        # 10, 100 dan 500 checkpoint
+    python bench_registri.py --checkpoint 10 1000 --hari 28 --ulang 10
+
+Untuk setiap jumlah checkpoint dibuat data mingguan sintetis (checkpoint x
+jenis kendaraan mentah x hari, seperti hasil parse_weekly_file) lalu diukur:
+- muat registri: baca file registri + kompilasi peta (sekali per proses)
+- Source -> Keterangan: `Series.map(dict)` vs `Pemetaan.petakan`
+- jenis mingguan: `Series.replace(dict)` vs `Pemetaan.ganti`
+- jenis bulanan: `Series.map(dict)` vs `Pemetaan.petakan`
+- jenis -> groupby: `map` lalu groupby teks vs `Pemetaan.kategorikan` ke
+  `jenis_dtype` lalu groupby kode kategori (normalisasi sekali saat ingest;
+  label tidak dikenal dibuang di kedua cara)
+- sheet -> titik: cari titik untuk setiap sheet "i. N Bulan" satu file harian
+
+Hasil kedua cara dibandingkan dulu agar yang diukur memang setara.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import registri
+import synthetic_data
+
+
+def _median_ms(fungsi, ulang):
+    fungsi()  # pemanasan
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append((time.perf_counter() - mulai) * 1000)
+    return float(np.median(waktu))
+
+
+def data_mingguan(checkpoints, hari, rng):
+    """Fungsi untuk kolom Source dan Jenis Kendaraan mentah seperti gabungan file harian"""
+    jenis = synthetic_data.JENIS_MINGGUAN
+    n = len(checkpoints) * len(jenis) * hari
+    return pd.DataFrame({
+        "Source": np.repeat(np.array(checkpoints, dtype=object), len(jenis) * hari),
+        "Jenis Kendaraan": rng.choice(np.array(jenis, dtype=object), n),
+    })
+
+
+def ukur(n_checkpoint, hari, ulang, folder):
+    """Fungsi untuk baris hasil benchmark satu jumlah checkpoint"""
+    rng = np.random.default_rng(0)
+    checkpoints = synthetic_data.nama_checkpoint(n_checkpoint)
+    path = synthetic_data.tulis_registri(os.path.join(folder, f"registri {n_checkpoint}.json"), checkpoints)
+    reg = registri.baca(path)
+    ket_map = reg.keterangan.sebagai_dict()
+    jenis_map = reg.jenis.sebagai_dict()
+    bulanan_map = reg.jenis_bulanan.sebagai_dict()
+
+    df = data_mingguan(checkpoints, hari, rng)
+    df["Total"] = rng.integers(0, 500, len(df))
+    jenis_bulanan = pd.Series(rng.choice(np.array(synthetic_data.JENIS_BULANAN, dtype=object), len(df)))
+    sheets = [f"{i + 1}. 1 Juli" for i in range(n_checkpoint)]
+
+    kasus = {
+        "Source -> Keterangan": (
+            lambda: df["Source"].map(ket_map),
+            lambda: reg.keterangan.petakan(df["Source"]),
+        ),
+        "jenis mingguan": (
+            lambda: df["Jenis Kendaraan"].replace(jenis_map),
+            lambda: reg.jenis.ganti(df["Jenis Kendaraan"]),
+        ),
+        "jenis bulanan": (
+            lambda: jenis_bulanan.map(bulanan_map),
+            lambda: reg.jenis_bulanan.petakan(jenis_bulanan),
+        ),
+        "jenis -> groupby": (
+            lambda: df.assign(**{"Jenis Kendaraan": df["Jenis Kendaraan"].map(jenis_map)})
+            .groupby(["Source", "Jenis Kendaraan"])["Total"].sum(),
+            lambda: df.assign(**{"Jenis Kendaraan": reg.jenis.kategorikan(df["Jenis Kendaraan"], reg.jenis_dtype)[0]})
+            .groupby(["Source", "Jenis Kendaraan"], observed=True)["Total"].sum(),
+        ),
+        "sheet -> titik": (
+            lambda: [checkpoints[i] for i in range(len(sheets))],
+            lambda: [reg.titik_sheet(s).nama for s in sheets],
+        ),
+    }
+
+    baris = [{"checkpoint": n_checkpoint, "baris": len(df), "operasi": "muat registri",
+              "dict_ms": np.nan, "registri_ms": _median_ms(lambda: registri.baca(path), ulang)}]
+    for nama, (lama, baru) in kasus.items():
+        a, b = lama(), baru()
+        if isinstance(a, pd.Series):
+            pd.testing.assert_series_equal(a, b, check_names=False, check_index_type=False, check_categorical=False)
+        else:
+            assert a == b, nama
+        baris.append({"checkpoint": n_checkpoint, "baris": len(df), "operasi": nama,
+                      "dict_ms": _median_ms(lama, ulang), "registri_ms": _median_ms(baru, ulang)})
+    return baris
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peta dict vs registri titik berkode integer")
+    parser.add_argument("--checkpoint", nargs="*", type=int, default=[10, 100, 500])
+    parser.add_argument("--hari", type=int, default=14, help="jumlah hari data mingguan (default 2 minggu)")
+    parser.add_argument("--ulang", type=int, default=5)
+    args = parser.parse_args()
+
+    hasil = []
+    with tempfile.TemporaryDirectory(prefix="bench_registri_") as folder:
+        for n in args.checkpoint:
+            hasil.extend(ukur(n, args.hari, args.ulang, folder))
+
+    tabel = pd.DataFrame(hasil)
+    tabel["speedup"] = tabel["dict_ms"] / tabel["registri_ms"]
+    print(tabel.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Harness latensi rerun untuk ketiga aplikasi Streamlit, memakai streamlit.testing.v1.AppTest.
+
+Setiap aplikasi dijalankan tanpa browser: file fixture "diunggah" (st.file_uploader
+diganti selama harness berjalan), lalu widget tanggal, lokasi, bulan dan halaman
+diganti berulang kali. Waktu setiap rerun dicatat dan dilaporkan sebagai p50/p95.
+Berpindah tab tidak memicu rerun (dikerjakan di browser), jadi yang diukur adalah
+interaksi widget di dalam setiap tab.
+
+Contoh:
+    python bench_rerun.py                       # semua aplikasi, 5 ulangan
+    python bench_rerun.py --app dashboard.py --ulang 20
+
+Exit code 1 jika ada p95 yang melewati budget-nya.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import warnings
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit import logger as st_logger
+from streamlit.testing.v1 import AppTest
+
+import jobs
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Budget rerun dashboard: query rollup + tabel (~100 ms) ditambah chart yang datanya
+# berubah. Chart lain diambil dari cache PNG, tetapi chart baru tetap digambar
+# matplotlib di server (~150-200 ms per chart di 1 CPU), jadi 300 ms per chart yang
+# digambar ulang; interaksi yang mengganti dua chart tidak mungkin di bawah 300 ms.
+BUDGET_DASHBOARD_MS = 300
+BUDGET_PER_CHART_MS = 300
+
+
+def _budget_dashboard(n_chart):
+    return BUDGET_DASHBOARD_MS + BUDGET_PER_CHART_MS * n_chart
+
+
+# (nama interaksi, jenis widget, label, key, budget p95 dalam ms; None = hanya dilaporkan)
+INTERAKSI = {
+    # Budget dashboard menurut jumlah chart yang digambar ulang interaksi itu
+    "dashboard.py": [
+        ("tanggal harian", "date_input", "Pilih Tanggal", None, _budget_dashboard(2)),  # pie + pola jam
+        ("lokasi harian", "selectbox", "Pilih Lokasi (Source)", None, _budget_dashboard(2)),
+        ("jenis kendaraan harian", "selectbox", "Pilih Jenis Kendaraan", None, _budget_dashboard(1)),  # pola jam
+        ("bulan", "selectbox", "Pilih Bulan", None, _budget_dashboard(2)),  # pie + pola harian
+        ("lokasi bulanan", "selectbox", "Pilih Lokasi", None, _budget_dashboard(2)),
+        ("rentang tanggal", "date_input", None, "range_date_select", _budget_dashboard(2)),  # pola jam + harian
+        ("lokasi rentang", "selectbox", None, "range_location_select", _budget_dashboard(2)),
+    ],
+    # Pipeline kedua aplikasi estimasi berjalan sekali sebagai job; rerun hanya
+    # menggambar ulang hasil, ekspor Excel dan chart
+    "1minggu.py": [
+        ("tanggal harian", "date_input", None, "daily_date_select", 5000),
+        ("lokasi harian", "selectbox", None, "daily_location_select", 5000),
+        ("jenis kendaraan harian", "selectbox", None, "daily_vehicle_select", 5000),
+        ("lokasi bulanan", "selectbox", None, "monthly_location_select", 5000),
+        ("halaman hasil", "number_input", None, "hasil_1minggu_page", 5000),
+    ],
+    "2minggu.py": [
+        ("tanggal harian", "date_input", None, "daily_date_select", 8000),
+        ("lokasi harian", "selectbox", None, "daily_location_select", 8000),
+        ("jenis kendaraan harian", "selectbox", None, "daily_vehicle_select", 8000),
+        ("lokasi bulanan", "selectbox", None, "monthly_location_select", 8000),
+        ("hari analisis 2 minggu", "selectbox", None, "weekly_day_select", 8000),
+        ("halaman hasil", "number_input", None, "hasil_2minggu_page", 8000),
+    ],
+}
+
+# Budget run pertama (unggah file / cache dingin, termasuk menunggu job latar belakang)
+BUDGET_RUN_AWAL = {"dashboard.py": 5000, "1minggu.py": 10000, "2minggu.py": 20000}
+
+
+@contextmanager
+def fixture_uploads(fixture_dir):
+    """Ganti st.file_uploader agar mengembalikan file fixture (minggu 1, minggu 3 dan bulanan)"""
+    def baca(nama):
+        with open(os.path.join(fixture_dir, nama), "rb") as f:
+            return f.read()
+
+    minggu1 = {f"tanggal {i} juli.xlsx": baca(f"tanggal {i} juli.xlsx") for i in range(1, 8)}
+    minggu3 = {f"tanggal {i} juli.xlsx": baca(f"tanggal {i} juli.xlsx") for i in range(15, 22)}
+    nama_bulanan = "Data Volume Lalu Lintas Juli.xlsx"
+    bulanan = baca(nama_bulanan)
+
+    def buffer(nama, isi):
+        buf = io.BytesIO(isi)
+        buf.name = nama
+        return buf
+
+    def file_uploader(label, *args, key=None, accept_multiple_files=False, **kwargs):
+        if not accept_multiple_files:
+            return buffer(nama_bulanan, bulanan)
+        files = minggu3 if key.startswith("minggu3_uploader") else minggu1
+        return [buffer(nama, isi) for nama, isi in files.items()]
+
+    asli = st.file_uploader
+    st.file_uploader = file_uploader
+    try:
+        yield
+    finally:
+        st.file_uploader = asli
+
+
+def _cari_widget(at, jenis, label, key):
+    for widget in getattr(at, jenis):
+        if (key is None or widget.key == key) and (label is None or widget.label == label):
+            return widget
+    return None
+
+
+def _nilai_berikut(widget, jenis, i):
+    """Fungsi untuk nilai widget pada ulangan ke-i (berputar di antara beberapa pilihan)"""
+    if jenis == "selectbox":
+        opsi = list(widget.options)
+        return opsi[(opsi.index(widget.value) + 1) % len(opsi)] if widget.value in opsi else opsi[0]
+    if jenis == "number_input":
+        return 2 if widget.value == 1 else 1
+    # date_input: geser 1..3 hari (maju, atau mundur jika sudah di batas max widget)
+    batas_atas = date.fromisoformat(widget.proto.max.replace("/", "-")) if widget.proto.max else date.max
+    geser = timedelta(days=i % 3 + 1)
+    if isinstance(widget.value, tuple):
+        awal, akhir = widget.value
+        akhir = akhir - geser if akhir - geser >= awal else batas_atas
+        return awal, akhir
+    tujuan = widget.value + geser
+    return tujuan if tujuan <= batas_atas else widget.value - geser
+
+
+def ukur_app(app, ulang=5, timeout=600):
+    """Fungsi untuk mengukur waktu rerun setiap interaksi di satu aplikasi"""
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=timeout)
+    mulai = time.perf_counter()
+    at.run()
+    # Pemrosesan berjalan sebagai job latar belakang; AppTest tidak menjalankan
+    # polling fragment, jadi rerun manual sampai semua job (berantai) selesai
+    while jobs.sibuk():
+        while jobs.sibuk():
+            time.sleep(jobs.POLL_DETIK)
+        at.run()
+    hasil = [{"app": app, "interaksi": "run awal", "waktu_ms": [(time.perf_counter() - mulai) * 1000],
+              "budget_ms": BUDGET_RUN_AWAL.get(app)}]
+    if at.exception:
+        raise RuntimeError(f"{app} gagal dijalankan: {at.exception[0].value}")
+
+    for nama, jenis, label, key, budget in INTERAKSI[app]:
+        waktu = []
+        for i in range(ulang):
+            widget = _cari_widget(at, jenis, label, key)
+            if widget is None:
+                break
+            widget.set_value(_nilai_berikut(widget, jenis, i))
+            mulai = time.perf_counter()
+            at.run()
+            waktu.append((time.perf_counter() - mulai) * 1000)
+            if at.exception:
+                raise RuntimeError(f"{app} gagal setelah '{nama}': {at.exception[0].value}")
+        hasil.append({"app": app, "interaksi": nama, "waktu_ms": waktu, "budget_ms": budget})
+    return hasil
+
+
+def ringkas(hasil):
+    """Fungsi untuk tabel p50/p95 per interaksi dan status terhadap budget"""
+    baris = []
+    for h in hasil:
+        waktu = np.asarray(h["waktu_ms"], dtype=float)
+        p95 = np.percentile(waktu, 95) if len(waktu) else np.nan
+        if not len(waktu):
+            status = "widget tidak ditemukan"
+        elif h["budget_ms"] is None:
+            status = "-"
+        else:
+            status = "OK" if p95 <= h["budget_ms"] else "LEWAT BUDGET"
+        baris.append({
+            "app": h["app"],
+            "interaksi": h["interaksi"],
+            "n": len(waktu),
+            "p50_ms": np.percentile(waktu, 50) if len(waktu) else np.nan,
+            "p95_ms": p95,
+            "budget_ms": h["budget_ms"],
+            "status": status,
+        })
+    return pd.DataFrame(baris)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur latensi rerun aplikasi Streamlit dengan AppTest")
+    parser.add_argument("--app", nargs="+", choices=list(INTERAKSI), default=list(INTERAKSI))
+    parser.add_argument("--ulang", type=int, default=5, help="jumlah rerun per interaksi")
+    parser.add_argument("--fixture-dir", default=os.path.join(ROOT, "Juli"),
+                        help="folder berisi 'tanggal N juli.xlsx' dan 'Data Volume Lalu Lintas Juli.xlsx'")
+    parser.add_argument("--skala-budget", type=float, default=1.0,
+                        help="pengali budget, mis. 2 untuk mesin CI yang lebih lambat")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    st_logger.set_log_level("error")
+    # Aplikasi membaca file relatif terhadap folder repo (mis. 'hasil rekap *.xlsx')
+    os.chdir(ROOT)
+
+    hasil = []
+    with fixture_uploads(args.fixture_dir):
+        for app in args.app:
+            hasil.extend(ukur_app(app, args.ulang))
+    for h in hasil:
+        if h["budget_ms"] is not None:
+            h["budget_ms"] *= args.skala_budget
+
+    tabel = ringkas(hasil)
+    print(tabel.round(1).to_string(index=False))
+
+    lewat = tabel[tabel["status"] != "OK"]
+    lewat = lewat[lewat["status"] != "-"]
+    if not lewat.empty:
+        print(f"\n❌ {len(lewat)} interaksi melewati budget atau widget-nya tidak ditemukan")
+        sys.exit(1)
+    print("\n✅ Semua interaksi dalam budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark pembacaan workbook bulanan: loop per sheet (notebook) vs workbook_io.
+
+Contoh:
+    python bench_workbook.py                       # file Juni & Juli + 1 file sintetis 100 checkpoint
+    python bench_workbook.py --proses 2 4 --ulang 5
+
+Cara yang dibandingkan:
+- loop per sheet: `pd.read_excel(path, sheet_name=s)` untuk setiap sheet, seperti
+  di notebook Juni/Juli (workbook dibuka ulang setiap sheet)
+- read_excel semua: `pd.read_excel(path, sheet_name=None)`
+- iter_sheets: workbook_io, dibuka sekali dan sheet di-parse satu per satu
+- baca_semua xN: workbook_io, sheet di-parse paralel di N proses
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import workbook_io
+import synthetic_data
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FILE_ASLI = [
+    os.path.join(ROOT, "Juni", "Data Juni", "Data Volume Lalu Lintas Juni.xlsx"),
+    os.path.join(ROOT, "Juli", "Data Volume Lalu Lintas Juli.xlsx"),
+]
+
+
+def _sheet_harian(path):
+    """Sheet tanggal (1-31), seperti `sheet_names` di notebook"""
+    return [s for s in workbook_io.sheet_names(path) if s.isdigit()]
+
+
+def cara_baca(proses):
+    """Fungsi untuk {nama cara: fungsi(path, sheets)} yang dibandingkan"""
+    cara = {
+        "loop per sheet": lambda path, sheets: [pd.read_excel(path, sheet_name=s, header=None) for s in sheets],
+        "read_excel semua": lambda path, sheets: pd.read_excel(path, sheet_name=sheets, header=None),
+        "iter_sheets": lambda path, sheets: [df for _, df in workbook_io.iter_sheets(path, sheets)],
+    }
+    for n in proses:
+        cara[f"baca_semua x{n}"] = lambda path, sheets, n=n: workbook_io.baca_semua(path, sheets, proses=n)
+    return cara
+
+
+def ukur(path, cara, ulang):
+    """Fungsi untuk waktu median (ms) setiap cara pada satu file"""
+    sheets = _sheet_harian(path)
+    baris = []
+    for nama, fungsi in cara.items():
+        fungsi(path, sheets[:1])  # pemanasan (impor, pool proses)
+        waktu = []
+        for _ in range(ulang):
+            mulai = time.perf_counter()
+            fungsi(path, sheets)
+            waktu.append((time.perf_counter() - mulai) * 1000)
+        baris.append({"file": os.path.basename(path), "sheet": len(sheets), "cara": nama,
+                      "median_ms": np.median(waktu), "min_ms": np.min(waktu)})
+    return baris
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loop per sheet vs pembaca workbook sekali buka")
+    parser.add_argument("--proses", nargs="*", type=int, default=[2, 4], help="jumlah proses untuk baca_semua")
+    parser.add_argument("--ulang", type=int, default=3)
+    parser.add_argument("--checkpoint-sintetis", type=int, default=100,
+                        help="jumlah checkpoint file bulanan sintetis (0 = tanpa file sintetis)")
+    args = parser.parse_args()
+
+    cara = cara_baca(args.proses)
+    hasil = []
+    for path in FILE_ASLI:
+        if os.path.exists(path):
+            hasil.extend(ukur(path, cara, args.ulang))
+    if args.checkpoint_sintetis:
+        with tempfile.TemporaryDirectory(prefix="bench_workbook_") as folder:
+            path = os.path.join(folder, f"sintetis {args.checkpoint_sintetis} checkpoint.xlsx")
+            synthetic_data.write_monthly_workbook(
+                path, "juli", synthetic_data.nama_checkpoint(args.checkpoint_sintetis),
+                rng=np.random.default_rng(0),
+            )
+            hasil.extend(ukur(path, cara, args.ulang))
+
+    tabel = pd.DataFrame(hasil)
+    dasar = tabel[tabel["cara"] == "loop per sheet"].set_index("file")["median_ms"]
+    tabel["speedup"] = dasar.reindex(tabel["file"]).to_numpy() / tabel["median_ms"]
+    print(f"CPU: {os.cpu_count()} core")
+    print(tabel.round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
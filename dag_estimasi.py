@@ -0,0 +1,172 @@
+"""Alur estimasi 2 minggu sebagai DAG tahap dengan sidik isi.
+
+    harian_<tgl><bulan>  (satu per file "tanggal N bulan.xlsx")
+            -> mingguan_<minggu>  (gabung_mingguan, satu per minggu)
+            -> proporsi_<bulan>   (hitung_proporsi_rata_rata)
+    bulanan_<bulan>      (file "Data Volume Lalu Lintas Bulan.xlsx", olah_bulanan)
+    proporsi_<bulan> + bulanan_<bulan> -> estimasi_<bulan>  (estimasi_volume)
+
+Dengan --per-jam, estimasi_<bulan> dihitung dari tahap mingguan + bulanan
+memakai model proporsi per jam (hitung_proporsi_jam + estimasi_volume_jam).
+
+Setiap tahap disimpan sebagai artefak (artefak.jalankan) dengan sumber = sha256
+file mentah dan sidik artefak hulunya. Mengoreksi satu file harian (mis.
+"tanggal 17 juli.xlsx") hanya menghitung ulang tahap harian itu, minggu dan
+proporsinya, lalu estimasi; file lain dan data bulanan dilewati.
+
+Contoh:
+    python dag_estimasi.py Juli                      # semua "tanggal N juli.xlsx" + file bulanan di Juli/
+    python dag_estimasi.py Juli --output "hasil rekap Juli.parquet"
+
+File harian dikelompokkan per minggu dalam bulan (tanggal 1-7 = Minggu1,
+15-21 = Minggu3, ...), seperti Minggu 1 & 3 di notebook Juli dan aplikasi 2 minggu.
+"""
+import argparse
+import glob
+import os
+
+import pandas as pd
+
+import artefak
+import pipeline
+import registri
+import rekap_io
+
+_REGISTRI = pipeline.REGISTRI.sebagai_dict()
+_JENIS = (pipeline.normalisasi_jenis, registri.Pemetaan, _REGISTRI["jenis_mingguan"], _REGISTRI["jenis_bulanan"])
+KODE_HARIAN = (pipeline.parse_weekly_file, pipeline._sheet_mingguan, pipeline.clean_sheet_advanced,
+               pipeline.blok_angka, registri.Registri.titik_sheet, _REGISTRI["titik"], *_JENIS)
+KODE_MINGGUAN = (pipeline.gabung_mingguan, _REGISTRI["titik"], *_JENIS)
+KODE_BULANAN = (pipeline.parse_bulanan_file, pipeline.parse_monthly, pipeline._sheet_bulanan,
+                pipeline.olah_bulanan, pipeline.blok_angka, *_JENIS)
+
+
+def label_minggu(tanggal):
+    """Fungsi untuk label minggu dalam bulan dari tanggal, mis. 17 -> 'Minggu3'"""
+    return f"Minggu{(tanggal - 1) // 7 + 1}"
+
+
+def cari_file(folder):
+    """Fungsi untuk ({label minggu: [path file harian]}, path file bulanan, nama bulan) di satu folder bulan"""
+    files_minggu = {}
+    for path in sorted(glob.glob(os.path.join(folder, "*.xlsx"))):
+        info = pipeline.tanggal_dari_nama_file(os.path.basename(path).lower())
+        if info is not None and os.path.basename(path).lower().startswith("tanggal"):
+            files_minggu.setdefault(label_minggu(info[0]), []).append((info[0], path))
+    files_minggu = {label: [p for _, p in sorted(files)] for label, files in sorted(files_minggu.items())}
+
+    bulanan = sorted(glob.glob(os.path.join(folder, "Data Volume Lalu Lintas *.xlsx")))
+    file_bulanan = bulanan[0] if bulanan else None
+    _, bulan_nama = pipeline.bulan_dari_nama_file(os.path.basename(file_bulanan or folder).lower())
+    return files_minggu, file_bulanan, bulan_nama
+
+
+def susun(files_minggu, file_bulanan, bulan_nama, bulatkan=True, sheet_warnings=None, per_jam=False):
+    """Fungsi untuk daftar artefak.Tahap alur estimasi.
+
+    `files_minggu` = {label minggu: [path file harian]}; proporsi dihitung dari
+    rata-rata semua minggu (seperti aplikasi 2 minggu, `bulatkan=True`),
+    per jam jika `per_jam=True`.
+    Peringatan per sheet dari tahap yang dihitung ulang ditambahkan ke `sheet_warnings`.
+    """
+    sheet_warnings = [] if sheet_warnings is None else sheet_warnings
+    daftar = []
+    nama_mingguan = []
+    for label, paths in files_minggu.items():
+        nama_harian = []
+        for path in paths:
+            tanggal, bulan_str, _ = pipeline.tanggal_dari_nama_file(os.path.basename(path).lower())
+            nama = f"harian_{tanggal}{bulan_str}"
+            daftar.append(artefak.Tahap(
+                nama,
+                lambda path=path, label=label: pipeline.parse_weekly_file(
+                    path, os.path.basename(path), sheet_warnings, cek_nama_sheet=False, minggu_label=label
+                ),
+                file=(path,),
+                kode=artefak.versi_kode(*KODE_HARIAN, label),
+            ))
+            nama_harian.append(nama)
+
+        nama = f"mingguan_{label.lower()}_{bulan_nama}"
+        daftar.append(artefak.Tahap(
+            nama,
+            lambda *harian, label=label: pipeline.gabung_mingguan(list(harian), label),
+            masukan=tuple(nama_harian),
+            kode=artefak.versi_kode(*KODE_MINGGUAN),
+        ))
+        nama_mingguan.append(nama)
+
+    daftar.append(artefak.Tahap(
+        f"proporsi_{bulan_nama}",
+        lambda *mingguan: pipeline.hitung_proporsi_rata_rata(list(mingguan))[1],
+        masukan=tuple(nama_mingguan),
+        kode=artefak.versi_kode(pipeline.hitung_proporsi_rata_rata),
+    ))
+
+    def bulanan():
+        bulan, _ = pipeline.bulan_dari_nama_file(os.path.basename(file_bulanan).lower())
+        list_df, peringatan = pipeline.parse_bulanan_file(file_bulanan, os.path.basename(file_bulanan), bulan)
+        sheet_warnings.extend(peringatan)
+        if not list_df:
+            raise ValueError("Tidak ada data valid di file bulanan. Periksa format file.")
+        return pipeline.olah_bulanan(list_df, peringatan=sheet_warnings)
+
+    daftar.append(artefak.Tahap(
+        f"bulanan_{bulan_nama}", bulanan, file=(file_bulanan,), kode=artefak.versi_kode(*KODE_BULANAN),
+    ))
+    if per_jam:
+        def estimasi_jam(df_bulanan, *mingguan):
+            model = pipeline.hitung_proporsi_jam(pd.concat(mingguan, ignore_index=True))
+            return pipeline.estimasi_volume_jam(df_bulanan, model, bulatkan=bulatkan)
+
+        daftar.append(artefak.Tahap(
+            f"estimasi_{bulan_nama}", estimasi_jam,
+            masukan=(f"bulanan_{bulan_nama}", *nama_mingguan),
+            kode=artefak.versi_kode(pipeline.hitung_proporsi_jam, pipeline.estimasi_volume_jam, bulatkan),
+        ))
+    else:
+        daftar.append(artefak.Tahap(
+            f"estimasi_{bulan_nama}",
+            lambda df_proporsi, df_bulanan: pipeline.estimasi_volume(df_bulanan, df_proporsi, bulatkan=bulatkan),
+            masukan=(f"proporsi_{bulan_nama}", f"bulanan_{bulan_nama}"),
+            kode=artefak.versi_kode(pipeline.estimasi_volume, bulatkan),
+        ))
+    return daftar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan alur estimasi 2 minggu, hanya tahap yang inputnya berubah")
+    parser.add_argument("folder", help="folder bulan berisi 'tanggal N bulan.xlsx' dan 'Data Volume Lalu Lintas Bulan.xlsx'")
+    parser.add_argument("--artefak", help="folder artefak (default <folder>/artefak)")
+    parser.add_argument("--output", help="tulis hasil estimasi ke file .parquet / .xlsx")
+    parser.add_argument("--potong", action="store_true", help="potong desimal seperti aplikasi 1 minggu (default dibulatkan)")
+    parser.add_argument("--per-jam", action="store_true", help="pakai model proporsi per jam, bukan per hari")
+    args = parser.parse_args()
+
+    files_minggu, file_bulanan, bulan_nama = cari_file(args.folder)
+    if not files_minggu or file_bulanan is None:
+        parser.error(f"{args.folder} harus berisi file 'tanggal N bulan.xlsx' dan 'Data Volume Lalu Lintas Bulan.xlsx'")
+
+    sheet_warnings = []
+    daftar = susun(files_minggu, file_bulanan, bulan_nama, bulatkan=not args.potong, sheet_warnings=sheet_warnings,
+                   per_jam=args.per_jam)
+    hasil, laporan = artefak.jalankan(daftar, folder=args.artefak or os.path.join(args.folder, "artefak"))
+    df_final = hasil[f"estimasi_{bulan_nama}"]
+
+    for pesan in sheet_warnings:
+        print(f"⚠️  {pesan}")
+    tabel = pd.DataFrame(laporan)
+    print(tabel.round({"detik": 3}).to_string(index=False))
+    dilewati = (tabel["status"] == "dilewati").sum()
+    print(f"\n{len(tabel) - dilewati} tahap dihitung, {dilewati} dilewati; estimasi {len(df_final)} baris")
+
+    if args.output:
+        if args.output.endswith(".xlsx"):
+            rekap_io.tulis_excel({"estimasi_volume": df_final}, args.output)
+        else:
+            df_final.to_parquet(args.output, index=False)
+        print(f"💾 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,120 @@ import streamlit as st
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-import glob
+import io
 import os
 from datetime import datetime
+from PIL import Image
+import registri
+from rollup import RekapRollup
+from rekap_db import RekapDB
+from rekap_io import FILE_PATTERNS, baca_file_rekap, cari_file_rekap, label_file_rekap
+from rekap_store import data_version, file_signature, is_fresh, open_store, save_store
 
 # python -m streamlit run app.py
+# Backend query: REKAP_BACKEND=pandas (default), duckdb, sqlite atau memmap
 
 st.set_page_config(page_title="Dashboard Lalu Lintas", layout="wide")
 
-@st.cache_data
-def load_all_data():
-    """Load semua file Excel dengan pattern 'hasil rekap *.xlsx'"""
+# 'hasil rekap *.parquet' dan 'hasil rekap *.xlsx'; Parquet diutamakan jika bulan yang sama ada di keduanya
+FILE_PATTERN = FILE_PATTERNS
+REKAP_BACKEND = os.environ.get("REKAP_BACKEND", "pandas").lower()
+REKAP_DB_PATH = os.environ.get("REKAP_DB_PATH", "rekap.duckdb" if REKAP_BACKEND == "duckdb" else "rekap.sqlite")
+REKAP_STORE_DIR = os.environ.get("REKAP_STORE_DIR", "rekap_store")
+# Interval (detik) cek file rekap baru/berubah, mis. ditulis `python pantau.py`; 0 = tidak dicek
+DASHBOARD_REFRESH = float(os.environ.get("DASHBOARD_REFRESH", "5"))
+
+# Source -> Keterangan dari registri titik (registri.json), dikompilasi sekali
+KETERANGAN = registri.muat().keterangan
+# Lebar maksimum gambar di halaman (px, MAXIMUM_CONTENT_WIDTH Streamlit); PNG yang lebih
+# lebar diperkecil ulang oleh Streamlit di setiap rerun
+LEBAR_GAMBAR_MAKS = 1460
+
+@st.cache_data(max_entries=64)
+def baca_rekap(file_path, mtime, size):
+    """Baca satu file rekap; di-cache per (mtime, ukuran) sehingga versi data baru hanya membaca file yang berubah"""
+    return baca_file_rekap(file_path)
+
+def png_figure(fig):
+    """Render figure ke PNG seperti st.pyplot (bbox tight), paling lebar LEBAR_GAMBAR_MAKS px.
+
+    Figure lebar dirender langsung pada dpi yang pas dengan lebar itu, bukan
+    dpi 200 lalu diperkecil; yang masih lebih lebar (mis. legend di luar pie)
+    diperkecil di sini sekali, bukan oleh Streamlit di setiap rerun.
+    """
+    buffer = io.BytesIO()
+    dpi = min(200, LEBAR_GAMBAR_MAKS / fig.get_figwidth())
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)  # lepas figure dari pyplot agar memori sesi tidak menumpuk
+    gambar = Image.open(buffer)
+    if gambar.width > LEBAR_GAMBAR_MAKS:
+        tinggi = int(gambar.height * LEBAR_GAMBAR_MAKS / gambar.width)
+        buffer = io.BytesIO()
+        gambar.resize((LEBAR_GAMBAR_MAKS, tinggi), resample=Image.BILINEAR).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+# Chart digambar ulang hanya jika datanya berubah: rerun karena widget lain memakai PNG dari cache
+@st.cache_data(max_entries=64)
+def gambar_pie(df):
+    """Pie jenis kendaraan (kolom Jenis Kendaraan, Jumlah, Persen) dengan persentase di legend"""
+    fig, ax = plt.subplots()
+    wedges, texts = ax.pie(
+        df["Jumlah"],
+        labels=None,  # tidak pakai label di pie
+        startangle=90,
+        counterclock=False,
+        colors=sns.color_palette("pastel")[0:len(df)],
+    )
+    ax.axis('equal')
+
+    # Legend dengan persentase di dalam teks
+    legend_labels = [f"{jenis} ({persen}%)" for jenis, persen in zip(df["Jenis Kendaraan"], df["Persen"])]
+    ax.legend(
+        wedges,
+        legend_labels,
+        title="Jenis Kendaraan",
+        loc="center left",
+        bbox_to_anchor=(1, 0, 0.5, 1),
+        frameon=False
+    )
+    return png_figure(fig)
+
+@st.cache_data(max_entries=64)
+def gambar_pola_jam(df_jam, judul):
+    """Bar chart jumlah kendaraan per jam"""
+    fig, ax = plt.subplots(figsize=(12, 4))
+    # Satu baris per jam, jadi cukup ax.bar (warna Set2 seperti sns.barplot, tanpa overhead ~150 ms-nya)
+    ax.bar(df_jam["Jam"], df_jam["Jumlah"], color=sns.color_palette("Set2", len(df_jam)))
+    ax.set_title(judul)
+    ax.set_ylabel("Jumlah")
+    ax.set_xlabel("Jam")
+    ax.tick_params(axis="x", labelrotation=45)
+    return png_figure(fig)
+
+@st.cache_data(max_entries=64)
+def gambar_pola_harian(df_harian, judul):
+    """Line chart total kendaraan per hari (kolom Hari sebagai label sumbu x)"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    # Satu titik per hari: ax.plot sama dengan sns.lineplot tanpa agregasi seaborn
+    ax.plot(df_harian["Hari"], df_harian["Jumlah"], marker="o")
+    ax.set_title(judul)
+    ax.set_ylabel("Total Kendaraan")
+    ax.set_xlabel("Tanggal")
+    ax.tick_params(axis="x", labelrotation=45)
+    return png_figure(fig)
+
+@st.cache_data(max_entries=1)
+def load_all_data(versi):
+    """Load semua file dengan pattern 'hasil rekap *.parquet' / 'hasil rekap *.xlsx'.
+
+    `versi` = data_version(FILE_PATTERN); versi baru membuat cache ini dibangun ulang.
+    """
     
-    # Cari semua file dengan pattern 'hasil rekap *.xlsx'
-    file_pattern = "hasil rekap *.xlsx"
-    excel_files = glob.glob(file_pattern)
+    # Cari semua file 'hasil rekap', satu file per bulan
+    excel_files = cari_file_rekap(FILE_PATTERN)
     
     if not excel_files:
-        st.error("❌ Tidak ditemukan file dengan format 'hasil rekap (bulan).xlsx'")
+        st.error("❌ Tidak ditemukan file dengan format 'hasil rekap (bulan).xlsx' atau '.parquet'")
         return pd.DataFrame()
     
     all_dataframes = []
@@ -27,9 +123,10 @@ def load_all_data():
     for file_path in excel_files:
         try:
             # Extract nama bulan dari nama file
-            bulan_dari_file = os.path.basename(file_path).replace("hasil rekap ", "").replace(".xlsx", "")
+            bulan_dari_file = label_file_rekap(file_path)
             
-            df_temp = pd.read_excel(file_path)
+            stat = os.stat(file_path)
+            df_temp = baca_rekap(file_path, stat.st_mtime, stat.st_size)
             df_temp["File_Source"] = bulan_dari_file  # Tambah kolom untuk tracking
             all_dataframes.append(df_temp)
             
@@ -47,48 +144,93 @@ def load_all_data():
     # Proses data seperti biasa
     df_combined["Tanggal"] = pd.to_datetime(df_combined["Tanggal"], dayfirst=True, errors='coerce')
     df_combined["Hari"] = df_combined["Tanggal"].dt.day_name()
-    
-    keterangan_map = {
-        "diponegoro": "Keluar Batu",
-        "imam bonjol": "Batu",
-        "a yani": "Batu",
-        "gajah mada": "Batu",
-        "sudirman": "Keluar Batu",
-        "brantas": "Masuk Batu",
-        "patimura": "Masuk Batu",
-        "trunojoyo": "Masuk Batu",
-        "arumdalu": "Masuk Batu",
-        "mojorejo": "Masuk Batu"
-    }
-    df_combined["Keterangan"] = df_combined["Source"].map(keterangan_map)
+    df_combined["Keterangan"] = KETERANGAN.petakan(df_combined["Source"])
     
     return df_combined
 
-# Load data
-df = load_all_data()
-
-if df.empty:
+@st.cache_resource(max_entries=1)
+def load_rollup(versi):
+    """Bangun rollup prefix-sum dari data rekap untuk query rentang tanggal.
+
+    Disimpan sebagai resource: satu objek read-only dipakai bersama oleh semua
+    sesi, tanpa disalin ulang (unpickle) di setiap rerun seperti st.cache_data.
+    """
+    df = load_all_data(versi)
+    jam_cols = [col for col in df.columns if col.endswith(":00:00")]
+    return RekapRollup.from_dataframe(df, jam_cols).read_only()
+
+@st.cache_resource
+def open_rekap_db():
+    """Buka database rekap lokal (DuckDB/SQLite), satu koneksi untuk semua sesi"""
+    return RekapDB(REKAP_DB_PATH, engine=REKAP_BACKEND)
+
+@st.cache_resource(max_entries=1)
+def load_rekap_db(versi):
+    """Masukkan file yang baru/berubah ke database rekap (sekali per versi data)"""
+    db = open_rekap_db()
+    for file_path, status in db.sync(FILE_PATTERN, KETERANGAN):
+        if status != "tetap":
+            st.sidebar.success(f"✅ Berhasil load ke database: {file_path}")
+    return db
+
+@st.cache_resource(max_entries=1)
+def load_rekap_store(versi):
+    """Buka store memory-mapped (dibagi antar proses lewat page cache), bangun ulang jika basi"""
+    if not is_fresh(REKAP_STORE_DIR, FILE_PATTERN):
+        sumber = file_signature(FILE_PATTERN)
+        save_store(load_rollup(versi), REKAP_STORE_DIR, sumber)
+        # Frame pandas hanya dibutuhkan untuk membangun store, lepaskan dari cache
+        load_rollup.clear()
+        load_all_data.clear()
+    return open_store(REKAP_STORE_DIR)
+
+def month_range(bulan):
+    """Ubah label bulan ('%B %Y') menjadi tanggal awal dan akhir bulan"""
+    awal = pd.to_datetime(bulan, format="%B %Y")
+    return awal, awal + pd.offsets.MonthEnd(0)
+
+# Load data: semua agregasi dashboard dijawab oleh rollup (pandas) atau database
+versi_data = data_version(FILE_PATTERN)
+if REKAP_BACKEND in ("duckdb", "sqlite"):
+    rekap = load_rekap_db(versi_data)
+elif REKAP_BACKEND == "memmap":
+    rekap = load_rekap_store(versi_data)
+else:
+    rekap = load_rollup(versi_data)
+
+# Cek berkala juga saat belum ada file, agar file pertama langsung tampil
+if DASHBOARD_REFRESH > 0:
+    @st.fragment(run_every=DASHBOARD_REFRESH)
+    def cek_data_baru():
+        """Rerun seluruh halaman jika file rekap bertambah/berubah (mis. dari pantau.py)"""
+        if data_version(FILE_PATTERN) != versi_data:
+            st.rerun()
+
+    with st.sidebar:
+        cek_data_baru()
+
+if not rekap.files:
+    if REKAP_BACKEND in ("duckdb", "sqlite", "memmap"):
+        st.error("❌ Tidak ditemukan file dengan format 'hasil rekap (bulan).xlsx' atau '.parquet'")
     st.stop()
 
-jam_cols = [col for col in df.columns if col.endswith(":00:00")]
-
 # Info file yang berhasil di-load
 st.sidebar.markdown("### 📁 File Data Loaded:")
-files_loaded = df["File_Source"].unique()
-for file in sorted(files_loaded):
-    st.sidebar.markdown(f"- hasil rekap {file}.xlsx")
+for file in rekap.files:
+    st.sidebar.markdown(f"- hasil rekap {file}")
+st.sidebar.caption(f"⚙️ Backend query: {REKAP_BACKEND}")
 
 # === NAVBAR ===
 st.title("📊 Rekap & Analisis Kendaraan per Lokasi dan Jenis")
-tab1, tab2 = st.tabs(["📅 Rekap Harian", "📆 Rekap Bulanan"])
+tab1, tab2, tab3 = st.tabs(["📅 Rekap Harian", "📆 Rekap Bulanan", "🗓️ Rentang Tanggal"])
 
 # TAB 1: Rekap Harian
 with tab1:
     st.header("📅 Rekap Harian")
 
     # Sekarang bisa pilih tanggal dari semua bulan yang ada
-    min_date = df["Tanggal"].min()
-    max_date = df["Tanggal"].max()
+    min_date = rekap.date_min
+    max_date = rekap.date_max
     
     tanggal_terpilih = st.date_input(
         "Pilih Tanggal", 
@@ -97,30 +239,22 @@ with tab1:
         max_value=max_date.date() if pd.notna(max_date) else datetime.now().date()
     )
     
-    source_terpilih = st.selectbox("Pilih Lokasi (Source)", sorted(df["Source"].unique()))
+    source_terpilih = st.selectbox("Pilih Lokasi (Source)", rekap.sources)
 
-    df_filtered = df[(df["Tanggal"] == pd.to_datetime(tanggal_terpilih)) & (df["Source"] == source_terpilih)]
+    total_per_kendaraan = rekap.type_totals(tanggal_terpilih, tanggal_terpilih, source_terpilih)
 
-    if df_filtered.empty:
+    if total_per_kendaraan.empty:
         st.warning("⚠️ Data tidak ditemukan untuk pilihan tersebut.")
         
         # Tampilkan tanggal yang tersedia untuk lokasi ini
-        available_dates = df[df["Source"] == source_terpilih]["Tanggal"].dropna()
-        if not available_dates.empty:
+        available_dates = rekap.available_dates(source_terpilih)
+        if available_dates:
             st.info(f"📅 Tanggal tersedia untuk {source_terpilih}:")
-            for date in sorted(available_dates.unique()):
+            for date in available_dates:
                 st.write(f"- {date.strftime('%d %B %Y')}")
     else:
         st.subheader(f"Rekap **{source_terpilih}** - {tanggal_terpilih.strftime('%A, %d %B %Y')}")
         
-        df_melted = df_filtered.melt(
-            id_vars=["Tanggal", "Source", "Jenis Kendaraan"], 
-            value_vars=jam_cols,
-            var_name="Jam", 
-            value_name="Jumlah"
-        )
-
-        total_per_kendaraan = df_melted.groupby("Jenis Kendaraan")["Jumlah"].sum().reset_index()
         total_per_kendaraan["Persen"] = (total_per_kendaraan["Jumlah"] / total_per_kendaraan["Jumlah"].sum() * 100).round(2)
         total_per_kendaraan = total_per_kendaraan.sort_values(by="Jumlah", ascending=False)
 
@@ -141,55 +275,19 @@ with tab1:
                 total_per_kendaraan["Jumlah"] / total_per_kendaraan["Jumlah"].sum() * 100
             ).round(1)
    
-            fig1, ax1 = plt.subplots()
-            wedges, texts = ax1.pie(
-                total_per_kendaraan["Jumlah"],
-                labels=None,  # tidak pakai label di pie
-                startangle=90,
-                counterclock=False,
-                colors=sns.color_palette("pastel")[0:len(total_per_kendaraan)],
-            )
-            ax1.axis('equal')
-
-            # Legend dengan persentase di dalam teks
-            legend_labels = [
-                f"{jenis} ({persen}%)" 
-                for jenis, persen in zip(total_per_kendaraan["Jenis Kendaraan"], total_per_kendaraan["Persen"])
-            ]
-            ax1.legend(
-                wedges,
-                legend_labels,
-                title="Jenis Kendaraan",
-                loc="center left",
-                bbox_to_anchor=(1, 0, 0.5, 1),
-                frameon=False
-            )
-            st.pyplot(fig1)
+            st.image(gambar_pie(total_per_kendaraan), width="stretch")
 
         st.markdown("---")
         st.subheader(f"📈 Pola Waktu Kendaraan")
         kendaraan_pilih = st.selectbox("Pilih Jenis Kendaraan", total_per_kendaraan["Jenis Kendaraan"])
-        df_jam = df_melted[df_melted["Jenis Kendaraan"] == kendaraan_pilih]
+        df_jam = rekap.hourly_profile(tanggal_terpilih, tanggal_terpilih, source_terpilih, kendaraan_pilih)
 
-        fig2, ax2 = plt.subplots(figsize=(12, 4))
-        sns.barplot(data=df_jam, x="Jam", y="Jumlah", ax=ax2, palette="Set2")
-        ax2.set_title(f"Distribusi Waktu - {kendaraan_pilih}")
-        ax2.set_ylabel("Jumlah")
-        ax2.set_xlabel("Jam")
-        plt.xticks(rotation=45)
-        st.pyplot(fig2)
+        st.image(gambar_pola_jam(df_jam, f"Distribusi Waktu - {kendaraan_pilih}"), width="stretch")
 
         st.markdown("---")
         st.subheader("🚪 Total Kendaraan Masuk / Keluar Batu")
 
-        df_tanggal = df[df["Tanggal"] == pd.to_datetime(tanggal_terpilih)]
-        total_by_keterangan = (
-            df_tanggal
-            .melt(id_vars=["Keterangan"], value_vars=jam_cols, value_name="Jumlah")
-            .groupby("Keterangan")["Jumlah"]
-            .sum()
-            .reset_index()
-        )
+        total_by_keterangan = rekap.keterangan_totals(tanggal_terpilih, tanggal_terpilih)
 
         for _, row in total_by_keterangan.iterrows():
             st.markdown(f"**{row['Keterangan']}**: {row['Jumlah']} kendaraan")
@@ -199,91 +297,115 @@ with tab2:
     st.header("📆 Rekap Bulanan")
 
     # Sekarang punya pilihan bulan dari semua file yang di-load
-    available_months = sorted(df["Tanggal"].dt.strftime("%B %Y").dropna().unique())
-    selected_month = st.selectbox("Pilih Bulan", available_months)
-    
-    month_filter = df["Tanggal"].dt.strftime("%B %Y") == selected_month
-    df_bulanan = df[month_filter]
-
-    if df_bulanan.empty:
-        st.warning("⚠️ Tidak ada data untuk bulan yang dipilih.")
+    available_months = rekap.months()
+    if not available_months:
+        st.warning("⚠️ Tidak ada bulan dengan tanggal yang valid di data rekap.")
     else:
-        df_melted_bulan = df_bulanan.melt(
-            id_vars=["Source", "Jenis Kendaraan"], 
-            value_vars=jam_cols,
-            var_name="Jam", 
-            value_name="Jumlah"
-        )
-        grouped = df_melted_bulan.groupby(["Source", "Jenis Kendaraan"])["Jumlah"].sum().reset_index()
-
-        lokasi_terpilih = st.selectbox("Pilih Lokasi", sorted(grouped["Source"].unique()))
-        df_source = grouped[grouped["Source"] == lokasi_terpilih]
-
-        df_source["Persen"] = (df_source["Jumlah"] / df_source["Jumlah"].sum() * 100).round(2)
-        df_source = df_source.sort_values(by="Jumlah", ascending=False)
+        selected_month = st.selectbox("Pilih Bulan", available_months)
+    
+        awal_bulan, akhir_bulan = month_range(selected_month)
+        sources_bulan = rekap.sources_in(awal_bulan, akhir_bulan)
+
+        if not sources_bulan:
+            st.warning("⚠️ Tidak ada data untuk bulan yang dipilih.")
+        else:
+            lokasi_terpilih = st.selectbox("Pilih Lokasi", sources_bulan)
+            df_source = rekap.type_totals(awal_bulan, akhir_bulan, lokasi_terpilih)
+            df_source.insert(0, "Source", lokasi_terpilih)
+
+            df_source["Persen"] = (df_source["Jumlah"] / df_source["Jumlah"].sum() * 100).round(2)
+            df_source = df_source.sort_values(by="Jumlah", ascending=False)
         
-        total_kendaraan_bulan = df_source["Jumlah"].sum()
-        st.subheader("🚗 Total Kendaraan Bulan Ini")
-        st.metric(label="Total Kendaraan", value=f"{int(total_kendaraan_bulan):,} kendaraan")
+            total_kendaraan_bulan = df_source["Jumlah"].sum()
+            st.subheader("🚗 Total Kendaraan Bulan Ini")
+            st.metric(label="Total Kendaraan", value=f"{int(total_kendaraan_bulan):,} kendaraan")
 
-        col1, col2 = st.columns([1.2, 1])
+            col1, col2 = st.columns([1.2, 1])
 
-        with col1:
-            st.subheader("📄 Data Lengkap Jenis Kendaraan")
-            st.dataframe(df_source, use_container_width=True)
+            with col1:
+                st.subheader("📄 Data Lengkap Jenis Kendaraan")
+                st.dataframe(df_source, use_container_width=True)
 
-        with col2:
-            st.subheader(f"📊 Diagram Jenis Kendaraan Bulanan - {lokasi_terpilih}")
-            # Hitung persen biar bisa dipakai di legend
-            df_source["Persen"] = (
-                df_source["Jumlah"] / df_source["Jumlah"].sum() * 100
-            ).round(1)
+            with col2:
+                st.subheader(f"📊 Diagram Jenis Kendaraan Bulanan - {lokasi_terpilih}")
+                # Hitung persen biar bisa dipakai di legend
+                df_source["Persen"] = (
+                    df_source["Jumlah"] / df_source["Jumlah"].sum() * 100
+                ).round(1)
 
-            fig1, ax1 = plt.subplots()
-            wedges, texts = ax1.pie(
-                df_source["Jumlah"],
-                labels=None,  # tidak pakai label di pie
-                startangle=90,
-                counterclock=False,
-                colors=sns.color_palette("pastel")[0:len(df_source)],
-            )
-            ax1.axis('equal')
-
-            # Legend dengan persentase di dalam teks
-            legend_labels = [
-                f"{jenis} ({persen}%)" 
-                for jenis, persen in zip(df_source["Jenis Kendaraan"], df_source["Persen"])
-            ]
-            ax1.legend(
-                wedges,
-                legend_labels,
-                title="Jenis Kendaraan",
-                loc="center left",
-                bbox_to_anchor=(1, 0, 0.5, 1),
-                frameon=False
-            )
-            st.pyplot(fig1)
+                st.image(gambar_pie(df_source), width="stretch")
 
-        st.markdown("---")
-        st.subheader("📊 Perbandingan Total per Hari dalam Bulan")
-        
-        # Chart harian dalam bulan
-        df_harian_bulan = (
-            df_bulanan
-            .melt(id_vars=["Tanggal", "Source"], value_vars=jam_cols, value_name="Jumlah")
-            .groupby(["Tanggal", "Source"])["Jumlah"]
-            .sum()
-            .reset_index()
-        )
+            st.markdown("---")
+            st.subheader("📊 Perbandingan Total per Hari dalam Bulan")
         
-        df_harian_lokasi = df_harian_bulan[df_harian_bulan["Source"] == lokasi_terpilih]
+            # Chart harian dalam bulan
+            df_harian_lokasi = rekap.daily_totals(awal_bulan, akhir_bulan, lokasi_terpilih)
         
-        if not df_harian_lokasi.empty:
-            fig3, ax3 = plt.subplots(figsize=(12, 6))
-            df_harian_lokasi["Hari"] = df_harian_lokasi["Tanggal"].dt.strftime("%d")
-            sns.lineplot(data=df_harian_lokasi, x="Hari", y="Jumlah", marker="o", ax=ax3)
-            ax3.set_title(f"Pola Harian Bulan {selected_month} - {lokasi_terpilih}")
-            ax3.set_ylabel("Total Kendaraan")
-            ax3.set_xlabel("Tanggal")
-            plt.xticks(rotation=45)
-            st.pyplot(fig3)
\ No newline at end of file
+            if not df_harian_lokasi.empty:
+                df_harian_lokasi["Hari"] = df_harian_lokasi["Tanggal"].dt.strftime("%d")
+                st.image(gambar_pola_harian(df_harian_lokasi, f"Pola Harian Bulan {selected_month} - {lokasi_terpilih}"),
+                         width="stretch")
+
+# TAB 3: Rekap Rentang Tanggal
+with tab3:
+    st.header("🗓️ Rekap Rentang Tanggal")
+    if pd.isna(rekap.date_min) or pd.isna(rekap.date_max):
+        st.warning("⚠️ Tidak ada tanggal yang valid di data rekap.")
+    else:
+        rentang = st.date_input(
+            "Pilih Rentang Tanggal",
+            value=(rekap.date_min.date(), rekap.date_max.date()),
+            min_value=rekap.date_min.date(),
+            max_value=rekap.date_max.date(),
+            key="range_date_select"
+        )
+
+        if not isinstance(rentang, (tuple, list)) or len(rentang) != 2:
+            st.info("ℹ️ Pilih tanggal awal dan tanggal akhir.")
+        else:
+            tanggal_awal, tanggal_akhir = rentang
+            sources_rentang = rekap.sources_in(tanggal_awal, tanggal_akhir)
+
+            if not sources_rentang:
+                st.warning("⚠️ Tidak ada data untuk rentang tanggal yang dipilih.")
+            else:
+                lokasi_rentang = st.selectbox("Pilih Lokasi", sources_rentang, key="range_location_select")
+
+                df_rentang = rekap.type_totals(tanggal_awal, tanggal_akhir, lokasi_rentang)
+                df_rentang["Persen"] = (df_rentang["Jumlah"] / df_rentang["Jumlah"].sum() * 100).round(2)
+                df_rentang = df_rentang.sort_values(by="Jumlah", ascending=False)
+
+                jumlah_hari = (tanggal_akhir - tanggal_awal).days + 1
+                st.subheader(f"Rekap **{lokasi_rentang}** - {tanggal_awal.strftime('%d %B %Y')} s/d {tanggal_akhir.strftime('%d %B %Y')}")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric(label="Total Kendaraan", value=f"{int(df_rentang['Jumlah'].sum()):,} kendaraan")
+                with col2:
+                    st.metric(label="Jumlah Hari", value=f"{jumlah_hari} hari")
+
+                col1, col2 = st.columns([1.2, 1])
+
+                with col1:
+                    st.subheader("📄 Data Lengkap Jenis Kendaraan")
+                    st.dataframe(df_rentang, use_container_width=True)
+
+                with col2:
+                    st.subheader("🚪 Total Kendaraan Masuk / Keluar Batu")
+                    total_by_keterangan = rekap.keterangan_totals(tanggal_awal, tanggal_akhir)
+                    for _, row in total_by_keterangan.iterrows():
+                        st.markdown(f"**{row['Keterangan']}**: {int(row['Jumlah']):,} kendaraan")
+
+                st.markdown("---")
+                st.subheader("📈 Pola Waktu Kendaraan")
+                kendaraan_rentang = st.selectbox("Pilih Jenis Kendaraan", df_rentang["Jenis Kendaraan"], key="range_vehicle_select")
+                df_jam_rentang = rekap.hourly_profile(tanggal_awal, tanggal_akhir, lokasi_rentang, kendaraan_rentang)
+
+                st.image(gambar_pola_jam(df_jam_rentang, f"Distribusi Waktu - {kendaraan_rentang}"), width="stretch")
+
+                st.markdown("---")
+                st.subheader("📊 Total per Hari dalam Rentang")
+                df_harian_rentang = rekap.daily_totals(tanggal_awal, tanggal_akhir, lokasi_rentang)
+
+                if not df_harian_rentang.empty:
+                    df_harian_rentang["Hari"] = df_harian_rentang["Tanggal"].dt.strftime("%d-%m")
+                    st.image(gambar_pola_harian(df_harian_rentang, f"Pola Harian - {lokasi_rentang}"), width="stretch")
@@ -0,0 +1,368 @@
+"""Job latar belakang untuk pemrosesan estimasi yang lama.
+
+Pipeline (parse file mingguan, baca dan olah file bulanan, estimasi) dijalankan
+di thread pool milik proses server, bukan di thread skrip sesi. Skrip hanya
+menyimpan id job di st.session_state lalu mem-poll progresnya, sehingga rerun
+di tengah pemrosesan (mis. karena widget diklik) tidak membatalkan pekerjaan.
+Setelah job selesai, sesi menyimpan Job-nya di session_state dan rerun
+berikutnya memakai hasilnya tanpa menghitung ulang. Hasil hanya disimpan sekali:
+begitu diambil sesi, registri global memegang job itu lewat weakref, jadi
+hasilnya dibuang saat tidak ada sesi lagi yang memakainya. Job gagal dilepas
+dari registri saat errornya diambil sehingga "Coba lagi" mengirim job baru.
+
+Antrian dibatasi dua hal: jumlah worker (JOB_WORKERS) dan total perkiraan
+memori job yang berjalan (JOB_MEMORI_MB, diperkirakan dari ukuran file input).
+Job yang belum kebagian tempat menunggu di antrian FIFO dan UI menampilkan
+posisinya. Input yang identik (sidik sama) dari sesi mana pun memakai satu job.
+
+Pekerjaan CPU murni Python (openpyxl) tidak bisa paralel di thread karena GIL;
+`pool_proses` membuat pool proses untuk satu pekerjaan (opt-in lewat JOB_PROSES > 1).
+
+Progres dilaporkan dari dalam fungsi job lewat `rencana`, `tahap` dan
+`laporkan` (per file / per sheet). Di luar job ketiganya tidak melakukan apa-apa,
+seperti perf.stage tanpa profiler aktif.
+"""
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import perf
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Jumlah proses untuk pekerjaan paralel di dalam job (ekspor per checkpoint); default 1 = serial.
+# Worker 'spawn' mengimpor ulang __main__, dan di server Streamlit itu skrip aplikasi
+# (dijalankan sebagai __mp_main__ tanpa sesi), jadi paralelisme proses hanya jika diminta
+JOB_PROSES = int(os.environ.get("JOB_PROSES", "1"))
+# Batas total perkiraan memori job yang berjalan bersamaan
+JOB_MEMORI_MB = float(os.environ.get("JOB_MEMORI_MB", "1024"))
+# Overhead tetap per job (interpreter, pandas, openpyxl) di atas perkiraan dari ukuran file
+JOB_MEMORI_DASAR_MB = 30
+# Kelipatan ukuran xlsx input, diukur dari kenaikan puncak RSS: file mingguan Juli/
+# ~15x, file bulanan ~65x (10 titik) sampai ~270x (100 titik, hasil estimasi
+# tumbuh dengan jumlah titik dari proporsi)
+FAKTOR_MINGGUAN = 20
+FAKTOR_BULANAN = 300
+# Perkiraan memori satu worker proses (interpreter + pandas + openpyxl), dihitung ke JOB_MEMORI_MB
+PROSES_MEMORI_MB = 150
+# Job selesai yang belum diambil sesi mana pun disimpan sekian detik agar sesi yang sedang rerun sempat mengambilnya
+JOB_TTL = float(os.environ.get("JOB_TTL", "3600"))
+POLL_DETIK = 0.5
+
+_aktif = ContextVar("job_aktif", default=None)
+_lock = threading.Lock()
+_jobs = {}
+# Job yang sudah diambil sesi: hidup selama masih dipegang session_state salah satu sesi
+_diambil = weakref.WeakValueDictionary()
+_per_sidik = {}
+_antrian = []
+_berjalan = set()
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+_proses_hidup = 0
+
+
+class Job:
+    """Satu pekerjaan di worker: status, progres (0-1), pesan terakhir dan hasilnya"""
+
+    def __init__(self, nama, app=None, memori_mb=JOB_MEMORI_DASAR_MB, sidik=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.nama = nama
+        self.memori_mb = memori_mb
+        self.sidik = sidik
+        self.pemakai = 1
+        self.status = "antri"
+        self.pesan = "Menunggu worker..."
+        self.hasil = None
+        self.error = None
+        self.dibuat = time.time()
+        self.selesai = None
+        self.profiler = perf.Profiler(f"{app}:job" if app else "job")
+        self._total = 1
+        self._tahap = 0
+        self._bagian = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in ("selesai", "gagal")
+
+    @property
+    def progres(self):
+        """Fraksi pekerjaan yang selesai: tahap penuh + bagian tahap yang sedang berjalan"""
+        if self.status == "selesai":
+            return 1.0
+        with self._lock:
+            return min(1.0, (self._tahap + self._bagian) / self._total)
+
+    def _jalankan(self, fungsi, args, kwargs):
+        token = _aktif.set(self)
+        perf.activate(self.profiler)
+        self.status = "berjalan"
+        self.pesan = "Mulai memproses..."
+        try:
+            self.hasil = fungsi(*args, **kwargs)
+            self.status = "selesai"
+            self.pesan = "Selesai"
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.status = "gagal"
+            self.pesan = traceback.format_exc(limit=3)
+        finally:
+            self.selesai = time.time()
+            perf.activate(None)
+            # Thread worker dipakai ulang: jangan biarkan job (dan hasilnya) tetap dirujuk
+            _aktif.reset(token)
+            self.profiler.write_log()
+            with _lock:
+                _berjalan.discard(self)
+                _jadwalkan()
+
+
+def _memori_berjalan():
+    return sum(job.memori_mb for job in _berjalan) + _proses_hidup * PROSES_MEMORI_MB
+
+
+def _jadwalkan():
+    """Pindahkan job dari kepala antrian ke worker selama worker dan memori masih cukup (dipanggil dengan _lock)"""
+    while _antrian and len(_berjalan) < JOB_WORKERS:
+        job, fungsi, args, kwargs = _antrian[0]
+        # Job pertama selalu boleh jalan walaupun perkiraannya melebihi batas;
+        # antrian tetap FIFO agar job besar tidak dilangkahi terus-menerus
+        if _berjalan and _memori_berjalan() + job.memori_mb > JOB_MEMORI_MB:
+            break
+        _antrian.pop(0)
+        _berjalan.add(job)
+        _executor.submit(job._jalankan, fungsi, args, kwargs)
+
+
+def _bersihkan():
+    """Buang job selesai yang tidak diambil selama JOB_TTL dan sidik job yang sudah tidak ada"""
+    batas = time.time() - JOB_TTL
+    with _lock:
+        for job in [j for j in _jobs.values() if j.done and j.selesai < batas]:
+            del _jobs[job.id]
+        for sidik in [s for s, job_id in _per_sidik.items() if _cari(job_id) is None]:
+            del _per_sidik[sidik]
+
+
+def _cari(job_id):
+    """Job menurut id, baik yang belum maupun sudah diambil sesi (dipanggil dengan _lock)"""
+    return _jobs.get(job_id) or _diambil.get(job_id)
+
+
+def _ambil(job):
+    """Pindahkan job selesai ke registri weakref; job gagal dilepas dari sidiknya agar bisa dikirim ulang"""
+    with _lock:
+        if _jobs.pop(job.id, None) is None:
+            return
+        if job.status == "selesai":
+            _diambil[job.id] = job
+        elif _per_sidik.get(job.sidik) == job.id:
+            del _per_sidik[job.sidik]
+
+
+def submit(nama, fungsi, *args, app=None, memori_mb=None, sidik=None, **kwargs):
+    """Fungsi untuk memasukkan fungsi(*args, **kwargs) ke antrian; kembalikan Job-nya.
+
+    Jika `sidik` diberikan dan job dengan sidik yang sama (dari sesi mana pun)
+    masih antri, berjalan atau sudah selesai dengan sukses, job itu yang
+    dikembalikan dan tidak ada pekerjaan baru.
+    """
+    _bersihkan()
+    if sidik is not None:
+        sidik = f"{app}:{fungsi.__qualname__}:{sidik}"
+    with _lock:
+        job = _cari(_per_sidik.get(sidik))
+        if job is not None and job.status != "gagal":
+            job.pemakai += 1
+            return job
+        job = Job(nama, app, memori_mb or JOB_MEMORI_DASAR_MB, sidik)
+        _jobs[job.id] = job
+        if sidik is not None:
+            _per_sidik[sidik] = job.id
+        _antrian.append((job, fungsi, args, kwargs))
+        _jadwalkan()
+    return job
+
+
+@contextmanager
+def pool_proses(n):
+    """Context manager untuk ProcessPoolExecutor 'spawn' dengan maksimal `n` worker selama blok.
+
+    Worker dihitung ke batas JOB_MEMORI_MB (PROSES_MEMORI_MB per worker)
+    bersama job yang berjalan; jumlahnya dikurangi agar muat di sisa batas.
+    Menghasilkan None jika kurang dari 2 worker yang muat atau `n` <= 1;
+    pemanggil lalu bekerja serial. Pool dimatikan saat blok selesai. Fungsi
+    yang dikirim harus fungsi tingkat modul yang bisa diimpor.
+    """
+    global _proses_hidup
+    with _lock:
+        sisa = int((JOB_MEMORI_MB - _memori_berjalan()) // PROSES_MEMORI_MB)
+        n = min(n, sisa)
+        if n > 1:
+            _proses_hidup += n
+    if n <= 1:
+        yield None
+        return
+    try:
+        with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn")) as pool:
+            yield pool
+    finally:
+        with _lock:
+            _proses_hidup -= n
+            _jadwalkan()
+
+
+def get(job_id):
+    with _lock:
+        return _cari(job_id)
+
+
+def posisi(job):
+    """Posisi job di antrian (1 = berikutnya), 0 jika sudah berjalan atau selesai"""
+    with _lock:
+        for i, (antri, *_) in enumerate(_antrian, start=1):
+            if antri is job:
+                return i
+    return 0
+
+
+def status_antrian():
+    """Fungsi untuk ringkasan antrian: jumlah job berjalan/antri dan memori yang terpakai"""
+    with _lock:
+        return {"berjalan": len(_berjalan), "antri": len(_antrian),
+                "memori_mb": _memori_berjalan(), "worker": JOB_WORKERS, "batas_mb": JOB_MEMORI_MB}
+
+
+def estimasi_memori_mb(files, faktor):
+    """Fungsi untuk perkiraan memori job dari ukuran file unggahan (unggahan.FileUnggahan).
+
+    `faktor` = kelipatan ukuran xlsx yang dipakai pandas selama diproses
+    (xlsx terkompresi, DataFrame hasil parse dan estimasi jauh lebih besar).
+    """
+    return JOB_MEMORI_DASAR_MB + faktor * sum(f.ukuran for f in files) / 1024 ** 2
+
+
+def sibuk():
+    """True jika masih ada job yang antri atau berjalan (dipakai harness benchmark)"""
+    with _lock:
+        return any(not job.done for job in _jobs.values())
+
+
+def rencana(n_tahap):
+    """Tetapkan jumlah tahap job aktif (dipanggil di awal fungsi job)"""
+    job = _aktif.get()
+    if job is not None:
+        with job._lock:
+            job._total = max(1, n_tahap)
+
+
+@contextmanager
+def tahap(pesan):
+    """Context manager untuk satu tahap job aktif; progres naik satu tahap saat blok selesai"""
+    job = _aktif.get()
+    if job is None:
+        yield
+        return
+    with job._lock:
+        job._bagian = 0.0
+        job.pesan = pesan
+    try:
+        yield
+    finally:
+        with job._lock:
+            job._tahap += 1
+            job._bagian = 0.0
+
+
+def laporkan(i, n, pesan=None):
+    """Laporkan progres di dalam tahap yang sedang berjalan (mis. sheet ke-i dari n)"""
+    job = _aktif.get()
+    if job is None or n <= 0:
+        return
+    with job._lock:
+        job._bagian = min(1.0, i / n)
+        if pesan:
+            job.pesan = pesan
+
+
+def sidik_file(files, *ekstra):
+    """Fungsi untuk sidik (hash) file unggahan (nama + sha256 isinya) ditambah nilai lain"""
+    h = hashlib.sha1()
+    for f in files:
+        h.update(f.nama.encode())
+        h.update(f.sidik.encode())
+    for nilai in ekstra:
+        h.update(str(nilai).encode())
+    return h.hexdigest()
+
+
+def hasil_sesi(key, sidik, nama, fungsi, *args, app=None, memori_mb=None, **kwargs):
+    """Fungsi untuk mengambil hasil job milik sesi; kirim job baru jika input (sidik) berubah.
+
+    Mengembalikan hasil fungsi bila job sudah selesai. Selama job masih antri atau
+    berjalan ditampilkan posisi antrian / progress bar yang mem-poll status dan
+    None dikembalikan; saat job selesai seluruh halaman di-rerun sehingga
+    hasilnya ikut tampil. Job gagal menampilkan errornya dengan tombol
+    "Coba lagi" yang mengirim ulang job. Hasil job yang dipakai bersama sesi
+    lain tidak boleh diubah. Stage yang dicatat job ditambahkan ke profiler
+    aktif sesi di setiap rerun.
+    """
+    import streamlit as st
+
+    state = st.session_state.get(key)
+    if state is None or state["sidik"] != sidik:
+        # Job lama untuk input sebelumnya tetap jalan sampai selesai, hanya tidak lagi ditunggu
+        job = submit(nama, fungsi, *args, app=app, memori_mb=memori_mb, sidik=sidik, **kwargs)
+        state = {"sidik": sidik, "job": job}
+        st.session_state[key] = state
+
+    job = state["job"]
+    if not job.done:
+        _progres(job)
+        return None
+    _ambil(job)
+
+    # Stage parse/olah/estimasi tercatat di profiler job; tampilkan juga di panel Performa sesi
+    profiler = perf.current()
+    if profiler is not None:
+        profiler.gabung(job.profiler, f"job: {nama}")
+
+    if job.status == "gagal":
+        st.error(f"❌ {nama} gagal: {job.error}")
+        if st.button("🔁 Coba lagi", key=f"_ulang_{key}"):
+            del st.session_state[key]
+            st.rerun()
+        return None
+    return job.hasil
+
+
+def _progres(job):
+    import streamlit as st
+
+    @st.fragment(run_every=POLL_DETIK)
+    def progres_job():
+        if job.done:
+            st.rerun()
+        urutan = posisi(job)
+        if urutan:
+            antrian = status_antrian()
+            st.progress(0.0, text=f"⏳ {job.nama}: antrian ke-{urutan}")
+            st.caption(
+                f"{antrian['berjalan']}/{antrian['worker']} worker sibuk · "
+                f"memori {antrian['memori_mb']:.0f}/{antrian['batas_mb']:.0f} MB · "
+                f"job ini ~{job.memori_mb:.0f} MB"
+            )
+        else:
+            st.progress(job.progres, text=f"🔄 {job.nama}: {job.pesan}")
+            bersama = f" · dipakai {job.pemakai} sesi" if job.pemakai > 1 else ""
+            st.caption(f"Job {job.id} · {job.status} · {time.time() - job.dibuat:.0f} s{bersama}")
+
+    progres_job()
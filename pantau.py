@@ -0,0 +1,184 @@
+"""Mode pantau: file lapangan baru di folder data langsung diproses tanpa unggah manual.
+
+Ekspor lapangan masuk ke folder bulan (mis. Juli/) sebagai "tanggal N bulan.xlsx"
+dan "Data Volume Lalu Lintas Bulan.xlsx". `Pemantau` memindai folder data setiap
+PANTAU_INTERVAL detik (mtime dan ukuran file, tanpa dependensi tambahan) dan
+menunggu sampai file baru/berubah tidak berubah lagi selama PANTAU_DEBOUNCE
+detik, agar file yang masih disalin tidak dibaca setengah jadi. Folder bulan
+yang siap diproses lewat alur dag_estimasi; tahap yang inputnya tidak berubah
+dilewati (artefak), jadi satu file harian baru hanya memproses file itu dan
+tahap hilirnya.
+
+Hasilnya ditulis atomik sebagai "hasil rekap <Bulan>.parquet" di folder
+dashboard. Dashboard membandingkan versi data (rekap_store.data_version) secara
+berkala dan memuat ulang sendiri jika ada file rekap baru/berubah.
+
+Contoh:
+    python pantau.py /data/lapangan                        # hasil ke folder kerja (folder dashboard)
+    python pantau.py /data/lapangan --output /srv/dashboard
+    python pantau.py Juli --sekali                         # proses sekali lalu keluar
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import artefak
+import dag_estimasi
+
+PANTAU_INTERVAL = float(os.environ.get("PANTAU_INTERVAL", "2"))
+PANTAU_DEBOUNCE = float(os.environ.get("PANTAU_DEBOUNCE", "3"))
+NAMA_REKAP = "hasil rekap {bulan}.parquet"
+
+
+def _file_lapangan(nama):
+    nama = nama.lower()
+    return (
+        nama.endswith(".xlsx")
+        and not nama.startswith("~$")  # file lock Excel yang sedang dibuka
+        and (nama.startswith("tanggal") or nama.startswith("data volume lalu lintas"))
+    )
+
+
+def pindai(data_dir):
+    """Fungsi untuk {path: (mtime_ns, ukuran)} semua file lapangan di bawah data_dir"""
+    tanda = {}
+    for root, dirs, files in os.walk(data_dir):
+        # Folder artefak dan folder tersembunyi tidak berisi file lapangan
+        dirs[:] = [d for d in dirs if d != "artefak" and not d.startswith(".")]
+        for nama in files:
+            if not _file_lapangan(nama):
+                continue
+            path = os.path.join(root, nama)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            tanda[path] = (st.st_mtime_ns, st.st_size)
+    return tanda
+
+
+def tulis_atomik(df, path):
+    """Fungsi untuk menulis DataFrame ke Parquet lewat file sementara, agar dashboard tidak membaca file setengah jadi"""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, sementara = tempfile.mkstemp(dir=folder, suffix=".part")
+    os.close(fd)
+    try:
+        df.to_parquet(sementara, index=False)
+        os.replace(sementara, path)
+    except BaseException:
+        os.remove(sementara)
+        raise
+
+
+class Pemantau:
+    """Memindai folder data dan meng-ingest folder bulan yang file lapangannya baru/berubah"""
+
+    def __init__(self, data_dir, output_dir=".", debounce=PANTAU_DEBOUNCE, log=print):
+        self.data_dir = data_dir
+        self.output_dir = output_dir
+        self.debounce = debounce
+        self.log = log
+        # path -> (tanda, waktu tanda itu pertama terlihat)
+        self._terlihat = {}
+        # path -> tanda saat terakhir di-ingest
+        self._diproses = {}
+
+    def periksa(self, sekarang=None):
+        """Fungsi untuk daftar folder bulan yang siap di-ingest.
+
+        Folder siap jika ada file yang belum di-ingest dengan tanda sekarang,
+        dan semua file seperti itu di folder tersebut sudah stabil selama
+        `debounce` detik.
+        """
+        sekarang = time.monotonic() if sekarang is None else sekarang
+        tanda = pindai(self.data_dir)
+        for path in set(self._terlihat) - set(tanda):
+            del self._terlihat[path]
+
+        siap, menunggu = set(), set()
+        for path, t in tanda.items():
+            if path not in self._terlihat or self._terlihat[path][0] != t:
+                self._terlihat[path] = (t, sekarang)
+            if self._diproses.get(path) == t:
+                continue
+            folder = os.path.dirname(path)
+            if sekarang - self._terlihat[path][1] >= self.debounce:
+                siap.add(folder)
+            else:
+                menunggu.add(folder)
+        return sorted(siap - menunggu)
+
+    def _tandai(self, folder):
+        for path, (t, _) in self._terlihat.items():
+            if os.path.dirname(path) == folder:
+                self._diproses[path] = t
+
+    def ingest(self, folder):
+        """Fungsi untuk memproses satu folder bulan; kembalikan path rekap yang ditulis (None jika tidak ada)"""
+        files_minggu, file_bulanan, bulan_nama = dag_estimasi.cari_file(folder)
+        if not files_minggu or file_bulanan is None:
+            self.log(f"⏳ {folder}: menunggu file harian dan file bulanan lengkap")
+            self._tandai(folder)
+            return None
+
+        sheet_warnings = []
+        daftar = dag_estimasi.susun(files_minggu, file_bulanan, bulan_nama, sheet_warnings=sheet_warnings)
+        try:
+            hasil, laporan = artefak.jalankan(daftar, folder=os.path.join(folder, "artefak"))
+        except Exception as e:
+            # Dicoba lagi setelah salah satu file di folder ini berubah
+            self.log(f"❌ {folder}: {e}")
+            self._tandai(folder)
+            return None
+        self._tandai(folder)
+
+        for pesan in sheet_warnings:
+            self.log(f"⚠️  {pesan}")
+        dihitung = [baris["tahap"] for baris in laporan if baris["status"] == "dihitung"]
+        path = os.path.join(self.output_dir, NAMA_REKAP.format(bulan=bulan_nama.title()))
+        if not dihitung and os.path.exists(path):
+            self.log(f"✔️  {folder}: tidak ada perubahan data")
+            return None
+
+        tulis_atomik(hasil[f"estimasi_{bulan_nama}"], path)
+        self.log(f"✅ {folder}: {len(dihitung)} tahap dihitung, {len(laporan) - len(dihitung)} dilewati ➜ {path}")
+        return path
+
+    def sekali(self):
+        """Fungsi untuk satu putaran pindai + ingest; kembalikan path rekap yang ditulis"""
+        ditulis = []
+        for folder in self.periksa():
+            path = self.ingest(folder)
+            if path:
+                ditulis.append(path)
+        return ditulis
+
+    def jalan(self, interval=PANTAU_INTERVAL):
+        """Fungsi untuk memantau terus-menerus sampai dihentikan (Ctrl+C)"""
+        self.log(f"👀 Memantau {self.data_dir} setiap {interval:g} s (debounce {self.debounce:g} s)")
+        while True:
+            self.sekali()
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pantau folder data dan proses file lapangan baru secara otomatis")
+    parser.add_argument("data_dir", help="folder data berisi folder bulan (mis. Juli/) atau satu folder bulan")
+    parser.add_argument("--output", default=".", help="folder 'hasil rekap *.parquet' yang dibaca dashboard")
+    parser.add_argument("--interval", type=float, default=PANTAU_INTERVAL)
+    parser.add_argument("--debounce", type=float, default=PANTAU_DEBOUNCE)
+    parser.add_argument("--sekali", action="store_true", help="proses semua file sekali (tanpa debounce) lalu keluar")
+    args = parser.parse_args()
+
+    if args.sekali:
+        Pemantau(args.data_dir, args.output, debounce=0).sekali()
+        return
+    try:
+        Pemantau(args.data_dir, args.output, debounce=args.debounce).jalan(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: tidak ada modul resource
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PERF_LOG_PATH = os.environ.get("PERF_LOG_PATH", "perf_log.jsonl")
+# tracemalloc memberi puncak memori per stage yang akurat tetapi memperlambat run
+# beberapa kali lipat; tanpa itu dipakai kenaikan puncak RSS proses (lebih kasar, murah)
+PERF_TRACEMALLOC = os.environ.get("PERF_TRACEMALLOC", "0") == "1"
+
+_aktif = ContextVar("perf_profiler", default=None)
+_trace_lock = threading.Lock()
+_trace_users = 0
+
+
+def _trace_start():
+    """Nyalakan tracemalloc selama ada stage yang berjalan (dihitung antar thread)"""
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _trace_users += 1
+
+
+def _rss_peak():
+    """Puncak RSS proses dalam byte, None jika tidak bisa diukur di platform ini.
+
+    POSIX: ru_maxrss (KB di Linux). Tanpa resource (Windows) dipakai puncak
+    working set dari psutil bila terpasang.
+    """
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+
+def _trace_stop():
+    global _trace_users
+    with _trace_lock:
+        _trace_users -= 1
+        if _trace_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class Profiler:
+    """Pencatat waktu, puncak memori dan jumlah baris per stage dalam satu run aplikasi"""
+
+    def __init__(self, app):
+        self.app = app
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = datetime.now()
+        self.records = []
+        self._stack = []
+        self._gabungan = set()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Context manager untuk mengukur satu stage; isi rec["rows"] di dalam blok bila perlu"""
+        if not PERF_TRACEMALLOC:
+            with self._stage_rss(name, rows) as rec:
+                yield rec
+            return
+
+        rec = {"stage": name, "rows": rows}
+        _trace_start()
+        if self._stack:
+            # Simpan puncak stage induk sebelum peak di-reset untuk stage anak
+            parent = self._stack[-1]
+            parent["_peak"] = max(parent["_peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        rec["_base"] = tracemalloc.get_traced_memory()[0]
+        rec["_peak"] = 0
+        self._stack.append(rec)
+        mulai = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["wall_ms"] = (time.perf_counter() - mulai) * 1000
+            peak = tracemalloc.get_traced_memory()[1]
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+            rec["peak_mb"] = max(0, max(rec.pop("_peak"), peak) - rec.pop("_base")) / 1024 ** 2
+            rec["depth"] = len(self._stack)
+            self.records.append(rec)
+            _trace_stop()
+
+    @contextmanager
+    def _stage_rss(self, name, rows=None):
+        """Varian murah: peak_mb = kenaikan puncak RSS proses selama stage"""
+        rec = {"stage": name, "rows": rows}
+        awal = _rss_peak()
+        self._stack.append(rec)
+        mulai = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["wall_ms"] = (time.perf_counter() - mulai) * 1000
+            self._stack.pop()
+            akhir = _rss_peak()
+            rec["peak_mb"] = None if awal is None or akhir is None else (akhir - awal) / 1024 ** 2
+            rec["depth"] = len(self._stack)
+            self.records.append(rec)
+
+    def gabung(self, profiler, sumber):
+        """Tambahkan stage profiler lain (mis. milik job latar belakang) sekali saja, ditandai `sumber`"""
+        if profiler is None or profiler.run_id in self._gabungan:
+            return
+        self._gabungan.add(profiler.run_id)
+        self.records.extend({**rec, "sumber": sumber} for rec in profiler.records)
+
+    def to_frame(self):
+        """Fungsi untuk tabel semua stage yang tercatat (sumber "sesi" = thread skrip)"""
+        df = pd.DataFrame(self.records, columns=["stage", "sumber", "depth", "wall_ms", "peak_mb", "rows"])
+        df["sumber"] = df["sumber"].fillna("sesi")
+        df["peak_mb"] = pd.to_numeric(df["peak_mb"])
+        return df
+
+    def summary(self):
+        """Fungsi untuk ringkasan per nama stage (stage yang berulang dijumlahkan)"""
+        df = self.to_frame()
+        df["kelompok"] = df["stage"].str.split(":").str[0]
+        return (
+            df.groupby("kelompok", sort=False)
+            .agg(jumlah=("stage", "size"), total_ms=("wall_ms", "sum"),
+                 maks_ms=("wall_ms", "max"), peak_mb=("peak_mb", "max"), rows=("rows", "sum"))
+            .reset_index()
+        )
+
+    def write_log(self, path=None):
+        """Fungsi untuk menambahkan hasil run ke log JSON (satu baris per run).
+
+        Stage hasil `gabung` tidak ikut; profiler asalnya menulis log sendiri.
+        """
+        records = [rec for rec in self.records if "sumber" not in rec]
+        if not records:
+            return
+        entry = {
+            "run_id": self.run_id,
+            "app": self.app,
+            "started": self.started.isoformat(timespec="seconds"),
+            "memori": "tracemalloc" if PERF_TRACEMALLOC else "rss",
+            "stages": [
+                {k: (None if pd.isna(v) else v) for k, v in rec.items()}
+                for rec in records
+            ],
+        }
+        with open(path or PERF_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+
+def activate(profiler):
+    """Jadikan profiler aktif untuk run (thread) saat ini"""
+    _aktif.set(profiler)
+    return profiler
+
+
+def current():
+    return _aktif.get()
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Ukur stage di profiler aktif; tanpa profiler aktif blok tetap jalan tanpa pencatatan"""
+    profiler = _aktif.get()
+    if profiler is None:
+        yield {"stage": name, "rows": rows}
+        return
+    with profiler.stage(name, rows) as rec:
+        yield rec
+
+
+def render_panel(profiler):
+    """Tampilkan panel 'Performa' di Streamlit.
+
+    Tidak menulis log: panel dirender di setiap rerun widget, sedangkan log
+    ditulis sekali per job atau run pipeline yang selesai (jobs, ekspor, benchmark).
+    """
+    import streamlit as st
+
+    if profiler is None or not profiler.records:
+        return
+
+    df_stage = profiler.to_frame()
+    with st.expander("⏱️ Performa", expanded=False):
+        top = df_stage[df_stage["depth"] == 0]
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Waktu", f"{top['wall_ms'].sum() / 1000:.2f} s")
+        with col2:
+            st.metric(
+                "Puncak Memori" if PERF_TRACEMALLOC else "Kenaikan Puncak RSS",
+                f"{df_stage['peak_mb'].max():.1f} MB" if df_stage["peak_mb"].notna().any() else "n/a",
+            )
+        with col3:
+            st.metric("Jumlah Stage", len(df_stage))
+        st.subheader("Ringkasan per Stage")
+        st.dataframe(profiler.summary().round(2), use_container_width=True, hide_index=True)
+        st.subheader("Detail")
+        st.dataframe(df_stage.round(2), use_container_width=True, hide_index=True)
+        mode = "tracemalloc" if PERF_TRACEMALLOC else "RSS proses (set PERF_TRACEMALLOC=1 untuk tracemalloc)"
+        st.caption(f"Stage job dicatat di {PERF_LOG_PATH} saat job selesai · memori: {mode}")
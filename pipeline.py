@@ -0,0 +1,868 @@
+import itertools
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import jobs
+import perf
+import registri
+import workbook_io
+
+TAHUN = 2025
+
+BULAN_MAP = {
+    "januari": 1, "februari": 2, "maret": 3, "april": 4,
+    "mei": 5, "juni": 6, "juli": 7, "agustus": 8,
+    "september": 9, "oktober": 10, "november": 11, "desember": 12
+}
+
+JAM_LIST = [f"{str(i).zfill(2)}:00:00" for i in range(24)]
+HARI_LIST = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Model proporsi per jam: proporsi[hari, source, jenis, jam] (array float64,
+# urutan sumbu sesuai HARI_LIST, `source`, `jenis`, JAM_LIST) dan
+# ada[hari, source, jenis] = kombinasi muncul di data sampel
+ProporsiJam = namedtuple("ProporsiJam", ["source", "jenis", "proporsi", "ada"])
+
+# Jumlah replikasi bootstrap selang kepercayaan, dihitung per blok agar memori tetap kecil
+BOOTSTRAP_REPLIKASI = 2000
+BLOK_REPLIKASI = 250
+
+# Titik checkpoint dan peta jenis kendaraan dari file registri (registri.json).
+# Konstanta dict/list di bawah dipertahankan untuk kode yang masih membacanya.
+REGISTRI = registri.muat()
+NAMA_CHECKPOINT = REGISTRI.nama_checkpoint
+JENIS_MAP = REGISTRI.jenis.sebagai_dict()
+KETERANGAN_MAP = REGISTRI.keterangan.sebagai_dict()
+JENIS_MAP_BULANAN = REGISTRI.jenis_bulanan.sebagai_dict()
+
+_POLA_TANGGAL_FILE = re.compile(
+    r"(\d{1,2})[\s\-_]*(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)",
+    re.IGNORECASE,
+)
+_POLA_BULAN = re.compile(
+    r"(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)",
+    re.IGNORECASE,
+)
+
+
+def _peta(peta, bawaan):
+    """Fungsi untuk Pemetaan dari argumen dict (jika diberikan) atau peta registri yang sudah dikompilasi"""
+    return registri.pemetaan(peta) if peta else bawaan
+
+
+def normalisasi_jenis(df, peta, peringatan=None, sumber="", kolom_angka=None):
+    """Fungsi untuk mengubah label 'Jenis Kendaraan' mentah menjadi kategori berkode (REGISTRI.jenis_dtype).
+
+    Dilakukan sekali saat ingest untuk data mingguan maupun bulanan, sehingga
+    groupby dan merge di hilir berjalan di atas kode integer kecil. Baris data
+    dengan label yang tidak ada di peta tetap dihitung sebagai "Unknown" dan
+    labelnya dilaporkan ke `peringatan`. Baris data = baris dengan nilai bukan 0
+    di `kolom_angka` (semua baris jika tidak diberikan); baris tanpa peta yang
+    kosong (sisa blok lain di sheet, mis. nomor urut) dibuang tanpa peringatan.
+    Kolom yang sudah berkode dikembalikan apa adanya.
+    """
+    if isinstance(df["Jenis Kendaraan"].dtype, pd.CategoricalDtype):
+        return df
+    jenis, _ = peta.kategorikan(df["Jenis Kendaraan"], REGISTRI.jenis_dtype)
+    if not jenis.hasnans:
+        return df.assign(**{"Jenis Kendaraan": jenis})
+
+    tanpa_peta = jenis.isna().to_numpy()
+    berdata = blok_angka(df, kolom_angka).any(axis=1) if kolom_angka else np.ones(len(df), dtype=bool)
+    dihitung = tanpa_peta & berdata
+    if dihitung.any():
+        if "Unknown" not in jenis.cat.categories:
+            jenis = jenis.cat.set_categories(sorted([*jenis.cat.categories, "Unknown"]))
+        jenis = jenis.mask(pd.Series(dihitung, index=jenis.index), "Unknown")
+        if peringatan is not None:
+            label = [str(v).strip() for v in df["Jenis Kendaraan"].to_numpy()[dihitung]]
+            label = list(dict.fromkeys(label))
+            contoh = ", ".join(label[:10]) + (f", +{len(label) - 10} lainnya" if len(label) > 10 else "")
+            peringatan.append(f"Jenis kendaraan tidak dikenal di {sumber or 'data'} dihitung sebagai Unknown: {contoh}")
+    df = df.assign(**{"Jenis Kendaraan": jenis})
+    return df[jenis.notna()] if jenis.hasnans else df
+
+
+def blok_angka(df, kolom):
+    """Fungsi untuk mengonversi blok kolom (mis. 24 kolom jam) menjadi angka dalam satu pass.
+
+    Setara `pd.to_numeric(df[col], errors='coerce').fillna(0)` per kolom, tetapi
+    seluruh blok ditulis ke satu array 2D yang dialokasikan sekali. Mengembalikan
+    array int64 jika semua nilai bulat (isi sheet biasanya hitungan), selain itu float64.
+    """
+    blok = df[kolom]
+    hasil = np.empty((len(blok), len(kolom)), dtype=np.float64)
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in blok.dtypes):
+        hasil[...] = blok.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        nilai = blok.to_numpy(dtype=object)
+        try:
+            # Sel berisi int/float/None/teks angka: dikonversi langsung oleh NumPy
+            hasil[...] = nilai
+        except (TypeError, ValueError):
+            # Ada teks bukan angka ("-", "n/a"): sel teks saja yang lewat to_numeric
+            datar, keluar = nilai.reshape(-1), hasil.reshape(-1)
+            teks = np.fromiter((isinstance(v, str) for v in datar), dtype=bool, count=datar.size)
+            lain = datar.copy()
+            lain[teks] = None
+            try:
+                keluar[:] = lain
+            except (TypeError, ValueError):
+                keluar[:] = pd.to_numeric(lain, errors="coerce")
+            keluar[teks] = pd.to_numeric(datar[teks], errors="coerce")
+    hasil[np.isnan(hasil)] = 0
+    if np.isfinite(hasil).all() and (np.mod(hasil, 1) == 0).all():
+        return hasil.astype(np.int64)
+    return hasil
+
+
+def clean_sheet_advanced(df):
+    """Fungsi untuk cleaning sheet dengan aturan:
+    1. Hapus 3 baris pertama
+    2. Baris pertama setelah hapus 3 baris = header kosong, isi dengan 'No' dan 'Jenis Kendaraan'
+    3. Hapus dari baris 'Vehicle Type' sampai bawah
+    """
+    with perf.stage("clean_sheet_advanced") as rec:
+        df_cleaned = df.iloc[3:].copy().reset_index(drop=True)
+
+        vehicle_type_row = None
+        for idx, row in df_cleaned.iterrows():
+            for col in df_cleaned.columns:
+                if 'vehicle type' in str(row[col]).strip().lower():
+                    vehicle_type_row = idx
+                    break
+            if vehicle_type_row is not None:
+                break
+
+        if vehicle_type_row is not None:
+            df_cleaned = df_cleaned.iloc[:vehicle_type_row].reset_index(drop=True)
+
+        if len(df_cleaned) > 0 and len(df_cleaned.columns) >= 2:
+            df_cleaned.iloc[0, 0] = 'No'
+            df_cleaned.iloc[0, 1] = 'Jenis Kendaraan'
+
+        rec["rows"] = len(df_cleaned)
+        return df_cleaned
+
+
+def dedup_columns(cols):
+    """Fungsi untuk rename header duplikat"""
+    counts = {}
+    new_cols = []
+    for col in cols:
+        if col not in counts:
+            counts[col] = 1
+            new_cols.append(col)
+        else:
+            counts[col] += 1
+            new_cols.append(f"{col}.{counts[col]}")
+    return new_cols
+
+
+def tanggal_dari_nama_file(nama_file):
+    """Fungsi untuk mengambil (tanggal, nama bulan, nomor bulan) dari nama file mingguan, None jika tidak sesuai"""
+    match = _POLA_TANGGAL_FILE.search(nama_file)
+    if not match:
+        return None
+    bulan_str = match.group(2).lower()
+    return int(match.group(1)), bulan_str, BULAN_MAP[bulan_str]
+
+
+def bulan_dari_nama_file(nama_file, default="juli"):
+    """Fungsi untuk mendeteksi (nomor bulan, nama bulan) dari nama file bulanan"""
+    match = _POLA_BULAN.search(nama_file)
+    bulan_nama = match.group(1).lower() if match else default
+    return BULAN_MAP[bulan_nama], bulan_nama
+
+
+def _sheet_mingguan(df, sheet_name, nama_file, sheet_warnings):
+    """Fungsi untuk mengubah satu sheet checkpoint mentah menjadi tabel Jenis Kendaraan x jam"""
+    df_cleaned = clean_sheet_advanced(df)
+    if len(df_cleaned) <= 1:
+        sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} kosong setelah pembersihan")
+        return None
+
+    header_row = df_cleaned.iloc[0].tolist()
+    df_proper = pd.DataFrame(df_cleaned.iloc[1:].values, columns=header_row)
+
+    if 'Jenis Kendaraan' not in df_proper.columns:
+        sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} tidak memiliki kolom 'Jenis Kendaraan'")
+        return None
+
+    jam_cols = [col for col in df_proper.columns if ":" in str(col)]
+    if not jam_cols:
+        sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} tidak memiliki kolom jam")
+        return None
+
+    df_proper[jam_cols] = blok_angka(df_proper, jam_cols)
+
+    df_proper = df_proper[df_proper['Jenis Kendaraan'].notna()]
+    df_proper = df_proper[~df_proper['Jenis Kendaraan'].str.lower().str.contains('total|sum', na=False)]
+    return df_proper
+
+
+def parse_weekly_file(file, nama_file, sheet_warnings, nama_checkpoint=None, cek_nama_sheet=True, minggu_label=None):
+    """Fungsi untuk membaca satu file harian (satu sheet per checkpoint) menjadi data mingguan bersih.
+
+    Sheet dipetakan ke titik lewat namanya (registri.Registri.titik_sheet):
+    nama titik di nama sheet atau nomor di depannya ("3. 1 Juli" -> titik 3).
+    `nama_checkpoint` (daftar berurutan, nama ke-i = nomor i+1) menggantikan
+    titik dari registri. Sheet yang tidak cocok dengan titik mana pun diabaikan.
+    Jenis kendaraan dinormalisasi ke kategori berkode (`normalisasi_jenis`).
+    Peringatan per sheet ditambahkan ke `sheet_warnings`, sedangkan file yang
+    tidak bisa dipakai sama sekali menghasilkan ValueError.
+    """
+    reg = registri.dari_daftar(tuple(nama_checkpoint)) if nama_checkpoint else REGISTRI
+    nama_file = nama_file.lower()
+
+    with perf.stage(f"parse mingguan: {nama_file}") as rec:
+        info_tanggal = tanggal_dari_nama_file(nama_file)
+        if info_tanggal is None:
+            raise ValueError(f"Nama file tidak sesuai: {nama_file}. Gunakan format seperti 'tanggal 1 juli.xlsx'.")
+        tanggal, bulan_str, bulan = info_tanggal
+        tanggal_str = f"{tanggal:02d}-{bulan:02d}-{TAHUN}"
+
+        xls = workbook_io.baca_semua(file)
+        df_list = []
+        for idx, (sheet_name, df) in enumerate(xls.items()):
+            jobs.laporkan(idx + 1, len(xls), f"{nama_file}: sheet {sheet_name}")
+            titik = reg.titik_sheet(sheet_name)
+            if titik is None:
+                sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} diabaikan (tidak cocok dengan titik di registri)")
+                continue
+            if cek_nama_sheet:
+                expected_sheet = f"{titik.nomor}. {tanggal} {bulan_str}"
+                if sheet_name.lower() != expected_sheet.lower():
+                    sheet_warnings.append(f"Sheet {sheet_name} di {nama_file} diabaikan (diharapkan {expected_sheet})")
+
+            df_proper = _sheet_mingguan(df, sheet_name, nama_file, sheet_warnings)
+            if df_proper is None:
+                continue
+
+            df_proper["Source"] = titik.nama
+            df_proper["Tanggal"] = tanggal_str
+            if minggu_label is not None:
+                df_proper["Minggu"] = minggu_label
+            df_list.append(df_proper)
+
+        if not df_list:
+            raise ValueError(f"Tidak ada data valid di {nama_file}")
+
+        df_final = pd.concat(df_list, ignore_index=True)
+        jam_cols = [col for col in df_final.columns if ":" in str(col)]
+        if not jam_cols:
+            raise ValueError(f"Tidak ditemukan kolom jam di {nama_file}")
+        # Hapus baris dengan semua jam = 0
+        df_final = df_final.loc[~(df_final[jam_cols] == 0).all(axis=1)].copy()
+        df_final = normalisasi_jenis(df_final, reg.jenis, sheet_warnings, nama_file, kolom_angka=jam_cols)
+        rec["rows"] = len(df_final)
+        return df_final
+
+
+def hitung_proporsi_mingguan(df_mingguan, jenis_map=None, keterangan_map=None):
+    """Fungsi untuk menghitung proporsi tiap titik per Hari x Jenis Kendaraan dari satu minggu data"""
+    with perf.stage("proporsi") as rec:
+        jam_cols = [col for col in df_mingguan.columns if ":" in str(col)]
+        df_mingguan = normalisasi_jenis(df_mingguan, _peta(jenis_map, REGISTRI.jenis), kolom_angka=jam_cols).copy()
+        df_mingguan["Keterangan"] = _peta(keterangan_map, REGISTRI.keterangan).petakan(df_mingguan["Source"])
+
+        kolom_awal = ["Source", "Jenis Kendaraan", "Tanggal", "Keterangan"]
+        df_mingguan[jam_cols] = blok_angka(df_mingguan, jam_cols)
+
+        df_grouped = df_mingguan.groupby(kolom_awal, as_index=False, observed=True)[jam_cols].sum()
+
+        df_grouped["Tanggal"] = pd.to_datetime(df_grouped["Tanggal"], format='mixed', dayfirst=True)
+        df_grouped["Hari"] = df_grouped["Tanggal"].dt.day_name()
+        df_grouped["Total"] = df_grouped[jam_cols].sum(axis=1)
+
+        grouped_proporsi = (
+            df_grouped.groupby(["Hari", "Source", "Jenis Kendaraan"], observed=True)["Total"].sum().reset_index()
+        )
+        total_per_jenis_per_hari = (
+            grouped_proporsi.groupby(["Hari", "Jenis Kendaraan"], observed=True)["Total"]
+            .sum().reset_index().rename(columns={"Total": "TotalJenis"})
+        )
+
+        df_proporsi = grouped_proporsi.merge(total_per_jenis_per_hari, on=["Hari", "Jenis Kendaraan"])
+        df_proporsi["Proporsi"] = df_proporsi["Total"] / df_proporsi["TotalJenis"]
+        df_proporsi["Proporsi"] = pd.to_numeric(df_proporsi["Proporsi"], errors='coerce').fillna(0)
+        df_proporsi["Proporsi (%)"] = (df_proporsi["Proporsi"] * 100).round(2)
+        rec["rows"] = len(df_proporsi)
+        return df_proporsi
+
+
+def gabung_mingguan(df_list, minggu_label, jenis_map=None, keterangan_map=None):
+    """Fungsi untuk menggabungkan file-file satu minggu dan menambahkan Keterangan serta Hari"""
+    with perf.stage(f"gabung {minggu_label}") as rec:
+        df_final = pd.concat(df_list, ignore_index=True)
+
+        # Jenis kendaraan sudah berkode jika berasal dari parse_weekly_file
+        jam_cols = [col for col in df_final.columns if ":" in str(col)]
+        df_final = normalisasi_jenis(df_final, _peta(jenis_map, REGISTRI.jenis), kolom_angka=jam_cols).copy()
+        df_final["Keterangan"] = _peta(keterangan_map, REGISTRI.keterangan).petakan(df_final["Source"])
+
+        # Konversi tanggal
+        df_final["Tanggal"] = pd.to_datetime(df_final["Tanggal"], format='mixed', dayfirst=True)
+        df_final["Hari"] = df_final["Tanggal"].dt.day_name()
+        rec["rows"] = len(df_final)
+        return df_final
+
+
+def hitung_proporsi_rata_rata(df_minggu_list):
+    """Fungsi untuk menghitung proporsi dari rata-rata beberapa minggu (hasil `gabung_mingguan`).
+
+    Mengembalikan (data gabungan semua minggu, tabel proporsi).
+    """
+    with perf.stage("proporsi") as rec:
+        df_gabungan = pd.concat(df_minggu_list, ignore_index=True)
+
+        # Identifikasi kolom jam
+        jam_cols = [col for col in df_gabungan.columns if ":" in str(col)]
+
+        # Hitung rata-rata per Hari + Jenis Kendaraan + Source
+        df_avg_hari = (
+            df_gabungan.groupby(["Hari", "Source", "Jenis Kendaraan", "Keterangan"], as_index=False, observed=True)
+            [jam_cols].mean()
+        )
+
+        # Tambahkan kolom Total per baris
+        df_avg_hari["Total"] = df_avg_hari[jam_cols].sum(axis=1)
+
+        # Hitung total per jenis kendaraan per hari
+        total_per_jenis_per_hari = (
+            df_avg_hari.groupby(["Hari", "Jenis Kendaraan"], observed=True)["Total"]
+            .sum().reset_index().rename(columns={"Total": "TotalJenis"})
+        )
+
+        # Gabungkan dan hitung proporsi
+        df_proporsi = df_avg_hari.merge(total_per_jenis_per_hari, on=["Hari", "Jenis Kendaraan"])
+        df_proporsi["Proporsi"] = df_proporsi["Total"] / df_proporsi["TotalJenis"]
+        df_proporsi["Proporsi (%)"] = (df_proporsi["Proporsi"] * 100).round(2)
+        rec["rows"] = len(df_proporsi)
+        return df_gabungan, df_proporsi
+
+
+def _sampel_per_hari(df_sampel):
+    """Fungsi untuk tensor data sampel per hari sampel.
+
+    Mengembalikan (jumlah[hari sampel, source, jenis, jam], banyak baris
+    [hari sampel, source, jenis], kode HARI_LIST per hari sampel, label Minggu
+    per hari sampel ("" jika tidak ada kolom Minggu), source, jenis).
+    Baris tanpa Keterangan (titik di luar registri) diabaikan seperti di
+    `hitung_proporsi_mingguan`; tanggal yang sama di dua minggu berbeda
+    (file ganda) tetap dihitung sebagai dua hari sampel.
+    """
+    if "Keterangan" in df_sampel.columns:
+        keterangan = df_sampel["Keterangan"]
+    else:
+        keterangan = REGISTRI.keterangan.petakan(df_sampel["Source"])
+    df = df_sampel[keterangan.notna().to_numpy() & df_sampel["Jenis Kendaraan"].notna().to_numpy()]
+
+    jam_cols = [col for col in df.columns if ":" in str(col)]
+    if len(jam_cols) != len(JAM_LIST):
+        raise ValueError(f"Data sampel memiliki {len(jam_cols)} kolom jam, diperlukan {len(JAM_LIST)}")
+
+    tanggal = pd.to_datetime(df["Tanggal"], format='mixed', dayfirst=True)
+    kunci_hari = [df["Minggu"], tanggal] if "Minggu" in df.columns else [tanggal]
+    kode_hari_sampel = pd.DataFrame(dict(enumerate(kunci_hari))).groupby(list(range(len(kunci_hari))), sort=True).ngroup()
+    kode_hari_sampel = kode_hari_sampel.to_numpy()
+    n_hari = int(kode_hari_sampel.max()) + 1 if len(df) else 0
+    hari = np.zeros(n_hari, dtype=np.intp)
+    hari[kode_hari_sampel] = pd.Index(HARI_LIST).get_indexer(tanggal.dt.day_name())
+    minggu = np.full(n_hari, "", dtype=object)
+    if "Minggu" in df.columns:
+        minggu[kode_hari_sampel] = df["Minggu"].to_numpy(dtype=object)
+
+    kode_source, source = pd.factorize(df["Source"], sort=True)
+    kode_jenis, jenis = pd.factorize(df["Jenis Kendaraan"], sort=True)
+    source, jenis = [str(v) for v in source], [str(v) for v in jenis]
+    bentuk = (n_hari, len(source), len(jenis))
+
+    # Jumlahkan baris sampel ke sel (hari sampel, source, jenis) x 24 jam
+    kode_sel = np.ravel_multi_index((kode_hari_sampel, kode_source, kode_jenis), bentuk)
+    jumlah = np.zeros((int(np.prod(bentuk)), len(JAM_LIST)))
+    agg = pd.DataFrame(blok_angka(df, jam_cols)).groupby(kode_sel).sum()
+    jumlah[agg.index.to_numpy()] = agg.to_numpy()
+    banyak = np.bincount(kode_sel, minlength=jumlah.shape[0])
+    return jumlah.reshape(bentuk + (len(JAM_LIST),)), banyak.reshape(bentuk), hari, minggu, source, jenis
+
+
+def _sampel_berbobot(bobot, jumlah, banyak, satu_hot_sampel, rata_rata):
+    """Fungsi untuk tensor sampel [replikasi/metode, hari, source, jenis, jam] dari bobot per hari sampel.
+
+    `rata_rata` (bool, atau array bool per baris `bobot`) membagi jumlah
+    berbobot dengan banyak baris berbobot (rata-rata baris seperti
+    `hitung_proporsi_rata_rata`); selain itu jumlah seperti `hitung_proporsi_mingguan`.
+    """
+    sampel = np.einsum("bd,dw,dsjh->bwsjh", bobot, satu_hot_sampel, jumlah, optimize=True)
+    rata_rata = np.broadcast_to(np.asarray(rata_rata, dtype=bool), (len(bobot),))
+    if rata_rata.any():
+        n = np.einsum("bd,dw,dsj->bwsj", bobot[rata_rata], satu_hot_sampel, banyak, optimize=True)[..., None]
+        sampel[rata_rata] = np.divide(sampel[rata_rata], n, out=np.zeros_like(n * sampel[rata_rata]), where=n > 0)
+    return sampel
+
+
+def _proporsi(sampel, per_jam):
+    """Fungsi untuk proporsi tiap source dari tensor sampel [..., hari, source, jenis, jam].
+
+    Sumbu depan (mis. replikasi bootstrap) ikut dihitung sekaligus. Jam tanpa
+    kendaraan di sampel memakai proporsi hariannya; jenis tanpa kendaraan sama
+    sekali berproporsi 0.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total_hari = np.einsum("...sjh->...sj", sampel)
+        proporsi_hari = np.nan_to_num(total_hari / np.einsum("...sj->...j", total_hari)[..., None, :])
+        if not per_jam:
+            return np.broadcast_to(proporsi_hari[..., None], sampel.shape).copy()
+        total_jam = np.einsum("...sjh->...jh", sampel)[..., None, :, :]
+        return np.where(total_jam > 0, sampel / total_jam, proporsi_hari[..., None])
+
+
+def hitung_proporsi_jam(df_sampel, agregasi="mean", per_jam=True):
+    """Fungsi untuk model proporsi per (Hari, jam, Source, Jenis Kendaraan) dari data sampel mingguan.
+
+    Proporsi tiap titik dihitung per jam, bukan dari satu Total harian, karena
+    pembagian antar titik pukul 07:00 dan 02:00 bisa sangat berbeda. Jam yang
+    tidak punya kendaraan sama sekali di sampel memakai proporsi hariannya.
+    `agregasi="mean"` merata-rata baris sampel per Hari seperti
+    `hitung_proporsi_rata_rata` (2 minggu), `"sum"` menjumlahkannya seperti
+    `hitung_proporsi_mingguan`. `per_jam=False` memberi proporsi harian yang sama
+    untuk ke-24 jam (setara model harian). Mengembalikan ProporsiJam.
+    """
+    with perf.stage("proporsi per jam") as rec:
+        jumlah, banyak, hari, _, source, jenis = _sampel_per_hari(df_sampel)
+        satu_hot = np.eye(len(HARI_LIST))[hari]
+        sampel = np.einsum("dw,dsjh->wsjh", satu_hot, jumlah)
+        banyak = np.einsum("dw,dsj->wsj", satu_hot, banyak)
+        if agregasi == "mean":
+            sampel[banyak > 0] /= banyak[banyak > 0, None]
+        rec["rows"] = int(np.count_nonzero(banyak))
+        return ProporsiJam(source, jenis, _proporsi(sampel, per_jam), banyak > 0)
+
+
+def _tensor_bulanan(df_bulanan, jenis):
+    """Fungsi untuk (tanggal, volume[tanggal, jenis, jam], ada[tanggal, jenis]) dari hasil `olah_bulanan`.
+
+    Jenis yang tidak ada di `jenis` (tidak ada di sampel) diabaikan.
+    """
+    df = df_bulanan[jenis.get_indexer(df_bulanan["Jenis Kendaraan"].astype(str)) >= 0]
+    tanggal_hari = df["Tanggal"].dt.normalize()
+    tanggal = pd.DatetimeIndex(tanggal_hari.unique()).sort_values()
+    kode_tanggal = tanggal.get_indexer(tanggal_hari)
+    kode_jenis = jenis.get_indexer(df["Jenis Kendaraan"].astype(str))
+
+    volume = np.zeros((len(tanggal), len(jenis), len(JAM_LIST)))
+    np.add.at(volume, (kode_tanggal, kode_jenis), blok_angka(df, JAM_LIST))
+    ada = np.zeros((len(tanggal), len(jenis)), dtype=bool)
+    ada[kode_tanggal, kode_jenis] = True
+    return tanggal, volume, ada
+
+
+def estimasi_volume_jam(df_bulanan, model, bulatkan=False):
+    """Fungsi untuk membagi volume bulanan ke tiap titik dengan model proporsi per jam (ProporsiJam).
+
+    Volume bulanan disusun menjadi tensor (tanggal, jenis, jam) lalu dikalikan
+    proporsi hari yang sesuai dalam satu einsum. Hasilnya berformat sama dengan
+    `estimasi_volume`: satu baris per Tanggal x Source x Jenis Kendaraan yang
+    ada di sampel, diurutkan per Tanggal dan Source, tanpa jenis Unknown.
+    """
+    with perf.stage("estimasi per jam") as rec:
+        jenis = pd.Index(model.jenis)
+        tanggal, volume, ada_bulanan = _tensor_bulanan(df_bulanan, jenis)
+
+        kode_hari = pd.Index(HARI_LIST).get_indexer(tanggal.day_name())
+        satu_hot = np.eye(len(HARI_LIST))[kode_hari]
+        estimasi = np.einsum("tw,wsjh,tjh->tsjh", satu_hot, model.proporsi, volume, optimize=True)
+
+        df_final = _baris_estimasi(
+            estimasi, model.ada[kode_hari] & ada_bulanan[:, None, :], tanggal, model.source, jenis, bulatkan
+        )
+        rec["rows"] = len(df_final)
+        return df_final
+
+
+def _baris_estimasi(estimasi, ada, tanggal, source, jenis, bulatkan):
+    """Fungsi untuk DataFrame berformat `estimasi_volume` dari tensor estimasi [tanggal, source, jenis, jam].
+
+    Satu baris per sel `ada` (kecuali jenis Unknown), urut Tanggal, Source, Jenis Kendaraan.
+    """
+    ada = ada & (jenis.str.lower() != "unknown")[None, None, :]
+    t, s, j = np.nonzero(ada)
+    nilai = estimasi[ada]
+    nilai = np.round(nilai).astype(int) if bulatkan else np.trunc(nilai)
+
+    df_final = pd.DataFrame(nilai, columns=pd.Index(JAM_LIST, name="Jam"))
+    df_final.insert(0, "Tanggal", tanggal.strftime("%d-%m-%Y").take(t))
+    df_final.insert(1, "Jenis Kendaraan", jenis.take(j))
+    df_final.insert(2, "Source", pd.Index(source).take(s))
+    return df_final
+
+
+def bootstrap_estimasi(df_sampel, df_bulanan, agregasi="mean", per_jam=False, replikasi=BOOTSTRAP_REPLIKASI,
+                       tingkat=0.95, seed=0):
+    """Fungsi untuk selang kepercayaan bootstrap total harian estimasi per Source.
+
+    Setiap replikasi menarik ulang hari sampel per hari dalam minggu (dengan
+    pengembalian; mis. 2 hari Senin dari Minggu 1 & 3), menghitung ulang
+    proporsi, lalu membagi volume bulanan. Semua replikasi dihitung sebagai
+    operasi array bertumpuk (per blok BLOK_REPLIKASI replikasi untuk membatasi
+    memori), bukan loop per replikasi. Hari dalam minggu yang hanya punya satu
+    hari sampel tidak menambah ketidakpastian (pitanya selebar nol).
+    Mengembalikan DataFrame Tanggal, Source, Bawah, Atas (batas persentil
+    `tingkat`, total semua jenis kecuali Unknown).
+    """
+    with perf.stage("bootstrap") as rec:
+        jumlah, banyak, hari, _, source, jenis = _sampel_per_hari(df_sampel)
+        jenis = pd.Index(jenis)
+        tanggal, volume, _ = _tensor_bulanan(df_bulanan, jenis)
+        volume[:, jenis.str.lower() == "unknown"] = 0
+        if not per_jam:
+            # Model harian: cukup total per hari, sumbu jam dipertahankan dengan panjang 1
+            jumlah, volume = jumlah.sum(axis=-1, keepdims=True), volume.sum(axis=-1, keepdims=True)
+
+        # Bobot replikasi: berapa kali setiap hari sampel terambil
+        rng = np.random.default_rng(seed)
+        bobot = np.zeros((replikasi, len(hari)))
+        for w in range(len(HARI_LIST)):
+            idx = np.flatnonzero(hari == w)
+            if idx.size:
+                bobot[:, idx] = rng.multinomial(idx.size, np.full(idx.size, 1 / idx.size), size=replikasi)
+
+        satu_hot_sampel = np.eye(len(HARI_LIST))[hari]
+        satu_hot_tanggal = np.eye(len(HARI_LIST))[pd.Index(HARI_LIST).get_indexer(tanggal.day_name())]
+        estimasi = np.empty((replikasi, len(tanggal), len(source)))
+        for awal in range(0, replikasi, BLOK_REPLIKASI):
+            sampel = _sampel_berbobot(
+                bobot[awal:awal + BLOK_REPLIKASI], jumlah, banyak, satu_hot_sampel, agregasi == "mean"
+            )
+            estimasi[awal:awal + BLOK_REPLIKASI] = np.einsum(
+                "tw,tjh,bwsjh->bts", satu_hot_tanggal, volume, _proporsi(sampel, per_jam), optimize=True
+            )
+
+        bawah, atas = np.percentile(estimasi, [(1 - tingkat) / 2 * 100, (1 + tingkat) / 2 * 100], axis=0)
+        t, s = np.indices(bawah.shape).reshape(2, -1)
+        df_pita = pd.DataFrame({
+            "Tanggal": tanggal.strftime("%d-%m-%Y").take(t),
+            "Source": pd.Index(source).take(s),
+            "Bawah": np.round(bawah.ravel()).astype(np.int64),
+            "Atas": np.round(atas.ravel()).astype(np.int64),
+        })
+        rec["rows"] = len(df_pita)
+        return df_pita
+
+
+def estimasi_banyak_metode(df_sampel, df_bulanan, bobot=None, bulatkan=True, per_jam=False):
+    """Fungsi untuk estimasi beberapa metode proporsi sekaligus dari satu data sampel dan satu data bulanan.
+
+    Metode: setiap minggu sendiri (baris dijumlahkan seperti aplikasi 1 minggu),
+    "rata-rata" semua minggu (seperti aplikasi 2 minggu) dan "berbobot", rata-rata
+    dengan `bobot` {label minggu: bobot} (default 1, 2, ... menurut urutan minggu,
+    minggu terakhir paling berat). Setiap metode adalah bobot per hari sampel,
+    sehingga proporsi dan estimasi semua metode dihitung dalam satu einsum.
+    `df_sampel` = gabungan hasil `gabung_mingguan` (kolom Minggu). Mengembalikan
+    {nama metode: DataFrame berformat `estimasi_volume`}.
+    """
+    with perf.stage("estimasi banyak metode") as rec:
+        jumlah, banyak, hari, minggu, source, jenis = _sampel_per_hari(df_sampel)
+        jenis = pd.Index(jenis)
+        label = sorted(set(minggu))
+        bobot = bobot or {m: i + 1 for i, m in enumerate(label)}
+        metode = {m: ((minggu == m).astype(np.float64), False) for m in label}
+        metode["rata-rata"] = (np.ones(len(minggu)), True)
+        metode["berbobot"] = (np.array([float(bobot.get(m, 0)) for m in minggu]), True)
+        bobot_hari = np.stack([b for b, _ in metode.values()])
+        rata_rata = np.array([r for _, r in metode.values()])
+
+        satu_hot_sampel = np.eye(len(HARI_LIST))[hari]
+        sampel = _sampel_berbobot(bobot_hari, jumlah, banyak, satu_hot_sampel, rata_rata)
+        ada_sampel = np.einsum("md,dw,dsj->mwsj", bobot_hari, satu_hot_sampel, banyak, optimize=True) > 0
+
+        tanggal, volume, ada_bulanan = _tensor_bulanan(df_bulanan, jenis)
+        kode_hari = pd.Index(HARI_LIST).get_indexer(tanggal.day_name())
+        satu_hot_tanggal = np.eye(len(HARI_LIST))[kode_hari]
+        estimasi = np.einsum("tw,mwsjh,tjh->mtsjh", satu_hot_tanggal, _proporsi(sampel, per_jam), volume, optimize=True)
+
+        hasil = {
+            nama: _baris_estimasi(estimasi[i], ada_sampel[i][kode_hari] & ada_bulanan[:, None, :],
+                                  tanggal, source, jenis, bulatkan)
+            for i, nama in enumerate(metode)
+        }
+        rec["rows"] = sum(len(df) for df in hasil.values())
+        return hasil
+
+
+def selisih_per_titik(hasil_metode, acuan="rata-rata"):
+    """Fungsi untuk tabel total bulanan per titik setiap metode dan selisihnya terhadap metode `acuan`.
+
+    Selisih persen titik yang total `acuan`-nya 0 dibiarkan kosong (NaN),
+    bukan inf, karena persentasenya tidak terdefinisi.
+    """
+    total = pd.DataFrame({
+        nama: df.groupby("Source")[JAM_LIST].sum().sum(axis=1) for nama, df in hasil_metode.items()
+    }).fillna(0)
+    total.index.name = "Source"
+    total.insert(0, "Keterangan", REGISTRI.keterangan.petakan(total.index.to_series()))
+    penyebut = total[acuan].replace(0, np.nan)
+    for nama in hasil_metode:
+        if nama != acuan:
+            total[f"Selisih {nama}"] = total[nama] - total[acuan]
+            total[f"Selisih {nama} (%)"] = (total[f"Selisih {nama}"] / penyebut * 100).round(2)
+    return total.reset_index()
+
+
+def baca_bulanan(file, nama_file):
+    """Fungsi untuk membaca semua sheet file bulanan"""
+    with perf.stage(f"baca bulanan: {nama_file}"):
+        return workbook_io.baca_semua(file)
+
+
+def _sheet_bulanan(sheet_name, df_raw, bulan, sheet_warnings):
+    """Fungsi untuk mengambil blok 'Jenis Kendaraan' dari satu sheet harian"""
+    try:
+        sheet_num = int(sheet_name)
+    except ValueError:
+        sheet_warnings.append(f"Sheet '{sheet_name}' diabaikan karena bukan angka")
+        return None
+    if sheet_num < 1 or sheet_num > 31:
+        sheet_warnings.append(f"Sheet '{sheet_name}' diabaikan karena bukan tanggal valid")
+        return None
+
+    tanggal_str = f"{sheet_num:02d}-{bulan:02d}-{TAHUN}"
+    try:
+        pd.to_datetime(tanggal_str, format='%d-%m-%Y')
+    except ValueError:
+        sheet_warnings.append(f"Sheet '{sheet_name}' menghasilkan tanggal tidak valid: {tanggal_str}")
+        return None
+
+    # Cari header "Jenis Kendaraan"
+    jenis_rows = df_raw[df_raw[0].astype(str).str.contains("Jenis Kendaraan", case=False, na=False)]
+    if jenis_rows.empty:
+        sheet_warnings.append(f"Sheet '{sheet_name}' tidak memiliki kolom 'Jenis Kendaraan'")
+        return None
+
+    start_idx = jenis_rows.index[0] + 1
+    header_row = df_raw.iloc[start_idx - 1].fillna("NA").astype(str)
+
+    # Handle duplikat header
+    if header_row.duplicated().any():
+        header_row = dedup_columns(header_row)
+
+    df_jenis = df_raw.iloc[start_idx:].copy()
+    df_jenis.columns = header_row
+
+    # Bersihkan data
+    mask_arah = df_jenis.apply(
+        lambda row: row.astype(str).str.contains(r"Arah|Keterangan|:", case=False, na=False).any(),
+        axis=1
+    )
+    df_jenis = df_jenis[~mask_arah]
+    df_jenis = df_jenis[df_jenis["Jenis Kendaraan"].notna()]
+    df_jenis = df_jenis[~df_jenis["Jenis Kendaraan"].astype(str).str.lower().str.contains("total|sum")]
+
+    df_jenis["Tanggal"] = tanggal_str
+    return df_jenis
+
+
+def parse_monthly(xls, bulan, sheet_warnings):
+    """Fungsi untuk mengambil data per jenis kendaraan dari setiap sheet tanggal (1-31)"""
+    list_df = []
+    for i, (sheet_name, df_raw) in enumerate(xls.items(), start=1):
+        jobs.laporkan(i, len(xls), f"sheet {sheet_name}")
+        with perf.stage(f"parse bulanan: sheet {sheet_name}") as rec:
+            try:
+                df_jenis = _sheet_bulanan(sheet_name, df_raw, bulan, sheet_warnings)
+            except Exception as e:
+                sheet_warnings.append(f"Error di sheet '{sheet_name}': {str(e)}")
+                continue
+            if df_jenis is not None:
+                list_df.append(df_jenis)
+                rec["rows"] = len(df_jenis)
+    return list_df
+
+
+def parse_bulanan_file(file, nama_file, bulan):
+    """Fungsi untuk membaca dan mem-parse file bulanan; kembalikan (list_df, peringatan per sheet)"""
+    sheet_warnings = []
+    xls = baca_bulanan(file, nama_file)
+    return parse_monthly(xls, bulan, sheet_warnings), sheet_warnings
+
+
+def olah_bulanan(list_df, jenis_map=None, peringatan=None):
+    """Fungsi untuk menggabungkan sheet harian menjadi total per Tanggal x Jenis Kendaraan x jam.
+
+    Label jenis berisi data yang tidak ada di peta bulanan dihitung sebagai Unknown
+    dan dilaporkan ke `peringatan` (jika diberikan).
+    """
+    with perf.stage("olah bulanan") as rec:
+        df_bulanan = pd.concat(list_df, ignore_index=True)
+
+        # Set nama kolom jam
+        columns = list(df_bulanan.columns)
+        if len(columns) < 25:
+            raise ValueError(f"File bulanan memiliki {len(columns)} kolom, minimal 25 kolom diperlukan.")
+        columns[1:25] = JAM_LIST
+        df_bulanan.columns = columns
+        groupby_cols = JAM_LIST.copy()
+        if 'Total' in df_bulanan.columns:
+            groupby_cols.append('Total')
+
+        # Konversi ke numerik (24 kolom jam + Total sekaligus)
+        df_bulanan[groupby_cols] = blok_angka(df_bulanan, groupby_cols)
+
+        # Normalisasi jenis kendaraan ke kategori berkode
+        df_bulanan = normalisasi_jenis(
+            df_bulanan, _peta(jenis_map, REGISTRI.jenis_bulanan), peringatan, "file bulanan", kolom_angka=JAM_LIST
+        ).copy()
+
+        # Groupby dan sum
+        df_bulanan = df_bulanan.groupby(['Tanggal', 'Jenis Kendaraan'], as_index=False, observed=True)[groupby_cols].sum()
+        df_bulanan = df_bulanan.sort_values(by=['Tanggal', 'Jenis Kendaraan']).reset_index(drop=True)
+
+        # Konversi tanggal dan tambah kolom Hari
+        try:
+            df_bulanan["Tanggal"] = pd.to_datetime(df_bulanan["Tanggal"], format='mixed', dayfirst=True)
+        except ValueError as e:
+            raise ValueError(f"Gagal mengonversi tanggal: {str(e)}") from e
+        df_bulanan["Hari"] = df_bulanan["Tanggal"].dt.day_name()
+        rec["rows"] = len(df_bulanan)
+        return df_bulanan
+
+
+def estimasi_volume(df_bulanan, df_proporsi, bulatkan=False):
+    """Fungsi untuk membagi volume bulanan ke tiap titik sesuai proporsi per Hari x Jenis Kendaraan.
+
+    `bulatkan=False` memotong desimal (perilaku aplikasi 1 minggu),
+    `bulatkan=True` membulatkan ke bilangan bulat terdekat (aplikasi 2 minggu).
+    """
+    with perf.stage("merge & pivot") as rec:
+        # Melt ke long format
+        df_jenis_long = df_bulanan.melt(
+            id_vars=["Tanggal", "Jenis Kendaraan", "Hari"],
+            value_vars=JAM_LIST,
+            var_name="Jam",
+            value_name="Jumlah"
+        )
+
+        df_jenis_long["Jumlah"] = pd.to_numeric(df_jenis_long["Jumlah"], errors='coerce').fillna(0)
+
+        # Join dengan proporsi
+        df_join = df_jenis_long.merge(
+            df_proporsi[["Hari", "Source", "Jenis Kendaraan", "Proporsi"]],
+            on=["Hari", "Jenis Kendaraan"],
+            how="left"
+        )
+
+        # Hitung estimasi
+        df_join["Jumlah_Estimasi"] = df_join["Jumlah"] * df_join["Proporsi"]
+
+        # Pivot kembali ke wide format
+        df_pivot = df_join.pivot_table(
+            index=["Tanggal", "Jenis Kendaraan", "Source"],
+            columns="Jam",
+            values="Jumlah_Estimasi",
+            aggfunc="sum",
+            observed=True,
+        ).reset_index()
+        # Kembali ke teks biasa agar skema hasil tetap sama
+        if isinstance(df_pivot["Jenis Kendaraan"].dtype, pd.CategoricalDtype):
+            df_pivot["Jenis Kendaraan"] = df_pivot["Jenis Kendaraan"].astype(df_pivot["Jenis Kendaraan"].cat.categories.dtype)
+
+        if bulatkan:
+            jam_columns = [col for col in df_pivot.columns if col.endswith(":00:00")]
+            df_pivot[jam_columns] = df_pivot[jam_columns].fillna(0).round().astype(int)
+        else:
+            df_pivot.iloc[:, 3:] = df_pivot.iloc[:, 3:].fillna(0).astype(int)
+
+        # Format tanggal dan filter
+        df_pivot["Tanggal"] = pd.to_datetime(df_pivot["Tanggal"], errors="coerce")
+        df_sorted = df_pivot.sort_values(by=["Tanggal", "Source"])
+        df_sorted["Tanggal"] = df_sorted["Tanggal"].dt.strftime("%d-%m-%Y")
+        df_final = df_sorted[df_sorted["Jenis Kendaraan"].str.lower() != "unknown"]
+        rec["rows"] = len(df_final)
+        return df_final
+
+
+def cek_kelengkapan(df_final):
+    """Fungsi untuk mencari kombinasi Tanggal x Source x Jenis Kendaraan yang tidak ada di hasil.
+
+    Mengembalikan (semua kombinasi, kombinasi yang hilang).
+    """
+    with perf.stage("cek kelengkapan") as rec:
+        all_tanggal = df_final["Tanggal"].unique()
+        all_source = df_final["Source"].unique()
+        all_jenis = df_final["Jenis Kendaraan"].unique()
+
+        full_combinations = pd.DataFrame(
+            list(itertools.product(all_tanggal, all_source, all_jenis)),
+            columns=["Tanggal", "Source", "Jenis Kendaraan"]
+        )
+
+        merged_check = full_combinations.merge(
+            df_final[["Tanggal", "Source", "Jenis Kendaraan"]],
+            on=["Tanggal", "Source", "Jenis Kendaraan"],
+            how="left",
+            indicator=True
+        )
+
+        missing_data = merged_check[merged_check["_merge"] == "left_only"].drop(columns=["_merge"])
+        rec["rows"] = len(full_combinations)
+        return full_combinations, missing_data
+
+
+def jalankan_estimasi(file, nama_file, df_proporsi, bulatkan=False, parse=parse_bulanan_file, sampel=None,
+                      per_jam=False, bootstrap=False, agregasi_sampel="mean"):
+    """Fungsi untuk seluruh jalur bulanan (baca, parse, olah, estimasi, cek kelengkapan) dalam satu job.
+
+    `parse(file, nama_file, bulan)` mengembalikan (list_df, peringatan); bisa
+    diganti versi yang memakai ulang hasil parse file yang sama (unggahan.parse_bulanan).
+    `sampel` = data sampel mingguan (kolom Minggu untuk 2 minggu) yang diagregasi
+    dengan `agregasi_sampel`. Dengan `per_jam=True` estimasi memakai model
+    proporsi per jam yang dihitung dari `sampel` di dalam job; dengan
+    `bootstrap=True` selang kepercayaan total harian per Source
+    (`bootstrap_estimasi`) dikembalikan di kunci "df_pita". Jika sampel tidak
+    bisa dipakai (mis. kolom jam tidak lengkap) estimasi kembali ke proporsi
+    harian `df_proporsi` dan alasannya ditambahkan ke peringatan.
+    Mengembalikan dict berisi hasil dan peringatan per sheet. Kegagalan yang
+    membuat estimasi tidak bisa dilanjutkan dikembalikan di kunci "gagal".
+    """
+    jobs.rencana(3)
+    bulan, _ = bulan_dari_nama_file(nama_file.lower())
+    hasil = {"sheet_warnings": [], "gagal": None, "df_pita": None}
+
+    with jobs.tahap(f"membaca {nama_file}"):
+        list_df, peringatan = parse(file, nama_file, bulan)
+    hasil["sheet_warnings"].extend(peringatan)
+    hasil["jumlah_sheet"] = len(list_df)
+    if not list_df:
+        hasil["gagal"] = "Tidak ada data valid di file bulanan. Periksa format file."
+        return hasil
+
+    with jobs.tahap("olah bulanan & estimasi"):
+        try:
+            df_bulanan = olah_bulanan(list_df, peringatan=hasil["sheet_warnings"])
+        except ValueError as e:
+            hasil["gagal"] = str(e)
+            return hasil
+        model = None
+        if sampel is not None and per_jam:
+            try:
+                model = hitung_proporsi_jam(sampel, agregasi=agregasi_sampel)
+            except ValueError as e:
+                hasil["sheet_warnings"].append(f"Proporsi per jam tidak dipakai, estimasi memakai proporsi harian: {e}")
+        if model is not None:
+            hasil["df_final"] = estimasi_volume_jam(df_bulanan, model, bulatkan=bulatkan)
+        else:
+            hasil["df_final"] = estimasi_volume(df_bulanan, df_proporsi, bulatkan=bulatkan)
+        if sampel is not None and bootstrap:
+            try:
+                hasil["df_pita"] = bootstrap_estimasi(
+                    sampel, df_bulanan, agregasi=agregasi_sampel, per_jam=model is not None
+                )
+            except ValueError as e:
+                hasil["sheet_warnings"].append(f"Selang kepercayaan tidak dihitung: {e}")
+    with jobs.tahap("cek kelengkapan"):
+        hasil["full_combinations"], hasil["missing_data"] = cek_kelengkapan(hasil["df_final"])
+    return hasil
@@ -0,0 +1,193 @@
+"""Registri titik checkpoint dan jenis kendaraan.
+
+Daftar titik (nomor sheet, nama, keterangan arah) dan peta jenis kendaraan
+mingguan/bulanan dibaca sekali dari REGISTRI_PATH (registri.json, atau .toml),
+bukan ditulis ulang di setiap aplikasi dan notebook. Menambah titik cukup
+menambah satu baris di file registri.
+
+Setiap peta dikompilasi menjadi `Pemetaan`: indeks nilai asal dan array kode
+kategori (int32). Memetakan satu kolom = satu pencarian indeks lalu gather
+array, bukan `Series.map`/`replace` dengan dict string. Jenis kendaraan dari
+kedua sumber dinormalisasi ke satu `jenis_dtype` (kategori berkode) saat ingest.
+
+Sheet file harian dipetakan ke titik lewat namanya: nomor di depan nama sheet
+("6. 1 Juli" -> titik nomor 6), atau nama titik di nama sheet (mis.
+"Brantas 1 Juli"), tidak lagi lewat urutan sheet.
+"""
+import functools
+import json
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+REGISTRI_PATH = os.environ.get(
+    "REGISTRI_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "registri.json")
+)
+
+Titik = namedtuple("Titik", ["nomor", "nama", "keterangan"])
+
+_POLA_NOMOR_SHEET = re.compile(r"\s*(\d+)\s*[.\-_)]")
+
+
+class Pemetaan:
+    """Peta nilai asal -> kategori yang dikompilasi ke array kode integer"""
+
+    def __init__(self, pasangan):
+        self.asal = pd.Index(list(pasangan))
+        self.kategori = pd.Index(list(dict.fromkeys(pasangan.values())))
+        self.kode = self.kategori.get_indexer(list(pasangan.values())).astype(np.int32)
+        # Elemen terakhir untuk indeks -1 (nilai tidak dikenal): kode -1
+        self._kode = np.append(self.kode, np.int32(-1))
+        # Label kategori per posisi asal, dtype teks sama seperti hasil Series.map
+        self._label = self.kategori.take(self.kode)
+
+    def __len__(self):
+        return len(self.asal)
+
+    def kode_dari(self, nilai):
+        """Fungsi untuk array kode kategori dari nilai asal; -1 untuk nilai yang tidak ada di peta"""
+        return self._kode[self._indeks(nilai)]
+
+    def _indeks(self, nilai):
+        """Posisi setiap nilai di `asal` (-1 jika tidak ada)"""
+        kode, _, posisi = self._faktor(nilai)
+        return posisi[kode]
+
+    def _faktor(self, nilai):
+        """Kode nilai unik per baris, nilai unik, dan posisi nilai unik di `asal` (diakhiri -1 untuk NaN)"""
+        if isinstance(getattr(nilai, "dtype", None), pd.CategoricalDtype):
+            kode, unik = nilai.cat.codes.to_numpy(), nilai.cat.categories
+        else:
+            # Kolom berisi sedikit nilai unik yang berulang: beri kode integer dulu,
+            # cari posisi nilai unik saja, lalu gather per baris
+            kode, unik = pd.factorize(pd.Series(nilai, copy=False))
+        return kode, unik, np.append(self.asal.get_indexer(unik), -1)
+
+    def _gather(self, idx, nilai):
+        hasil = self._label.take(idx, allow_fill=True, fill_value=np.nan)
+        return pd.Series(hasil._values, index=nilai.index, name=nilai.name, copy=False)
+
+    def petakan(self, nilai):
+        """Fungsi seperti `Series.map(dict)`: nilai yang tidak ada di peta menjadi NaN"""
+        return self._gather(self._indeks(nilai), nilai)
+
+    def ganti(self, nilai):
+        """Fungsi seperti `Series.replace(dict)`: nilai yang tidak ada di peta dibiarkan"""
+        idx = self._indeks(nilai)
+        hasil = self._gather(idx, nilai)
+        tetap = idx < 0
+        return hasil.where(~tetap, nilai) if tetap.any() else hasil
+
+    def sebagai_dict(self):
+        """Fungsi untuk peta dalam bentuk dict {asal: kategori}"""
+        return dict(zip(self.asal, self._label))
+
+    def kategorikan(self, nilai, dtype=None):
+        """Fungsi untuk mengubah nilai asal menjadi Categorical berkode `dtype` dalam satu pass.
+
+        Mengembalikan (Series kategori, daftar nilai asal yang tidak ada di peta);
+        baris dengan nilai tidak dikenal menjadi NaN (kode -1). Kategori peta yang
+        belum ada di `dtype` ditambahkan, urutan kategori tetap alfabetis.
+        """
+        if dtype is None or not self.kategori.isin(dtype.categories).all():
+            lama = [] if dtype is None else list(dtype.categories)
+            dtype = pd.CategoricalDtype(sorted({*lama, *self.kategori}))
+        kode, unik, posisi = self._faktor(nilai)
+        # asal -> kode kategori di dtype; indeks -1 (tidak dikenal) tetap -1
+        ke_dtype = np.append(dtype.categories.get_indexer(self.kategori).take(self.kode), -1).astype(np.int32)
+        hasil = pd.Categorical.from_codes(ke_dtype[posisi[kode]], dtype=dtype)
+        tidak_dikenal = list(unik[posisi[:-1] < 0])
+        return pd.Series(hasil, index=nilai.index, name=nilai.name, copy=False), tidak_dikenal
+
+
+def pemetaan(peta):
+    """Fungsi untuk `Pemetaan` dari dict (dikompilasi) atau Pemetaan yang sudah jadi"""
+    return peta if isinstance(peta, Pemetaan) else Pemetaan(peta)
+
+
+class Registri:
+    """Titik checkpoint dan peta jenis kendaraan yang sudah dikompilasi"""
+
+    def __init__(self, titik, jenis_mingguan=None, jenis_bulanan=None):
+        self.titik = sorted((Titik(int(t.nomor), t.nama, t.keterangan) for t in titik), key=lambda t: t.nomor)
+        self._per_nomor = {t.nomor: t for t in self.titik}
+        self._per_nama = {t.nama.lower(): t for t in self.titik}
+        if len(self._per_nomor) != len(self.titik) or len(self._per_nama) != len(self.titik):
+            raise ValueError("Nomor dan nama titik di registri harus unik")
+        # Nama terpanjang dicoba dulu, agar "titik 12" tidak terbaca sebagai "titik 1"
+        nama = sorted(self._per_nama, key=len, reverse=True)
+        self._pola_nama = (
+            re.compile(r"(?<!\w)(" + "|".join(map(re.escape, nama)) + r")(?!\w)", re.IGNORECASE) if nama else None
+        )
+
+        self.keterangan = Pemetaan({t.nama: t.keterangan for t in self.titik if t.keterangan is not None})
+        self.jenis = Pemetaan(jenis_mingguan or {})
+        self.jenis_bulanan = Pemetaan(jenis_bulanan or {})
+        # Kategori jenis bersama untuk data mingguan dan bulanan: groupby dan merge
+        # di hilir berjalan di atas kode integer yang sama untuk kedua sumber
+        self.jenis_dtype = pd.CategoricalDtype(sorted({*self.jenis.kategori, *self.jenis_bulanan.kategori}))
+
+    @classmethod
+    def dari_dict(cls, data):
+        """Fungsi untuk Registri dari isi file registri"""
+        titik = [Titik(t["nomor"], t["nama"], t.get("keterangan")) for t in data.get("titik", [])]
+        return cls(titik, data.get("jenis_mingguan"), data.get("jenis_bulanan"))
+
+    @classmethod
+    def dari_daftar(cls, nama_checkpoint, keterangan_map=None, jenis_mingguan=None, jenis_bulanan=None):
+        """Fungsi untuk Registri dari daftar nama titik berurutan (nama ke-i = sheet nomor i+1)"""
+        keterangan_map = keterangan_map or {}
+        titik = [Titik(i + 1, nama, keterangan_map.get(nama)) for i, nama in enumerate(nama_checkpoint)]
+        return cls(titik, jenis_mingguan, jenis_bulanan)
+
+    @property
+    def nama_checkpoint(self):
+        return [t.nama for t in self.titik]
+
+    def titik_sheet(self, sheet_name):
+        """Fungsi untuk Titik yang sesuai dengan nama sheet, None jika tidak ada yang cocok"""
+        match = _POLA_NOMOR_SHEET.match(sheet_name)
+        if match:
+            return self._per_nomor.get(int(match.group(1)))
+        if self._pola_nama is not None:
+            match = self._pola_nama.search(sheet_name)
+            if match:
+                return self._per_nama[match.group(1).lower()]
+        return None
+
+    def sebagai_dict(self):
+        """Fungsi untuk isi registri dalam format file registri (juga dipakai sebagai versi kode artefak)"""
+        return {
+            "titik": [t._asdict() for t in self.titik],
+            "jenis_mingguan": self.jenis.sebagai_dict(),
+            "jenis_bulanan": self.jenis_bulanan.sebagai_dict(),
+        }
+
+
+def baca(path):
+    """Fungsi untuk membaca file registri .json atau .toml"""
+    if path.lower().endswith(".toml"):
+        import tomllib
+
+        with open(path, "rb") as f:
+            return Registri.dari_dict(tomllib.load(f))
+    with open(path, encoding="utf-8") as f:
+        return Registri.dari_dict(json.load(f))
+
+
+@functools.lru_cache(maxsize=None)
+def muat(path=None):
+    """Fungsi untuk registri dari REGISTRI_PATH (dibaca dan dikompilasi sekali per proses)"""
+    return baca(path or REGISTRI_PATH)
+
+
+@functools.lru_cache(maxsize=8)
+def dari_daftar(nama_checkpoint):
+    """Fungsi untuk Registri dari tuple nama titik berurutan, dengan keterangan dan jenis dari registri utama"""
+    utama = muat()
+    return Registri.dari_daftar(
+        nama_checkpoint, utama.keterangan.sebagai_dict(), utama.jenis.sebagai_dict(), utama.jenis_bulanan.sebagai_dict()
+    )
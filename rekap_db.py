@@ -0,0 +1,225 @@
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+import registri
+from rekap_io import baca_file_rekap, cari_file_rekap, label_file_rekap
+
+try:
+    import duckdb
+except ImportError:  # DuckDB opsional, fallback ke SQLite bawaan Python
+    duckdb = None
+
+JAM_COLS = [f"{str(i).zfill(2)}:00:00" for i in range(24)]
+KOLOM_JAM_DB = [f"h{str(i).zfill(2)}" for i in range(24)]
+
+
+class RekapDB:
+    """Penyimpanan rekap di file DuckDB/SQLite lokal.
+
+    Data disimpan lebar (satu baris per Tanggal x Source x Jenis Kendaraan,
+    24 kolom jam + Total) dan diurutkan per tanggal, sehingga filter tanggal
+    dan source didorong langsung ke mesin SQL. Method query-nya sama dengan
+    `RekapRollup`, jadi dashboard bisa memakai salah satunya.
+    """
+
+    def __init__(self, path, engine=None):
+        self.path = path
+        self.engine = engine or ("duckdb" if duckdb is not None else "sqlite")
+        if self.engine == "duckdb" and duckdb is None:
+            raise ImportError("Backend 'duckdb' dipilih tetapi paket duckdb belum terpasang")
+
+        self._lock = threading.Lock()
+        self._con = duckdb.connect(path) if self.engine == "duckdb" else None
+        self._init_schema()
+
+    def _connect(self):
+        """Koneksi per query: cursor DuckDB atau koneksi SQLite baru (aman dipakai antar thread)"""
+        if self.engine == "duckdb":
+            return self._con.cursor()
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def _query(self, sql, params=()):
+        con = self._connect()
+        try:
+            return con.execute(sql, list(params)).fetchall()
+        finally:
+            con.close()
+
+    def _init_schema(self):
+        kolom_jam = ", ".join(f"{col} BIGINT" for col in KOLOM_JAM_DB)
+        con = self._connect()
+        try:
+            con.execute(f"""
+                CREATE TABLE IF NOT EXISTS rekap (
+                    tanggal VARCHAR, source VARCHAR, jenis VARCHAR,
+                    keterangan VARCHAR, file_source VARCHAR,
+                    {kolom_jam}, total BIGINT
+                )
+            """)
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS rekap_files (
+                    file_source VARCHAR PRIMARY KEY, mtime DOUBLE, size BIGINT
+                )
+            """)
+            if self.engine == "sqlite":
+                con.execute("CREATE INDEX IF NOT EXISTS idx_rekap_tanggal_source ON rekap (tanggal, source)")
+                con.commit()
+        finally:
+            con.close()
+
+    def sync(self, file_pattern, keterangan_map):
+        """Fungsi untuk memasukkan file 'hasil rekap' yang baru/berubah ke database.
+
+        `keterangan_map` = dict Source -> Keterangan atau registri.Pemetaan.
+        Mengembalikan list (path, status) dengan status 'baru', 'diperbarui' atau 'tetap'.
+        """
+        hasil = []
+        with self._lock:
+            terdaftar = {
+                row[0]: (row[1], row[2])
+                for row in self._query("SELECT file_source, mtime, size FROM rekap_files")
+            }
+            ditemukan = set()
+
+            for file_path in cari_file_rekap(file_pattern):
+                bulan_dari_file = label_file_rekap(file_path)
+                ditemukan.add(bulan_dari_file)
+                stat = os.stat(file_path)
+                if terdaftar.get(bulan_dari_file) == (stat.st_mtime, stat.st_size):
+                    hasil.append((file_path, "tetap"))
+                    continue
+
+                df_temp = baca_file_rekap(file_path)
+                self._replace_file(bulan_dari_file, df_temp, keterangan_map, stat)
+                hasil.append((file_path, "diperbarui" if bulan_dari_file in terdaftar else "baru"))
+
+            for bulan_dari_file in set(terdaftar) - ditemukan:
+                self._delete_file(bulan_dari_file)
+
+        return hasil
+
+    def _delete_file(self, bulan_dari_file):
+        con = self._connect()
+        try:
+            con.execute("DELETE FROM rekap WHERE file_source = ?", [bulan_dari_file])
+            con.execute("DELETE FROM rekap_files WHERE file_source = ?", [bulan_dari_file])
+            if self.engine == "sqlite":
+                con.commit()
+        finally:
+            con.close()
+
+    def _replace_file(self, bulan_dari_file, df_temp, keterangan_map, stat):
+        df_temp = df_temp.copy()
+        df_temp["Tanggal"] = pd.to_datetime(df_temp["Tanggal"], dayfirst=True, errors="coerce")
+        df_temp = df_temp[df_temp["Tanggal"].notna()]
+
+        df_db = pd.DataFrame({
+            "tanggal": df_temp["Tanggal"].dt.strftime("%Y-%m-%d"),
+            "source": df_temp["Source"].astype(str),
+            "jenis": df_temp["Jenis Kendaraan"].astype(str),
+            "keterangan": registri.pemetaan(keterangan_map).petakan(df_temp["Source"]),
+            "file_source": bulan_dari_file,
+        })
+        for col_db, col in zip(KOLOM_JAM_DB, JAM_COLS):
+            if col in df_temp.columns:
+                df_db[col_db] = pd.to_numeric(df_temp[col], errors="coerce").fillna(0).round().astype("int64")
+            else:
+                df_db[col_db] = 0
+        df_db["total"] = df_db[KOLOM_JAM_DB].sum(axis=1)
+        df_db = df_db.sort_values(by=["tanggal", "source"])
+
+        self._delete_file(bulan_dari_file)
+        con = self._connect()
+        try:
+            if self.engine == "duckdb":
+                con.register("df_db", df_db)
+                con.execute("INSERT INTO rekap SELECT * FROM df_db")
+                con.unregister("df_db")
+            else:
+                placeholder = ", ".join(["?"] * len(df_db.columns))
+                con.executemany(
+                    f"INSERT INTO rekap VALUES ({placeholder})",
+                    df_db.astype(object).where(df_db.notna(), None).itertuples(index=False, name=None),
+                )
+            con.execute(
+                "INSERT INTO rekap_files VALUES (?, ?, ?)",
+                [bulan_dari_file, stat.st_mtime, stat.st_size],
+            )
+            if self.engine == "sqlite":
+                con.commit()
+        finally:
+            con.close()
+
+    # === Query yang dipakai dashboard ===
+
+    @property
+    def files(self):
+        return [row[0] for row in self._query("SELECT file_source FROM rekap_files ORDER BY file_source")]
+
+    @property
+    def sources(self):
+        return [row[0] for row in self._query("SELECT DISTINCT source FROM rekap ORDER BY source")]
+
+    @property
+    def date_min(self):
+        return pd.Timestamp(self._query("SELECT MIN(tanggal) FROM rekap")[0][0])
+
+    @property
+    def date_max(self):
+        return pd.Timestamp(self._query("SELECT MAX(tanggal) FROM rekap")[0][0])
+
+    def months(self):
+        rows = self._query("SELECT DISTINCT tanggal FROM rekap")
+        return sorted(pd.to_datetime([row[0] for row in rows]).dropna().strftime("%B %Y").unique())
+
+    def available_dates(self, source):
+        rows = self._query("SELECT DISTINCT tanggal FROM rekap WHERE source = ? ORDER BY tanggal", [source])
+        return [pd.Timestamp(row[0]) for row in rows]
+
+    @staticmethod
+    def _rentang(awal, akhir):
+        return pd.Timestamp(awal).strftime("%Y-%m-%d"), pd.Timestamp(akhir).strftime("%Y-%m-%d")
+
+    def sources_in(self, awal, akhir):
+        rows = self._query(
+            "SELECT DISTINCT source FROM rekap WHERE tanggal BETWEEN ? AND ? ORDER BY source",
+            self._rentang(awal, akhir),
+        )
+        return [row[0] for row in rows]
+
+    def type_totals(self, awal, akhir, source):
+        rows = self._query(
+            "SELECT jenis, SUM(total) FROM rekap WHERE tanggal BETWEEN ? AND ? AND source = ? "
+            "GROUP BY jenis ORDER BY jenis",
+            [*self._rentang(awal, akhir), source],
+        )
+        return pd.DataFrame(rows, columns=["Jenis Kendaraan", "Jumlah"])
+
+    def hourly_profile(self, awal, akhir, source, jenis):
+        kolom = ", ".join(f"SUM({col})" for col in KOLOM_JAM_DB)
+        row = self._query(
+            f"SELECT {kolom} FROM rekap WHERE tanggal BETWEEN ? AND ? AND source = ? AND jenis = ?",
+            [*self._rentang(awal, akhir), source, jenis],
+        )[0]
+        return pd.DataFrame({"Jam": JAM_COLS, "Jumlah": [v or 0 for v in row]})
+
+    def keterangan_totals(self, awal, akhir):
+        rows = self._query(
+            "SELECT keterangan, SUM(total) FROM rekap WHERE tanggal BETWEEN ? AND ? "
+            "AND keterangan IS NOT NULL GROUP BY keterangan ORDER BY keterangan",
+            self._rentang(awal, akhir),
+        )
+        return pd.DataFrame(rows, columns=["Keterangan", "Jumlah"])
+
+    def daily_totals(self, awal, akhir, source):
+        rows = self._query(
+            "SELECT tanggal, SUM(total) FROM rekap WHERE tanggal BETWEEN ? AND ? AND source = ? "
+            "GROUP BY tanggal ORDER BY tanggal",
+            [*self._rentang(awal, akhir), source],
+        )
+        df_harian = pd.DataFrame(rows, columns=["Tanggal", "Jumlah"])
+        df_harian["Tanggal"] = pd.to_datetime(df_harian["Tanggal"])
+        return df_harian
@@ -0,0 +1,231 @@
+"""Format file hasil estimasi: ekspor unduhan dan pembacaan 'hasil rekap' di dashboard.
+
+Excel tetap tersedia untuk dibuka di spreadsheet, tetapi Parquet dan CSV gzip
+jauh lebih cepat ditulis oleh aplikasi estimasi dan dibaca ulang oleh dashboard.
+Unduhan dengan beberapa sheet menjadi ZIP berisi satu file per sheet untuk
+format selain Excel.
+
+Ekspor per checkpoint memecah hasil per Source (atau per Keterangan) menjadi
+satu file per grup; file-file itu ditulis paralel di proses worker dan
+digabung menjadi satu ZIP.
+
+Excel ditulis secara streaming (openpyxl write-only, per blok baris) sehingga
+memori saat menulis tidak bergantung pada jumlah baris. Semua unduhan ditulis
+ke file sementara (di RAM sampai SPOOL_MAX_MB, lalu pindah ke disk) dan baru
+dibuat saat tombol unduh diklik. File akhir (sudah terkompresi) tetap dibaca
+utuh ke memori satu kali: st.download_button menyimpan isi unduhan sebagai
+bytes di media storage Streamlit, apa pun tipe yang dikembalikan `data`.
+"""
+import glob
+import io
+import os
+import tempfile
+import zipfile
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+import jobs
+import perf
+
+# Ukuran unduhan yang masih disimpan di RAM sebelum file sementara dipindah ke disk
+SPOOL_MAX_MB = float(os.environ.get("SPOOL_MAX_MB", "16"))
+# Jumlah baris DataFrame yang dikonversi ke nilai Python sekaligus saat menulis Excel
+CHUNK_BARIS = 10_000
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+FORMAT_EKSPOR = {
+    "Excel (.xlsx)": {"ext": ".xlsx", "mime": MIME_XLSX},
+    "Parquet": {"ext": ".parquet", "mime": "application/vnd.apache.parquet"},
+    "CSV gzip": {"ext": ".csv.gz", "mime": "application/gzip"},
+}
+
+# Urutan menentukan prioritas: bulan yang ada dalam dua format dibaca dari Parquet
+FILE_PATTERNS = ("hasil rekap *.parquet", "hasil rekap *.xlsx")
+
+
+def _siap_arrow(df):
+    """Nama kolom dijadikan string (header jam mingguan bisa berupa datetime.time)"""
+    return df.rename(columns=str)
+
+
+def _tulis(df, fmt, buffer):
+    if fmt == ".parquet":
+        _siap_arrow(df).to_parquet(buffer, index=False)
+    else:
+        _siap_arrow(df).to_csv(buffer, index=False, compression={"method": "gzip", "mtime": 0})
+
+
+def tulis_excel(sheets, fileobj, chunk=CHUNK_BARIS):
+    """Fungsi untuk menulis {nama sheet: DataFrame} ke xlsx secara streaming.
+
+    Workbook write-only tidak menyimpan model sel di memori: setiap baris
+    langsung diserialisasi, dan DataFrame dikonversi per `chunk` baris.
+    """
+    wb = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    for nama, df in sheets.items():
+        ws = wb.create_sheet(nama)
+        header = []
+        for col in df.columns:
+            cell = WriteOnlyCell(ws, value=str(col))
+            cell.font = header_font
+            header.append(cell)
+        ws.append(header)
+        for awal in range(0, len(df), chunk):
+            blok = df.iloc[awal:awal + chunk]
+            for baris in blok.astype(object).where(blok.notna(), None).itertuples(index=False, name=None):
+                ws.append(baris)
+    wb.save(fileobj)
+
+
+def tulis_file(sheets, format_ekspor, stage="ekspor"):
+    """Fungsi untuk menulis {nama sheet: DataFrame} ke file sementara dalam format unduhan.
+
+    Mengembalikan file (SpooledTemporaryFile) yang sudah di-rewind ke awal.
+    Excel menulis semua sheet ke satu workbook; Parquet/CSV gzip menghasilkan
+    satu file, atau ZIP jika sheet > 1.
+    """
+    ext = FORMAT_EKSPOR[format_ekspor]["ext"]
+    output = tempfile.SpooledTemporaryFile(max_size=int(SPOOL_MAX_MB * 1024 ** 2))
+    with perf.stage(f"{stage} ({ext})", rows=sum(len(df) for df in sheets.values())):
+        if ext == ".xlsx":
+            tulis_excel(sheets, output)
+        elif len(sheets) == 1:
+            _tulis(next(iter(sheets.values())), ext, output)
+        else:
+            # Isi sudah terkompresi (Parquet/gzip), ZIP cukup menyimpan saja
+            with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as zf:
+                for nama, df in sheets.items():
+                    with zf.open(f"{nama}{ext}", "w") as f:
+                        buffer = io.BytesIO()
+                        _tulis(df, ext, buffer)
+                        f.write(buffer.getvalue())
+    output.seek(0)
+    return output
+
+
+def ekspor(sheets, format_ekspor, stage="ekspor"):
+    """Fungsi untuk menyiapkan unduhan {nama sheet: DataFrame} dalam format tertentu.
+
+    Mengembalikan (fungsi, ekstensi, mime). Fungsi itu diberikan ke
+    st.download_button sebagai `data`: file baru ditulis saat tombol diklik,
+    bukan di setiap rerun. Isi file akhir (sudah terkompresi) dibaca utuh
+    sekali dari file sementara; Streamlit tetap menyimpan unduhan sebagai
+    bytes di memori, jadi mengembalikan handle file tidak menghemat memori.
+    """
+    info = FORMAT_EKSPOR[format_ekspor]
+    if info["ext"] != ".xlsx" and len(sheets) > 1:
+        ext, mime = ".zip", "application/zip"
+    else:
+        ext, mime = info["ext"], info["mime"]
+
+    def buat_file():
+        with tulis_file(sheets, format_ekspor, stage) as f:
+            return f.read()
+
+    return _terukur(buat_file), ext, mime
+
+
+def _terukur(fungsi):
+    """Fungsi untuk membungkus `fungsi` unduhan agar stage-nya tetap tercatat.
+
+    Streamlit memanggil `data` download_button di thread unduhannya sendiri,
+    tanpa profiler aktif. Pembungkus memakai profiler sendiri (nama app diambil
+    dari profiler sesi saat tombol dibuat) dan menulis lognya setelah file selesai.
+    """
+    sesi = perf.current()
+    app = f"{sesi.app}:ekspor" if sesi is not None else "ekspor"
+
+    def jalankan():
+        profiler = perf.Profiler(app)
+        sebelumnya = perf.current()
+        perf.activate(profiler)
+        try:
+            return fungsi()
+        finally:
+            perf.activate(sebelumnya)
+            profiler.write_log()
+
+    return jalankan
+
+
+def _tulis_bagian(path, nama_sheet, df, format_ekspor):
+    """Fungsi worker: tulis satu grup ke file `path` (satu sheet untuk Excel)"""
+    ext = FORMAT_EKSPOR[format_ekspor]["ext"]
+    with open(path, "wb") as f:
+        if ext == ".xlsx":
+            tulis_excel({nama_sheet: df}, f)
+        else:
+            _tulis(df, ext, f)
+    return path
+
+
+def tulis_per_grup(df, format_ekspor, kolom="Source", nama_sheet="estimasi_volume", stage="ekspor per checkpoint"):
+    """Fungsi untuk menulis satu file per nilai `kolom` lalu menggabungkannya menjadi ZIP.
+
+    File per grup ditulis ke folder sementara, paralel di pool proses jika
+    jobs.JOB_PROSES > 1 (`jobs.pool_proses`); ZIP diisi sesuai urutan grup
+    sambil grup berikutnya masih ditulis. Mengembalikan SpooledTemporaryFile
+    berisi ZIP yang sudah di-rewind.
+    """
+    ext = FORMAT_EKSPOR[format_ekspor]["ext"]
+    grup = [(str(nilai), bagian) for nilai, bagian in df.groupby(kolom, sort=True)]
+    output = tempfile.SpooledTemporaryFile(max_size=int(SPOOL_MAX_MB * 1024 ** 2))
+    with perf.stage(f"{stage} ({ext}, {len(grup)} file)", rows=len(df)), \
+            tempfile.TemporaryDirectory(prefix="ekspor_") as folder, \
+            jobs.pool_proses(min(jobs.JOB_PROSES, len(grup))) as pool:
+        args = [(os.path.join(folder, f"{i}{ext}"), nama_sheet, bagian, format_ekspor)
+                for i, (_, bagian) in enumerate(grup)]
+        if pool is not None:
+            paths = (f.result() for f in [pool.submit(_tulis_bagian, *a) for a in args])
+        else:
+            paths = (_tulis_bagian(*a) for a in args)
+        # Isi sudah terkompresi (xlsx/Parquet/gzip), ZIP cukup menyimpan saja
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as zf:
+            for (nilai, _), path in zip(grup, paths):
+                zf.write(path, f"{nilai}{ext}")
+    output.seek(0)
+    return output
+
+
+def ekspor_per_grup(df, format_ekspor, kolom="Source", nama_sheet="estimasi_volume", stage="ekspor per checkpoint"):
+    """Fungsi untuk menyiapkan unduhan ZIP satu file per `kolom`, seperti `ekspor`.
+
+    ZIP akhir dibaca utuh ke memori saat diklik, sama seperti `ekspor`.
+    """
+    def buat_file():
+        with tulis_per_grup(df, format_ekspor, kolom, nama_sheet, stage) as f:
+            return f.read()
+
+    return _terukur(buat_file), ".zip", "application/zip"
+
+
+def label_file_rekap(path):
+    """Fungsi untuk label bulan dari nama file, mis. 'hasil rekap Juli.parquet' -> 'Juli'"""
+    nama = os.path.basename(path).replace("hasil rekap ", "")
+    for ext in (".parquet", ".xlsx"):
+        if nama.endswith(ext):
+            return nama[: -len(ext)]
+    return nama
+
+
+def cari_file_rekap(patterns=FILE_PATTERNS):
+    """Fungsi untuk daftar file rekap; satu file per label, format pertama di `patterns` diutamakan"""
+    if isinstance(patterns, str):
+        patterns = (patterns,)
+    terpilih = {}
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            terpilih.setdefault(label_file_rekap(path), path)
+    return sorted(terpilih.values())
+
+
+def baca_file_rekap(path):
+    """Fungsi untuk membaca satu file rekap (Parquet atau Excel) menjadi DataFrame"""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_excel(path)
@@ -0,0 +1,163 @@
+import glob
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    import msvcrt
+    fcntl = None
+
+from rekap_io import cari_file_rekap
+from rollup import RekapRollup
+
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+
+
+def _kunci(fd):
+    """Ambil lock eksklusif atas file `fd`, tunggu selama dipegang penulis lain"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    # msvcrt mengunci byte mulai posisi file; byte pertama dipakai sebagai penanda
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.1)
+
+
+def _lepas(fd):
+    if msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _store_lock(store_dir):
+    """Lock eksklusif antar proses dan thread agar hanya satu penulis yang menulis store.
+
+    Memakai fcntl.flock (POSIX) atau msvcrt.locking (Windows). Menunggu selama
+    penulis lain masih memegang lock, berapa pun lamanya. Lock dilepas sistem
+    operasi saat file ditutup atau proses penulis mati, jadi tidak ada lock basi
+    yang perlu diambil alih. File lock sengaja tidak dihapus.
+    """
+    fd = os.open(os.path.join(store_dir, LOCK_FILE), os.O_CREAT | os.O_RDWR)
+    try:
+        _kunci(fd)
+        try:
+            yield
+        finally:
+            _lepas(fd)
+    finally:
+        os.close(fd)
+
+
+def file_signature(file_pattern):
+    """Fungsi untuk tanda (mtime, ukuran) semua file sumber, dipakai mendeteksi store yang basi"""
+    return {
+        os.path.basename(path): [os.stat(path).st_mtime, os.stat(path).st_size]
+        for path in cari_file_rekap(file_pattern)
+    }
+
+
+def data_version(file_pattern):
+    """Fungsi untuk versi data (string) dari tanda semua file sumber; berubah jika file rekap ditambah/diubah"""
+    return json.dumps(file_signature(file_pattern), sort_keys=True)
+
+
+def read_index(store_dir):
+    """Fungsi untuk membaca index label store, None jika belum ada"""
+    try:
+        with open(os.path.join(store_dir, INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def is_fresh(store_dir, file_pattern):
+    """Fungsi untuk cek apakah store masih sesuai dengan file sumber"""
+    index = read_index(store_dir)
+    return index is not None and index.get("sumber") == file_signature(file_pattern)
+
+
+def save_store(rollup, store_dir, sumber=None):
+    """Fungsi untuk menyimpan rollup sebagai file .npy (memory-mapped) + index JSON.
+
+    File array ditulis dengan nama unik, lalu index.json diganti secara atomik,
+    sehingga proses lain yang sedang membaca store lama tidak terganggu.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    with _store_lock(store_dir):
+        _write_store(rollup, store_dir, sumber)
+
+
+def _write_store(rollup, store_dir, sumber):
+    versi = uuid.uuid4().hex[:8]
+    nama_file = {
+        "prefix": f"prefix-{versi}.npy",
+        "prefix_ada": f"prefix_ada-{versi}.npy",
+    }
+    for key, array in (("prefix", rollup.prefix), ("prefix_ada", rollup.prefix_ada)):
+        mm = np.lib.format.open_memmap(
+            os.path.join(store_dir, nama_file[key]), mode="w+", dtype=array.dtype, shape=array.shape
+        )
+        mm[...] = array
+        mm.flush()
+        del mm
+
+    index = {
+        "versi": versi,
+        "tanggal": [t.strftime("%Y-%m-%d") for t in rollup.tanggal],
+        "sources": rollup.sources,
+        "jenis": rollup.jenis,
+        "keterangan": rollup.keterangan,
+        "files": rollup.files,
+        "arrays": nama_file,
+        "sumber": sumber or {},
+    }
+    index_tmp = os.path.join(store_dir, f"{INDEX_FILE}.{versi}.tmp")
+    with open(index_tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    os.replace(index_tmp, os.path.join(store_dir, INDEX_FILE))
+
+    # Hapus array versi lama; proses yang masih memetakannya tetap aman (inode tetap hidup)
+    aktif = set(nama_file.values()) | {INDEX_FILE}
+    for path in glob.glob(os.path.join(store_dir, "*.npy")):
+        if os.path.basename(path) not in aktif:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def open_store(store_dir):
+    """Fungsi untuk membuka store sebagai RekapRollup di atas array memory-mapped (read-only)"""
+    index = read_index(store_dir)
+    if index is None:
+        raise FileNotFoundError(f"Store rekap belum ada di {store_dir}")
+
+    arrays = {
+        key: np.load(os.path.join(store_dir, index["arrays"][key]), mmap_mode="r")
+        for key in ("prefix", "prefix_ada")
+    }
+    return RekapRollup(
+        pd.to_datetime(index["tanggal"]),
+        index["sources"],
+        index["jenis"],
+        index["keterangan"],
+        arrays["prefix"],
+        arrays["prefix_ada"],
+        index["files"],
+    )
+
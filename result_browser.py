@@ -0,0 +1,61 @@
+import math
+
+import pandas as pd
+import streamlit as st
+
+
+def filter_positions(df, sources=None, tanggal=None, jenis=None):
+    """Fungsi untuk mencari posisi baris yang lolos filter Source/Tanggal/Jenis Kendaraan"""
+    mask = pd.Series(True, index=df.index)
+    if sources:
+        mask &= df["Source"].isin(sources)
+    if tanggal:
+        mask &= df["Tanggal"].isin(tanggal)
+    if jenis:
+        mask &= df["Jenis Kendaraan"].isin(jenis)
+    return mask.to_numpy().nonzero()[0]
+
+
+def render_result_browser(df, key, page_sizes=(20, 50, 100, 250)):
+    """Fungsi untuk menampilkan hasil estimasi per halaman.
+
+    Filter diterapkan di server, dan hanya baris pada halaman terpilih yang
+    dikirim ke browser lewat st.dataframe.
+    """
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sources = st.multiselect("📍 Titik", sorted(df["Source"].unique()), key=f"{key}_source")
+    with col2:
+        tanggal = st.multiselect("📅 Tanggal", list(pd.unique(df["Tanggal"])), key=f"{key}_tanggal")
+    with col3:
+        jenis = st.multiselect("🚗 Jenis Kendaraan", sorted(df["Jenis Kendaraan"].unique()), key=f"{key}_jenis")
+
+    posisi = filter_positions(df, sources, tanggal, jenis)
+    total = len(posisi)
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Baris per halaman", page_sizes, key=f"{key}_page_size")
+
+    jumlah_halaman = max(1, math.ceil(total / page_size))
+    # Filter baru bisa mengurangi jumlah halaman, jaga halaman tetap dalam batas
+    if st.session_state.get(f"{key}_page", 1) > jumlah_halaman:
+        st.session_state[f"{key}_page"] = jumlah_halaman
+
+    with col2:
+        page = st.number_input(
+            f"Halaman (dari {jumlah_halaman})",
+            min_value=1,
+            max_value=jumlah_halaman,
+            step=1,
+            key=f"{key}_page",
+        )
+
+    awal = (int(page) - 1) * page_size
+    df_halaman = df.iloc[posisi[awal:awal + page_size]]
+    st.dataframe(df_halaman, use_container_width=True)
+
+    if total:
+        st.caption(f"Menampilkan baris {awal + 1:,}-{awal + len(df_halaman):,} dari {total:,} baris")
+    else:
+        st.caption("Tidak ada baris yang sesuai filter")
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+JAM_COLS = [f"{str(i).zfill(2)}:00:00" for i in range(24)]
+
+
+class RekapRollup:
+    """Rollup kumulatif (prefix-sum) dari data rekap.
+
+    Array `prefix` berukuran (hari + 1) x source x jenis x 24 jam, dengan
+    prefix[i] = total semua hari sebelum hari ke-i. Total rentang [awal, akhir]
+    cukup dihitung dari dua lookup: prefix[akhir + 1] - prefix[awal].
+    """
+
+    def __init__(self, tanggal, sources, jenis, keterangan, prefix, prefix_ada, files=()):
+        self.tanggal = pd.DatetimeIndex(tanggal)
+        self.sources = list(sources)
+        self.jenis = list(jenis)
+        self.keterangan = list(keterangan)
+        self.prefix = prefix
+        self.prefix_ada = prefix_ada
+        self.files = list(files)
+
+    @classmethod
+    def from_dataframe(cls, df, jam_cols=None):
+        """Fungsi untuk membangun rollup dari DataFrame rekap (Tanggal, Source, Jenis Kendaraan, jam)"""
+        jam_cols = jam_cols or JAM_COLS
+        if "Tanggal" in df.columns:
+            df = df[df["Tanggal"].notna()]
+
+        if df.empty:
+            kosong = np.zeros((1, 0, 0, len(jam_cols)), dtype=np.int64)
+            return cls([], [], [], [], kosong, np.zeros((1, 0, 0), dtype=np.int32))
+
+        tanggal = pd.date_range(df["Tanggal"].min().normalize(), df["Tanggal"].max().normalize(), freq="D")
+        sources = sorted(df["Source"].dropna().unique())
+        jenis = sorted(df["Jenis Kendaraan"].dropna().unique())
+
+        df = df[df["Source"].notna() & df["Jenis Kendaraan"].notna()]
+        kode_tanggal = tanggal.get_indexer(df["Tanggal"].dt.normalize())
+        kode_source = pd.Index(sources).get_indexer(df["Source"])
+        kode_jenis = pd.Index(jenis).get_indexer(df["Jenis Kendaraan"])
+
+        nilai = df[jam_cols].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        dtype = np.int64 if np.all(np.mod(nilai, 1) == 0) else np.float64
+
+        # Jumlahkan baris dengan (tanggal, source, jenis) yang sama ke sel kubus
+        n_sel = len(tanggal) * len(sources) * len(jenis)
+        kode_sel = (kode_tanggal * len(sources) + kode_source) * len(jenis) + kode_jenis
+        agg = pd.DataFrame(nilai).groupby(kode_sel).sum()
+        kubus = np.zeros((n_sel, len(jam_cols)), dtype=dtype)
+        kubus[agg.index.to_numpy()] = agg.to_numpy().astype(dtype)
+        ada = np.zeros(n_sel, dtype=np.int32)
+        ada[agg.index.to_numpy()] = 1
+
+        bentuk = (len(tanggal), len(sources), len(jenis))
+        prefix = np.zeros((len(tanggal) + 1,) + bentuk[1:] + (len(jam_cols),), dtype=dtype)
+        np.cumsum(kubus.reshape(bentuk + (len(jam_cols),)), axis=0, out=prefix[1:])
+        prefix_ada = np.zeros((len(tanggal) + 1,) + bentuk[1:], dtype=np.int32)
+        np.cumsum(ada.reshape(bentuk), axis=0, out=prefix_ada[1:])
+
+        if "Keterangan" in df.columns:
+            ket_map = df.dropna(subset=["Keterangan"]).groupby("Source")["Keterangan"].first()
+            keterangan = [ket_map.get(s) for s in sources]
+        else:
+            keterangan = [None] * len(sources)
+
+        files = sorted(df["File_Source"].dropna().unique()) if "File_Source" in df.columns else []
+
+        return cls(tanggal, sources, jenis, keterangan, prefix, prefix_ada, files)
+
+    def read_only(self):
+        """Kunci array agar rollup aman dibagi antar sesi/thread (st.cache_resource)"""
+        for array in (self.prefix, self.prefix_ada):
+            if isinstance(array, np.ndarray) and array.flags.writeable:
+                array.flags.writeable = False
+        return self
+
+    @property
+    def date_min(self):
+        return self.tanggal[0] if len(self.tanggal) else pd.NaT
+
+    @property
+    def date_max(self):
+        return self.tanggal[-1] if len(self.tanggal) else pd.NaT
+
+    def _hari_ada(self):
+        """Penanda per hari: True jika ada minimal satu baris data"""
+        return np.diff(self.prefix_ada.sum(axis=(1, 2))) > 0
+
+    def months(self):
+        """Fungsi untuk daftar bulan ('%B %Y') yang punya data"""
+        return sorted(self.tanggal[self._hari_ada()].strftime("%B %Y").unique())
+
+    def available_dates(self, source):
+        """Fungsi untuk daftar tanggal yang punya data di satu source"""
+        if source not in self.sources:
+            return []
+        s = self.sources.index(source)
+        ada = np.diff(self.prefix_ada[:, s].sum(axis=1)) > 0
+        return list(self.tanggal[ada])
+
+    def _bounds(self, awal, akhir):
+        """Fungsi untuk mengubah rentang tanggal menjadi indeks prefix [i0, i1)"""
+        i0 = self.tanggal.searchsorted(pd.Timestamp(awal).normalize(), side="left")
+        i1 = self.tanggal.searchsorted(pd.Timestamp(akhir).normalize(), side="right")
+        return i0, max(i0, i1)
+
+    def window(self, awal, akhir):
+        """Fungsi untuk mengambil total (source x jenis x jam) dan penanda data ada untuk rentang tanggal"""
+        i0, i1 = self._bounds(awal, akhir)
+        return self.prefix[i1] - self.prefix[i0], (self.prefix_ada[i1] - self.prefix_ada[i0]) > 0
+
+    def sources_in(self, awal, akhir):
+        """Fungsi untuk daftar source yang punya data di rentang tanggal"""
+        _, ada = self.window(awal, akhir)
+        return [s for s, flag in zip(self.sources, ada.any(axis=1)) if flag]
+
+    def type_totals(self, awal, akhir, source):
+        """Fungsi untuk total per jenis kendaraan di satu source"""
+        if source not in self.sources:
+            return pd.DataFrame(columns=["Jenis Kendaraan", "Jumlah"])
+        total, ada = self.window(awal, akhir)
+        s = self.sources.index(source)
+        mask = ada[s]
+        return pd.DataFrame({
+            "Jenis Kendaraan": np.asarray(self.jenis, dtype=object)[mask],
+            "Jumlah": total[s].sum(axis=1)[mask],
+        })
+
+    def hourly_profile(self, awal, akhir, source, jenis):
+        """Fungsi untuk profil per jam satu jenis kendaraan di satu source"""
+        total, _ = self.window(awal, akhir)
+        s = self.sources.index(source)
+        j = self.jenis.index(jenis)
+        return pd.DataFrame({"Jam": JAM_COLS[:total.shape[-1]], "Jumlah": total[s, j]})
+
+    def keterangan_totals(self, awal, akhir):
+        """Fungsi untuk total kendaraan per keterangan (Masuk/Keluar Batu)"""
+        total, ada = self.window(awal, akhir)
+        per_source = pd.DataFrame({
+            "Keterangan": self.keterangan,
+            "Jumlah": total.sum(axis=(1, 2)),
+            "Ada": ada.any(axis=1),
+        })
+        per_source = per_source[per_source["Ada"]]
+        return per_source.groupby("Keterangan")["Jumlah"].sum().reset_index()
+
+    def daily_totals(self, awal, akhir, source):
+        """Fungsi untuk total harian satu source (selisih prefix berurutan)"""
+        i0, i1 = self._bounds(awal, akhir)
+        s = self.sources.index(source)
+        per_hari = np.diff(self.prefix[i0:i1 + 1, s].sum(axis=(1, 2)))
+        ada = np.diff(self.prefix_ada[i0:i1 + 1, s].sum(axis=1)) > 0
+        return pd.DataFrame({"Tanggal": self.tanggal[i0:i1][ada], "Jumlah": per_hari[ada]})
@@ -0,0 +1,185 @@
+"""Generator workbook sintetis dengan layout yang sama seperti file lapangan.
+
+- File mingguan "tanggal N bulan.xlsx": satu sheet per checkpoint bernama
+  "i. N Bulan", 3 baris pembuka, baris header jam, blok jenis kendaraan, lalu
+  footer "No. / Vehicle Type" (format yang dibersihkan `clean_sheet_advanced`).
+- File bulanan "Data Volume Lalu Lintas Bulan.xlsx": sheet "Rekap Bulan" dan
+  satu sheet per tanggal berisi blok checkpoint, blok "Jenis Kendaraan" dan
+  baris "Keterangan :" / "Arah ..." (format yang dibaca parser bulanan).
+"""
+import calendar
+import json
+import os
+from datetime import datetime, time
+
+import numpy as np
+from openpyxl import Workbook
+
+from pipeline import BULAN_MAP, KETERANGAN_MAP, NAMA_CHECKPOINT, REGISTRI, TAHUN
+
+# Urutan jenis kendaraan seperti pada export kamera di folder Juli/
+JENIS_MINGGUAN = [
+    "Bus", "Others", "Truck", "Two Wheeler", "Oil Tank Truck", "Concrete Mixer", "Sedan",
+    "Sub-Compact Car", "Unknown", "Motorcycle", "Motor Vehicle", "Compact Car",
+    "Minitruck, Dropside Trailer", "Sports Sedan", "Large-Sized Coach", "Light Truck",
+    "Small-Sized Vehicle", "Flatbed Trailer", "Crane, Engineering Vehicle", "Minivan",
+    "Non-Motor Vehicle", "SUV/MPV", "Medium and Heavy Truck", "Pick-up Truck", "Hatchback",
+    "Tricycle", "Dump Truck", "Middle-Sized Bus", "Saloon", "Large-Sized Vehicle",
+    "Pedestrian", "Container Truck", "Minibus", "Light Truck",
+]
+
+JENIS_BULANAN = [
+    "Truk", "Bus", "Pick up Truck", "Light Truck", "Sedan", "Minivan",
+    "SUV/MPV", "Roda 3", "Roda 2", "Pedestrian", "Unknown",
+]
+
+# Jenis yang dipetakan aplikasi (JENIS_MAP) terisi; sisanya nol seperti data asli
+_JENIS_AKTIF = {
+    "Large-Sized Coach", "Light Truck", "Minivan", "Pedestrian", "Pick-up Truck",
+    "SUV/MPV", "Sedan", "Tricycle", "Truck", "Two Wheeler",
+}
+
+_KETERANGAN = ["Masuk Batu", "Keluar Batu", "Batu"]
+
+
+def nama_checkpoint(n):
+    """Fungsi untuk daftar n nama checkpoint: 10 titik asli, lalu 'titik 11', 'titik 12', ..."""
+    return [NAMA_CHECKPOINT[i] if i < len(NAMA_CHECKPOINT) else f"titik {i + 1}" for i in range(n)]
+
+
+def keterangan_map(checkpoints):
+    """Fungsi untuk peta Source -> Keterangan yang juga mencakup checkpoint sintetis"""
+    return {
+        nama: KETERANGAN_MAP.get(nama, _KETERANGAN[i % len(_KETERANGAN)])
+        for i, nama in enumerate(checkpoints)
+    }
+
+
+def tulis_registri(path, checkpoints):
+    """Fungsi untuk menulis file registri (format registri.json) berisi checkpoint sintetis"""
+    data = REGISTRI.sebagai_dict()
+    data["titik"] = [
+        {"nomor": i + 1, "nama": nama, "keterangan": ket}
+        for i, (nama, ket) in enumerate(keterangan_map(checkpoints).items())
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    return path
+
+
+def _profil_jam():
+    """Pola harian kasar: sepi dini hari, puncak pagi dan sore"""
+    jam = np.arange(24)
+    return 0.15 + np.exp(-((jam - 8) ** 2) / 8) + 0.9 * np.exp(-((jam - 17) ** 2) / 10)
+
+
+def _volume(rng, level, n_baris):
+    """Fungsi untuk jumlah kendaraan acak (n_baris x 24) dengan pola harian"""
+    lam = np.outer(level, _profil_jam())
+    return rng.poisson(lam).reshape(n_baris, 24)
+
+
+def write_weekly_workbook(path, tanggal, bulan, checkpoints, jenis=None, rng=None):
+    """Fungsi untuk menulis satu file harian mingguan (satu sheet per checkpoint)"""
+    jenis = list(jenis or JENIS_MINGGUAN)
+    rng = rng if rng is not None else np.random.default_rng()
+    header_jam = [time(h) for h in range(24)]
+
+    wb = Workbook(write_only=True)
+    for i, _ in enumerate(checkpoints):
+        ws = wb.create_sheet(f"{i + 1}. {tanggal} {bulan.capitalize()}")
+        level = np.array([rng.uniform(2, 60) if j in _JENIS_AKTIF else 0.0 for j in jenis])
+        level[[j == "Two Wheeler" for j in jenis]] *= 10
+        volume = _volume(rng, level, len(jenis))
+
+        ws.append([])
+        ws.append(["Vehicle StatisticsVehicle Type Statistics"])
+        ws.append([f"Total Vehicles{int(volume.sum())}"])
+        ws.append([None, None] + header_jam)
+        for no, (nama, baris) in enumerate(zip(jenis, volume.tolist()), start=1):
+            ws.append([no, nama] + baris)
+        ws.append(["No.", "Vehicle Type"])
+        for no, nama in enumerate(jenis, start=1):
+            ws.append([no, nama])
+    wb.save(path)
+
+
+def write_monthly_workbook(path, bulan, checkpoints, jenis=None, hari=None, rng=None):
+    """Fungsi untuk menulis file volume bulanan: sheet rekap + satu sheet per tanggal"""
+    jenis = list(jenis or JENIS_BULANAN)
+    rng = rng if rng is not None else np.random.default_rng()
+    nomor_bulan = BULAN_MAP[bulan.lower()]
+    hari = hari or calendar.monthrange(TAHUN, nomor_bulan)[1]
+    label_jam = ["00:00"] + [f"{h}:00" for h in range(1, 24)]
+    nama_tampil = [f"Jl. {nama.title()}" for nama in checkpoints]
+
+    level = np.array([rng.uniform(20, 400) for _ in jenis])
+    level[[j == "Roda 2" for j in jenis]] *= 8
+    level[[j == "Unknown" for j in jenis]] = 0.05
+
+    wb = Workbook(write_only=True)
+    rekap = wb.create_sheet(f"Rekap {bulan.capitalize()}")
+    rekap.append([f"{bulan.capitalize()} {TAHUN}"])
+    rekap.append(["Tanggal"] + nama_tampil)
+
+    for d in range(1, hari + 1):
+        volume = _volume(rng, level, len(jenis))
+        per_jam = volume.sum(axis=0)
+        bagian = rng.dirichlet(np.ones(len(checkpoints)))
+        per_checkpoint = np.floor(np.outer(bagian, per_jam)).astype(np.int64)
+        rekap.append([datetime(TAHUN, nomor_bulan, d)] + per_checkpoint.sum(axis=1).tolist())
+
+        ws = wb.create_sheet(str(d))
+        ws.append([f"{d} {bulan.capitalize()} {TAHUN}"])
+        ws.append(["Checkpoint", "Time"] + [None] * 23 + ["Total"])
+        ws.append([None] + label_jam)
+        for nama, baris in zip(nama_tampil, per_checkpoint.tolist()):
+            ws.append([nama] + baris + [sum(baris)])
+        ws.append(["Total"] + per_checkpoint.sum(axis=0).tolist() + [int(per_checkpoint.sum())])
+        ws.append([])
+        ws.append([])
+        ws.append(["Jenis Kendaraan", "Time"] + [None] * 23 + ["Total"])
+        ws.append([None] + label_jam)
+        for nama, baris in zip(jenis, volume.tolist()):
+            ws.append([nama] + baris + [sum(baris)])
+        ws.append(["Total"] + per_jam.tolist() + [int(per_jam.sum())])
+        ws.append([])
+        ws.append(["Keterangan :"])
+        ws.append(["Arah Keluar Batu"])
+        ws.append(["Arah Masuk Batu"])
+    wb.save(path)
+
+
+def generate_dataset(out_dir, n_checkpoint=10, jenis_mingguan=None, jenis_bulanan=None,
+                     hari=tuple(range(1, 8)), bulan=("juli",), seed=0):
+    """Fungsi untuk membuat satu set data uji: file harian mingguan + file bulanan.
+
+    File mingguan dibuat untuk tanggal `hari` di bulan pertama, file bulanan
+    untuk setiap nama bulan di `bulan`. Mengembalikan dict berisi daftar path
+    ('mingguan', 'bulanan'), daftar checkpoint, peta keterangannya dan path
+    file registri untuk checkpoint tersebut ('registri').
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    checkpoints = nama_checkpoint(n_checkpoint)
+
+    mingguan = []
+    for tanggal in hari:
+        path = os.path.join(out_dir, f"tanggal {tanggal} {bulan[0]}.xlsx")
+        write_weekly_workbook(path, tanggal, bulan[0], checkpoints, jenis_mingguan, rng)
+        mingguan.append(path)
+
+    bulanan = []
+    for nama_bulan in bulan:
+        path = os.path.join(out_dir, f"Data Volume Lalu Lintas {nama_bulan.capitalize()}.xlsx")
+        write_monthly_workbook(path, nama_bulan, checkpoints, jenis_bulanan, rng=rng)
+        bulanan.append(path)
+
+    return {
+        "mingguan": mingguan,
+        "bulanan": bulanan,
+        "checkpoints": checkpoints,
+        "keterangan_map": keterangan_map(checkpoints),
+        # Untuk menjalankan aplikasi pada data ini: REGISTRI_PATH=<out_dir>/registri.json
+        "registri": tulis_registri(os.path.join(out_dir, "registri.json"), checkpoints),
+    }
@@ -0,0 +1,139 @@
+"""Tes regresi kecil untuk rollup dashboard, registri dan model proporsi per jam.
+
+Data dibuat sintetis (acak dengan seed tetap) sehingga tes tidak bergantung
+pada file xlsx di folder bulan. Jalankan dengan `python -m pytest -q`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import pipeline
+import registri
+from rollup import JAM_COLS, RekapRollup
+
+SOURCES = [t.nama for t in pipeline.REGISTRI.titik if t.keterangan is not None][:3]
+
+
+def _data_rekap(seed=0):
+    """DataFrame rekap: 3 source x 3 jenis x 10 hari, dengan baris ganda, hari kosong dan tanggal NaT"""
+    rng = np.random.default_rng(seed)
+    baris = []
+    for tanggal in pd.date_range("2025-07-01", "2025-07-10"):
+        if tanggal.day == 4:
+            continue
+        for source in ["brantas", "sudirman", "trunojoyo"]:
+            for jenis in ["Bus", "Roda 4", "Sepeda motor"]:
+                for _ in range(1 + (tanggal.day % 3 == 0)):
+                    baris.append({"Tanggal": tanggal, "Source": source, "Jenis Kendaraan": jenis,
+                                  **dict(zip(JAM_COLS, rng.integers(0, 50, len(JAM_COLS))))})
+    df = pd.DataFrame(baris)
+    # Sel yang tidak pernah ada: tidak boleh muncul di type_totals
+    df = df[~((df["Source"] == "sudirman") & (df["Jenis Kendaraan"] == "Bus"))]
+    nat = df.iloc[[0]].assign(Tanggal=pd.NaT)
+    return pd.concat([df, nat], ignore_index=True)
+
+
+@pytest.mark.parametrize("awal, akhir", [
+    ("2025-07-01", "2025-07-10"),
+    ("2025-07-03", "2025-07-05"),
+    ("2025-07-04", "2025-07-04"),
+    ("2025-06-01", "2025-07-02"),
+])
+def test_rollup_window_sama_dengan_groupby(awal, akhir):
+    df = _data_rekap()
+    rollup = RekapRollup.from_dataframe(df)
+    total, ada = rollup.window(awal, akhir)
+
+    rentang = df[df["Tanggal"].between(pd.Timestamp(awal), pd.Timestamp(akhir))]
+    harapan = rentang.groupby(["Source", "Jenis Kendaraan"])[JAM_COLS].sum()
+    for s, source in enumerate(rollup.sources):
+        for j, jenis in enumerate(rollup.jenis):
+            if (source, jenis) in harapan.index:
+                assert ada[s, j]
+                np.testing.assert_array_equal(total[s, j], harapan.loc[(source, jenis)].to_numpy())
+            else:
+                assert not ada[s, j]
+                assert not total[s, j].any()
+
+
+def test_rollup_type_totals_sama_dengan_groupby():
+    df = _data_rekap()
+    rollup = RekapRollup.from_dataframe(df)
+    rentang = df[df["Tanggal"].between("2025-07-02", "2025-07-08")]
+    for source in rollup.sources:
+        hasil = rollup.type_totals("2025-07-02", "2025-07-08", source)
+        harapan = (rentang[rentang["Source"] == source].groupby("Jenis Kendaraan")[JAM_COLS].sum()
+                   .sum(axis=1).rename("Jumlah").reset_index())
+        assert hasil["Jenis Kendaraan"].tolist() == harapan["Jenis Kendaraan"].tolist()
+        np.testing.assert_array_equal(hasil["Jumlah"].to_numpy(), harapan["Jumlah"].to_numpy())
+    assert rollup.type_totals("2025-07-01", "2025-07-10", "tidak ada").empty
+
+
+def test_registri_label_tanpa_peta():
+    reg = registri.Registri(
+        [registri.Titik(1, "brantas", "Masuk Batu"), registri.Titik(2, "sudirman", "Keluar Batu")],
+        jenis_mingguan={"Sedan": "Roda 4", "Motorcycle": "Sepeda motor"},
+    )
+    nilai = pd.Series(["sudirman", "jalan baru", "brantas", None], name="Source")
+
+    petakan = reg.keterangan.petakan(nilai)
+    assert petakan.iloc[0] == "Keluar Batu" and petakan.iloc[2] == "Masuk Batu"
+    assert petakan.iloc[[1, 3]].isna().all()
+    assert petakan.index.equals(nilai.index) and petakan.name == "Source"
+    assert reg.keterangan.ganti(nilai).iloc[1] == "jalan baru"
+
+    jenis, tidak_dikenal = reg.jenis.kategorikan(pd.Series(["Sedan", "Becak", "Motorcycle", "Becak"]))
+    assert tidak_dikenal == ["Becak"]
+    assert jenis.tolist()[0] == "Roda 4" and jenis.iloc[[1, 3]].isna().all()
+
+
+def test_normalisasi_jenis_tanpa_peta_menjadi_unknown():
+    df = pd.DataFrame({"Jenis Kendaraan": ["Sedan", "Becak", "12"], "Jumlah": [3, 2, 0]})
+    peringatan = []
+    hasil = pipeline.normalisasi_jenis(df, registri.Pemetaan({"Sedan": "Roda 4"}), peringatan, "uji",
+                                       kolom_angka=["Jumlah"])
+    # "Becak" berisi data -> Unknown; "12" kosong (sisa blok lain) -> dibuang
+    assert hasil["Jenis Kendaraan"].astype(str).tolist() == ["Roda 4", "Unknown"]
+    assert len(peringatan) == 1 and "Becak" in peringatan[0]
+
+
+def _sampel_mingguan(seed=0):
+    """Satu minggu data harian (sudah dinormalisasi seperti hasil parse_weekly_file)"""
+    rng = np.random.default_rng(seed)
+    baris = []
+    for tanggal in pd.date_range("2025-07-07", "2025-07-13"):
+        for source in SOURCES:
+            for jenis in ["Sedan", "Light Truck", "Large-Sized Coach"]:
+                baris.append({"Source": source, "Jenis Kendaraan": jenis, "Tanggal": tanggal.strftime("%d-%m-%Y"),
+                              **dict(zip(pipeline.JAM_LIST, rng.integers(0, 40, 24)))})
+    df = pd.DataFrame(baris)
+    return pipeline.normalisasi_jenis(df, pipeline.REGISTRI.jenis, kolom_angka=pipeline.JAM_LIST)
+
+
+def _bulanan(seed=1):
+    """Hasil olah_bulanan untuk 14 hari, dengan satu jenis yang tidak ada di sampel"""
+    rng = np.random.default_rng(seed)
+    list_df = []
+    for tanggal in pd.date_range("2025-07-01", "2025-07-14"):
+        jenis = ["Sedan", "Light Truck", "Bus", "Tricycle"]
+        jam = rng.integers(0, 500, (len(jenis), 24))
+        df = pd.DataFrame(jam, columns=pipeline.JAM_LIST)
+        df.insert(0, "Jenis Kendaraan", jenis)
+        df["Total"] = jam.sum(axis=1)
+        df["Tanggal"] = tanggal.strftime("%d-%m-%Y")
+        list_df.append(df)
+    return pipeline.olah_bulanan(list_df)
+
+
+@pytest.mark.parametrize("bulatkan", [False, True])
+def test_estimasi_jam_tanpa_per_jam_sama_dengan_model_harian(bulatkan):
+    sampel, bulanan = _sampel_mingguan(), _bulanan()
+    harapan = pipeline.estimasi_volume(bulanan, pipeline.hitung_proporsi_mingguan(sampel), bulatkan=bulatkan)
+    model = pipeline.hitung_proporsi_jam(sampel, agregasi="sum", per_jam=False)
+    hasil = pipeline.estimasi_volume_jam(bulanan, model, bulatkan=bulatkan)
+
+    kunci = ["Tanggal", "Jenis Kendaraan", "Source"]
+    assert len(hasil) == len(harapan) > 0
+    assert (hasil[kunci].astype(str).to_numpy() == harapan[kunci].astype(str).to_numpy()).all()
+    np.testing.assert_array_equal(hasil[pipeline.JAM_LIST].to_numpy(float),
+                                  harapan[pipeline.JAM_LIST].to_numpy(float))
@@ -0,0 +1,262 @@
+"""Penyimpanan file unggahan di disk.
+
+st.file_uploader menyimpan isi file di memori server selama file masih ada di
+widget. `unggah` menyalin setiap file sekali ke UPLOAD_DIR dengan nama = sha256
+isinya, sehingga job membaca file dari disk dan isi yang sama (dari sesi mana
+pun) hanya disimpan sekali. Setelah hasil job tersimpan di sesi, `lepas`
+mereset widget (key baru) dan widget diganti ringkasan file yang tersimpan
+(dengan tombol untuk mengganti file). Salinan di memori Streamlit dibebaskan
+Streamlit saat sesi berakhir.
+
+File di UPLOAD_DIR yang tidak disentuh sesi mana pun selama UPLOAD_TTL detik
+dihapus; tidak ada pembersihan lain berdasarkan sesi yang idle.
+
+Hasil parse juga dipakai bersama per sha256: file mingguan atau bulanan yang
+sama, diunggah ulang oleh sesi/pengguna lain, tidak di-parse lagi
+(`parse_mingguan`, `parse_bulanan`). Cache hasil parse dibatasi total ukuran
+(PARSE_CACHE_MB) dan umur sejak terakhir dipakai (PARSE_CACHE_TTL). `duplikat` mendeteksi file berisi sama
+di dalam satu unggahan, mis. file yang sama di Minggu 1 dan Minggu 3.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+import pipeline
+
+UPLOAD_DIR = os.environ.get("UPLOAD_DIR") or os.path.join(tempfile.gettempdir(), "dashboard_kendaraan_upload")
+UPLOAD_TTL = float(os.environ.get("UPLOAD_TTL", "86400"))
+# Jeda minimal antar pembersihan folder unggahan
+BERSIHKAN_DETIK = 300
+# Batas total ukuran (MB, memory_usage DataFrame) hasil parse yang dipakai ulang semua sesi
+PARSE_CACHE_MB = float(os.environ.get("PARSE_CACHE_MB", "256"))
+# Hasil parse yang tidak dipakai selama sekian detik dibuang
+PARSE_CACHE_TTL = float(os.environ.get("PARSE_CACHE_TTL", "1800"))
+
+# nama file asli, path di UPLOAD_DIR, sha256 isi (hex) dan ukuran (byte)
+FileUnggahan = namedtuple("FileUnggahan", ["nama", "path", "sidik", "ukuran"])
+
+_lock = threading.Lock()
+_terakhir_bersihkan = 0.0
+# kunci -> (hasil, ukuran byte, terakhir dipakai); lock per kunci hidup selama entrinya ada
+_parse_cache = OrderedDict()
+_parse_kunci = {}
+
+
+def simpan(nama, isi):
+    """Fungsi untuk menyimpan isi file (bytes/memoryview) ke UPLOAD_DIR; kembalikan FileUnggahan"""
+    sidik = hashlib.sha256(isi).hexdigest()
+    path = os.path.join(UPLOAD_DIR, f"{sidik}.xlsx")
+    if os.path.exists(path):
+        # Tandai masih dipakai agar tidak ikut dibersihkan
+        os.utime(path)
+    else:
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        fd, sementara = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(isi)
+        os.replace(sementara, path)
+    return FileUnggahan(nama, path, sidik, len(isi))
+
+
+def bersihkan(paksa=False):
+    """Fungsi untuk menghapus file unggahan yang tidak disentuh selama UPLOAD_TTL"""
+    global _terakhir_bersihkan
+    sekarang = time.time()
+    with _lock:
+        if not paksa and sekarang - _terakhir_bersihkan < BERSIHKAN_DETIK:
+            return
+        _terakhir_bersihkan = sekarang
+    if not os.path.isdir(UPLOAD_DIR):
+        return
+    for nama in os.listdir(UPLOAD_DIR):
+        path = os.path.join(UPLOAD_DIR, nama)
+        try:
+            if os.path.getmtime(path) < sekarang - UPLOAD_TTL:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _state(key):
+    import streamlit as st
+
+    return st.session_state.setdefault(f"_unggahan_{key}", {"versi": 0, "files": None, "cache": {}})
+
+
+def unggah(label, key, accept_multiple_files=False, **kwargs):
+    """Fungsi pengganti st.file_uploader yang mengembalikan FileUnggahan (atau list-nya).
+
+    File disalin ke disk saat pertama kali terlihat (per file_id, jadi tidak
+    di-hash ulang di setiap rerun). Setelah `lepas(key)` widget tidak lagi
+    ditampilkan; file yang tersimpan di disk terus dikembalikan sampai
+    pengguna menekan "Ganti file".
+    """
+    import streamlit as st
+
+    bersihkan()
+    state = _state(key)
+    if state["files"] is not None:
+        files = state["files"]
+        for f in files:
+            if not os.path.exists(f.path):
+                # Sudah dibersihkan (tidak disentuh selama UPLOAD_TTL): minta unggah ulang
+                state["files"] = None
+                return unggah(label, key, accept_multiple_files, **kwargs)
+            os.utime(f.path)
+        col_info, col_ganti = st.columns([4, 1])
+        with col_info:
+            st.success(f"📎 {label}: {len(files)} file tersimpan ({', '.join(f.nama for f in files[:3])}"
+                       + (f" +{len(files) - 3} lainnya" if len(files) > 3 else "") + ")")
+        with col_ganti:
+            if st.button("🔄 Ganti file", key=f"_ganti_{key}"):
+                state["files"] = None
+                state["cache"] = {}
+                st.rerun()
+        return files if accept_multiple_files else files[0]
+
+    widget_key = key if state["versi"] == 0 else f"{key}_{state['versi']}"
+    uploaded = st.file_uploader(label, key=widget_key, accept_multiple_files=accept_multiple_files, **kwargs)
+    if not uploaded:
+        state["aktif"] = []
+        return uploaded
+
+    aktif = []
+    for f in uploaded if accept_multiple_files else [uploaded]:
+        file_id = getattr(f, "file_id", None)
+        tersimpan = state["cache"].get(file_id)
+        if tersimpan is None or not os.path.exists(tersimpan.path):
+            tersimpan = simpan(f.name, f.getbuffer())
+            if file_id is not None:
+                state["cache"][file_id] = tersimpan
+        aktif.append((file_id, tersimpan))
+    state["aktif"] = aktif
+    hasil = [tersimpan for _, tersimpan in aktif]
+    return hasil if accept_multiple_files else hasil[0]
+
+
+def lepas(key):
+    """Fungsi untuk melepas widget unggahan `key` setelah hasilnya tersimpan.
+
+    Hanya memakai siklus hidup file_uploader yang publik: nilai widget lama
+    dihapus dari st.session_state dan widget berikutnya memakai key baru,
+    sehingga file lama tidak lagi dirujuk skrip. Salinan di memori Streamlit
+    dibebaskan oleh Streamlit sendiri saat sesi berakhir; salinan di disk
+    dibersihkan `bersihkan` setelah UPLOAD_TTL.
+    """
+    import streamlit as st
+
+    state = _state(key)
+    if state["files"] is not None or not state.get("aktif"):
+        return
+    widget_key = key if state["versi"] == 0 else f"{key}_{state['versi']}"
+    if widget_key in st.session_state:
+        del st.session_state[widget_key]
+    state["files"] = [t for _, t in state.pop("aktif")]
+    state["cache"] = {}
+    # Widget baru (kosong) dipakai jika pengguna nanti mengganti file
+    state["versi"] += 1
+
+
+def duplikat(*kelompok):
+    """Fungsi untuk mencari file berisi sama di beberapa kelompok unggahan.
+
+    `kelompok` berupa (label, [FileUnggahan, ...]); mengembalikan daftar pesan,
+    satu per file yang isinya sama dengan file sebelumnya.
+    """
+    pertama = {}
+    pesan = []
+    for label, files in kelompok:
+        for f in files or []:
+            if f.sidik in pertama:
+                label_asal, nama_asal = pertama[f.sidik]
+                pesan.append(f"{f.nama} ({label}) isinya sama dengan {nama_asal} ({label_asal})")
+            else:
+                pertama[f.sidik] = (label, f.nama)
+    return pesan
+
+
+def _ukuran(hasil):
+    """Fungsi untuk perkiraan ukuran (byte) hasil parse: DataFrame di dalam tuple/list/dict"""
+    if isinstance(hasil, pd.DataFrame):
+        return int(hasil.memory_usage(deep=True).sum())
+    if isinstance(hasil, dict):
+        hasil = list(hasil.values())
+    if isinstance(hasil, (list, tuple)):
+        return sum(_ukuran(h) for h in hasil)
+    return 0
+
+
+def _rapikan(sekarang):
+    """Buang hasil parse kedaluwarsa lalu yang terlama sampai total di bawah PARSE_CACHE_MB (dengan _lock)"""
+    for kunci in [k for k, (_, _, dipakai) in _parse_cache.items() if sekarang - dipakai > PARSE_CACHE_TTL]:
+        del _parse_cache[kunci]
+        _parse_kunci.pop(kunci, None)
+    total = sum(ukuran for _, ukuran, _ in _parse_cache.values())
+    while _parse_cache and total > PARSE_CACHE_MB * 1024 ** 2:
+        kunci, (_, ukuran, _) = _parse_cache.popitem(last=False)
+        _parse_kunci.pop(kunci, None)
+        total -= ukuran
+
+
+def parse_sekali(kunci, fungsi, *args, **kwargs):
+    """Fungsi untuk hasil fungsi(*args, **kwargs) yang dipakai bersama semua sesi per `kunci`.
+
+    `kunci` memuat sha256 file sehingga isi yang sama tidak di-parse dua kali;
+    parse yang sedang berjalan di job lain ditunggu, bukan diulang. Lock per
+    kunci disimpan sampai hasilnya keluar dari cache (atau parse gagal). Hasilnya
+    dipakai bersama dan tidak boleh diubah pemanggil.
+    """
+    with _lock:
+        _rapikan(time.time())
+        if kunci in _parse_cache:
+            hasil, ukuran, _ = _parse_cache[kunci]
+            _parse_cache[kunci] = (hasil, ukuran, time.time())
+            _parse_cache.move_to_end(kunci)
+            return hasil
+        kunci_lock = _parse_kunci.setdefault(kunci, threading.Lock())
+    with kunci_lock:
+        with _lock:
+            if kunci in _parse_cache:
+                return _parse_cache[kunci][0]
+        try:
+            hasil = fungsi(*args, **kwargs)
+        except Exception:
+            # Unggahan rusak: jangan simpan lock-nya selamanya
+            with _lock:
+                if _parse_kunci.get(kunci) is kunci_lock:
+                    del _parse_kunci[kunci]
+            raise
+        with _lock:
+            _parse_cache[kunci] = (hasil, _ukuran(hasil), time.time())
+            _rapikan(time.time())
+    return hasil
+
+
+def _parse_mingguan(path, nama_file, cek_nama_sheet):
+    sheet_warnings = []
+    df = pipeline.parse_weekly_file(path, nama_file, sheet_warnings, cek_nama_sheet=cek_nama_sheet)
+    return df, sheet_warnings
+
+
+def parse_mingguan(f, sheet_warnings, cek_nama_sheet=True, minggu_label=None):
+    """Fungsi seperti pipeline.parse_weekly_file untuk FileUnggahan, memakai ulang hasil parse isi yang sama.
+
+    Nama file ikut di kunci karena tanggal diambil dari nama file.
+    """
+    df, peringatan = parse_sekali(
+        ("mingguan", f.sidik, f.nama.lower(), cek_nama_sheet), _parse_mingguan, f.path, f.nama, cek_nama_sheet
+    )
+    sheet_warnings.extend(peringatan)
+    if minggu_label is not None:
+        df = df.assign(Minggu=minggu_label)
+    return df
+
+
+def parse_bulanan(f, nama_file, bulan):
+    """Fungsi seperti pipeline.parse_bulanan_file untuk FileUnggahan, memakai ulang hasil parse isi yang sama"""
+    return parse_sekali(("bulanan", f.sidik, bulan), pipeline.parse_bulanan_file, f.path, nama_file, bulan)
@@ -0,0 +1,82 @@
+"""Pembaca workbook Excel multi-sheet: buka sekali, ambil sheet satu per satu atau paralel.
+
+Membaca sheet dengan `pd.read_excel(path, sheet_name=s)` di dalam loop membuka
+dan meng-unzip workbook lagi untuk setiap sheet (30-31 kali untuk file bulanan).
+`iter_sheets` membuka workbook sekali (pd.ExcelFile) lalu mem-parse sheet satu
+per satu saat diminta, sehingga hanya satu sheet mentah yang ada di memori.
+`baca_semua` mengembalikan semua sheet sekaligus seperti
+`pd.read_excel(..., sheet_name=None)`. Untuk file di disk sheet-sheetnya bisa
+di-parse paralel di pool proses (jobs.pool_proses) jika diminta lewat `proses`,
+tiap proses membuka workbook sekali untuk bagiannya. Default serial: di
+bench_workbook (1 core) x2 proses 1.7-3.5x lebih lambat dari iter_sheets
+karena biaya spawn dan membuka workbook ulang per proses.
+
+Dipakai pipeline (aplikasi Streamlit) dan notebook Juni/Juli.
+"""
+import os
+
+import pandas as pd
+
+import jobs
+
+# Di bawah jumlah sheet ini pembacaan tetap serial walaupun `proses` > 1 (biaya proses
+# tidak sepadan); jauh di atas 10 sheet file mingguan
+PARALEL_MIN_SHEET = 25
+
+
+def _buka(file):
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return pd.ExcelFile(file, engine="openpyxl")
+
+
+def sheet_names(file):
+    """Fungsi untuk daftar nama sheet workbook"""
+    with _buka(file) as xls:
+        return list(xls.sheet_names)
+
+
+def iter_sheets(file, sheets=None, header=None):
+    """Fungsi generator (nama sheet, DataFrame) dengan workbook dibuka sekali.
+
+    `sheets` membatasi dan mengurutkan sheet yang dibaca (nama sheet sebagai
+    string); sheet yang tidak ada dilewati. Default semua sheet sesuai urutan
+    di workbook.
+    """
+    with _buka(file) as xls:
+        ada = {str(nama): nama for nama in xls.sheet_names}
+        for nama in ada if sheets is None else [str(s) for s in sheets]:
+            if nama in ada:
+                yield ada[nama], xls.parse(ada[nama], header=header)
+
+
+def _baca_bagian(path, sheets, header):
+    """Fungsi worker: buka workbook sekali dan parse sebagian sheet"""
+    return list(iter_sheets(path, sheets, header))
+
+
+def baca_semua(file, sheets=None, header=None, proses=1):
+    """Fungsi untuk membaca sheet workbook menjadi {nama sheet: DataFrame}.
+
+    Hasilnya sama dengan pd.read_excel(file, sheet_name=None, header=header).
+    `proses` = jumlah proses paralel (default 1 = serial, opt-in); paralel hanya
+    untuk path file di disk dengan sheet >= PARALEL_MIN_SHEET.
+    """
+    if proses <= 1 or not isinstance(file, (str, os.PathLike)):
+        return dict(iter_sheets(file, sheets, header))
+
+    daftar = [str(s) for s in (sheet_names(file) if sheets is None else sheets)]
+    if len(daftar) < PARALEL_MIN_SHEET:
+        return dict(iter_sheets(file, daftar, header))
+
+    # Bagi sheet berurutan ke setiap proses agar urutan hasil tetap sama
+    n = min(proses, len(daftar))
+    ukuran = -(-len(daftar) // n)
+    bagian = [daftar[i:i + ukuran] for i in range(0, len(daftar), ukuran)]
+    hasil = {}
+    with jobs.pool_proses(len(bagian)) as pool:
+        if pool is None:
+            return dict(iter_sheets(file, daftar, header))
+        for future in [pool.submit(_baca_bagian, os.fspath(file), b, header) for b in bagian]:
+            hasil.update(future.result())
+    return hasil